@@ -0,0 +1,324 @@
+"""
+Benchmark de desempenho das representações de grafo.
+
+Para cada arquivo de entrada e cada backend mede carregamento, BFS, DFS,
+componentes conexas e diâmetro, com aquecimento e repetições (mediana e
+percentis). A memória (pico do tracemalloc) é medida em uma execução à
+parte, para não distorcer os tempos. Os resultados podem ser gravados em
+JSON/CSV e comparados com um baseline (JSON de uma execução anterior): o
+programa termina com código 1 se alguma mediana piorar além do limite.
+
+Com `--ordens`, cada backend é medido também com os vértices renumerados na
+carga (ver reordenacao.py), e um resumo mostra o ganho de cada ordem sobre
+a numeração do arquivo ("nenhuma").
+
+Exemplo:
+    python3 benchmark.py grafo_10k.txt grafo_100k.txt --backends lista csr \\
+        --repeticoes 5 --json resultados.json --baseline baseline.json --limite 0.15
+    python3 benchmark.py grafo_100k.txt --operacoes bfs dfs componentes --ordens nenhuma grau bfs rcm
+"""
+import argparse
+import contextlib
+import csv
+import gc
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from grafos_lib import Lista_Grafo
+from grafos_lib_csr import Grafo_CSR
+from grafos_lib_matrix import Grafo_Matriz
+from diametro import diametro_exato
+from estatisticas import EstatisticasBusca
+from leitura_arestas import _ler_cabecalho
+from reordenacao import CRITERIOS
+
+
+def _carregador_matriz(formato):
+    def carregar(arquivo, usar_cache, reordenar=None):
+        # criar_matriz_adjacencias imprime o progresso; no benchmark isso só atrapalha
+        with contextlib.redirect_stdout(io.StringIO()):
+            return Grafo_Matriz.from_file(arquivo, formato=formato, usar_cache=usar_cache, reordenar=reordenar)
+    return carregar
+
+
+# nome -> (carregar(arquivo, usar_cache, reordenar=None), primeiro vértice, bytes por célula da matriz ou None)
+BACKENDS = {
+    "lista": (Lista_Grafo.ler_de_arquivo, 0, None),
+    "csr": (Grafo_CSR.ler_de_arquivo, 0, None),
+    "matriz": (_carregador_matriz("densa"), 1, 1.0),
+    "matriz_bits": (_carregador_matriz("bits"), 1, 1 / 8),
+    "matriz_blocos": (_carregador_matriz("blocos"), 1, None),
+}
+
+OPERACOES = ("carregamento", "bfs", "dfs", "componentes", "diametro")
+
+# "nenhuma" = numeração do arquivo
+ORDENS = ("nenhuma",) + CRITERIOS
+
+PERCENTIS = (50, 90, 99)
+
+
+def medir_tempos(funcao, aquecimento: int, repeticoes: int):
+    """Executa `funcao` aquecimento + repeticoes vezes; devolve os tempos das repetições."""
+    for _ in range(aquecimento):
+        funcao()
+
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+    return tempos
+
+
+def medir_memoria(funcao) -> float:
+    """Pico de memória (MB) de uma execução isolada de `funcao`, via tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico / 1024**2
+
+
+def _ler_n(arquivo: str):
+    with open(arquivo, "rb") as f:
+        return _ler_cabecalho(f)
+
+
+def _operacao(nome, grafo, origem):
+    if nome == "bfs":
+        return lambda: grafo.busca_largura(origem)
+    if nome == "dfs":
+        return lambda: grafo.busca_profundidade(origem)
+    if nome == "componentes":
+        return grafo.componentes_conexos
+    if nome == "diametro":
+        return lambda: diametro_exato(grafo)
+    raise ValueError(f"Operação desconhecida: {nome}")
+
+
+def _instrumentar(nome, grafo, origem):
+    """Uma execução com estatisticas.EstatisticasBusca, ou None."""
+    if nome not in ("bfs", "dfs", "componentes") or isinstance(grafo, Grafo_CSR):
+        return None
+    est = EstatisticasBusca()
+    if nome == "bfs":
+        grafo.busca_largura(origem, estatisticas=est)
+    elif nome == "dfs":
+        grafo.busca_profundidade(origem, estatisticas=est)
+    else:
+        grafo.componentes_conexos(estatisticas=est)
+    return est
+
+
+def _resultado(arquivo, n, m, backend, ordem, operacao, tempos, memoria):
+    p50, p90, p99 = np.percentile(tempos, PERCENTIS)
+    return {
+        "arquivo": os.path.basename(arquivo),
+        "n": n,
+        "m": m,
+        "backend": backend,
+        "ordem": ordem,
+        "operacao": operacao,
+        "repeticoes": len(tempos),
+        "mediana_s": float(p50),
+        "p90_s": float(p90),
+        "p99_s": float(p99),
+        "minimo_s": float(min(tempos)),
+        "maximo_s": float(max(tempos)),
+        "memoria_pico_MB": memoria,
+    }
+
+
+def executar(arquivos, backends, operacoes, aquecimento=1, repeticoes=5, memoria=True,
+             usar_cache=False, memoria_max_matriz=2 * 1024**3, modo_bfs=None, estatisticas=False,
+             ordens=("nenhuma",)):
+    """
+    Roda o benchmark e devolve a lista de resultados (um dicionário por
+    arquivo, backend, ordem dos vértices e operação; ver ORDENS). O
+    carregamento de uma ordem inclui o cálculo da renumeração. Backends de
+    matriz cuja alocação passaria
+    de `memoria_max_matriz` bytes são pulados. Com `estatisticas`, BFS, DFS e
+    componentes rodam mais uma vez instrumentadas (fora das medições) e o
+    resultado ganha o campo "estatisticas" (contadores, fronteiras por nível
+    e tempos por fase).
+    """
+    resultados = []
+
+    for arquivo in arquivos:
+        n_cabecalho = _ler_n(arquivo)
+
+        for backend in backends:
+            carregar, origem, bytes_celula = BACKENDS[backend]
+            if bytes_celula and n_cabecalho and (n_cabecalho + 1) ** 2 * bytes_celula > memoria_max_matriz:
+                print(f"[{os.path.basename(arquivo)}] {backend}: pulado (matriz de "
+                      f"{(n_cabecalho + 1) ** 2 * bytes_celula / 1024**2:.0f} MB)")
+                continue
+
+            for ordem in ordens:
+                reordenar = None if ordem == "nenhuma" else ordem
+                if "carregamento" in operacoes:
+                    # Um grafo novo a cada repetição
+                    tempos = medir_tempos(lambda: carregar(arquivo, usar_cache, reordenar), aquecimento, repeticoes)
+                    mem = medir_memoria(lambda: carregar(arquivo, usar_cache, reordenar)) if memoria else None
+
+                grafo = carregar(arquivo, usar_cache, reordenar)
+                if modo_bfs and hasattr(grafo, "modo_bfs"):
+                    grafo.modo_bfs = modo_bfs
+                n, m = grafo.n, grafo.num_arestas
+
+                if "carregamento" in operacoes:
+                    resultados.append(_resultado(arquivo, n, m, backend, ordem, "carregamento", tempos, mem))
+                    _mostrar(resultados[-1])
+
+                for operacao in operacoes:
+                    if operacao == "carregamento":
+                        continue
+                    funcao = _operacao(operacao, grafo, origem)
+                    tempos = medir_tempos(funcao, aquecimento, repeticoes)
+                    mem = medir_memoria(funcao) if memoria else None
+                    resultados.append(_resultado(arquivo, n, m, backend, ordem, operacao, tempos, mem))
+                    _mostrar(resultados[-1])
+
+                    est = _instrumentar(operacao, grafo, origem) if estatisticas else None
+                    if est is not None:
+                        resultados[-1]["estatisticas"] = est.como_dict()
+                        print("    " + est.resumo(niveis=False).replace("\n", "\n    "))
+
+                del grafo
+                gc.collect()
+
+    return resultados
+
+
+def _mostrar(r):
+    memoria = f"{r['memoria_pico_MB']:.2f} MB" if r["memoria_pico_MB"] is not None else "-"
+    print(f"[{r['arquivo']}] {r['backend']:<13} {r['ordem']:<7} {r['operacao']:<12} mediana {r['mediana_s']:.4f} s | "
+          f"p90 {r['p90_s']:.4f} s | p99 {r['p99_s']:.4f} s | pico {memoria}")
+
+
+def _chave(r):
+    # Baselines anteriores às ordens não têm o campo: numeração do arquivo
+    return (r["arquivo"], r["backend"], r.get("ordem", "nenhuma"), r["operacao"])
+
+
+def ganhos_por_ordem(resultados):
+    """
+    Ganho de cada ordem sobre a numeração do arquivo, por arquivo, backend e
+    operação: lista de (resultado, mediana sem reordenação, aceleração).
+    """
+    sem_ordem = {(r["arquivo"], r["backend"], r["operacao"]): r["mediana_s"]
+                 for r in resultados if r["ordem"] == "nenhuma"}
+    ganhos = []
+    for r in resultados:
+        base = sem_ordem.get((r["arquivo"], r["backend"], r["operacao"]))
+        if r["ordem"] == "nenhuma" or base is None:
+            continue
+        ganhos.append((r, base, base / r["mediana_s"] if r["mediana_s"] > 0 else float("inf")))
+    return ganhos
+
+
+def comparar_com_baseline(resultados, baseline, limite: float, tolerancia_s: float = 0.001):
+    """
+    Compara as medianas com as do baseline. Há regressão quando a mediana
+    atual passa de (1 + limite) vezes a do baseline e a diferença absoluta
+    passa de `tolerancia_s` (ruído de medições muito curtas).
+
+    :return: lista de (resultado, mediana_baseline, razao) das regressões.
+    """
+    anteriores = {_chave(r): r for r in baseline}
+    regressoes = []
+
+    for r in resultados:
+        base = anteriores.get(_chave(r))
+        if base is None:
+            continue
+        razao = r["mediana_s"] / base["mediana_s"] if base["mediana_s"] > 0 else float("inf")
+        if razao > 1 + limite and r["mediana_s"] - base["mediana_s"] > tolerancia_s:
+            regressoes.append((r, base["mediana_s"], razao))
+
+    return regressoes
+
+
+def salvar_json(resultados, arquivo: str):
+    with open(arquivo, "w") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+def salvar_csv(resultados, arquivo: str):
+    if not resultados:
+        return
+    with open(arquivo, "w", newline="") as f:
+        # As estatísticas instrumentadas (aninhadas) só vão para o JSON
+        campos = [c for c in resultados[0] if c != "estatisticas"]
+        escritor = csv.DictWriter(f, fieldnames=campos, extrasaction="ignore")
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das representações de grafo.")
+    parser.add_argument("arquivos", nargs="+", help="arquivos de arestas (primeira linha N, depois 'u v')")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=["lista", "csr", "matriz_bits"])
+    parser.add_argument("--operacoes", nargs="+", choices=OPERACOES, default=list(OPERACOES))
+    parser.add_argument("--aquecimento", type=int, default=1, help="execuções descartadas antes de medir")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--sem-memoria", action="store_true", help="não faz a passada extra com tracemalloc")
+    parser.add_argument("--cache", action="store_true", help="carrega pelo cache binário (cache_grafo)")
+    parser.add_argument("--modo-bfs", choices=["fila", "niveis", "hibrida"], help="modo de BFS do Grafo_CSR")
+    parser.add_argument("--ordens", nargs="+", choices=ORDENS, default=["nenhuma"],
+                        help="numerações dos vértices a medir (ver reordenacao.py)")
+    parser.add_argument("--memoria-max-matriz", type=float, default=2048, help="MB; pula matrizes maiores")
+    parser.add_argument("--estatisticas", action="store_true",
+                        help="roda BFS/DFS/componentes instrumentadas e inclui os contadores no resultado")
+    parser.add_argument("--json", help="grava os resultados em JSON (serve de baseline)")
+    parser.add_argument("--csv", help="grava os resultados em CSV")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--limite", type=float, default=0.10, help="piora relativa tolerada na mediana")
+    args = parser.parse_args(argv)
+
+    resultados = executar(args.arquivos, args.backends, args.operacoes, args.aquecimento, args.repeticoes,
+                          memoria=not args.sem_memoria, usar_cache=args.cache,
+                          memoria_max_matriz=args.memoria_max_matriz * 1024**2, modo_bfs=args.modo_bfs,
+                          estatisticas=args.estatisticas, ordens=args.ordens)
+
+    ganhos = ganhos_por_ordem(resultados)
+    if ganhos:
+        print("\nGanho de cada ordem sobre a numeração do arquivo (mediana sem / com):")
+        for r, base, ganho in ganhos:
+            print(f"  [{r['arquivo']}] {r['backend']:<13} {r['ordem']:<7} {r['operacao']:<12} "
+                  f"{base:.4f} s -> {r['mediana_s']:.4f} s ({ganho:.2f}x)")
+
+    if args.json:
+        salvar_json(resultados, args.json)
+        print(f"Resultados salvos em '{args.json}'")
+    if args.csv:
+        salvar_csv(resultados, args.csv)
+        print(f"Resultados salvos em '{args.csv}'")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressoes = comparar_com_baseline(resultados, baseline, args.limite)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) acima de {args.limite:.0%}:")
+            for r, base, razao in regressoes:
+                print(f"  [{r['arquivo']}] {r['backend']} {r['ordem']} {r['operacao']}: "
+                      f"{base:.4f} s -> {r['mediana_s']:.4f} s ({razao:.2f}x)")
+            return 1
+        print("\nNenhuma regressão em relação ao baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
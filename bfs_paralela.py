@@ -0,0 +1,102 @@
+import os
+import time
+import numpy as np
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.util import Finalize
+
+from grafos_lib_csr import Grafo_CSR
+
+# Grafo reconstruído em cada processo a partir da memória compartilhada
+_grafo = None
+_segmentos = []
+
+
+def _compartilhar(array: np.ndarray):
+    """Copia o array para um segmento de memória compartilhada; devolve (segmento, descrição)."""
+    array = np.ascontiguousarray(array)
+    segmento = SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=segmento.buf)[...] = array
+    return segmento, (segmento.name, array.shape, array.dtype.str)
+
+
+def _anexar(descricao):
+    nome, forma, tipo = descricao
+    segmento = SharedMemory(name=nome)
+    _segmentos.append(segmento)
+    return np.ndarray(forma, dtype=np.dtype(tipo), buffer=segmento.buf)
+
+
+def _fechar_segmentos():
+    """Na saída do processo: solta o grafo (que usa os buffers) e fecha os segmentos anexados."""
+    global _grafo
+    _grafo = None
+    while _segmentos:
+        _segmentos.pop().close()
+
+
+def _iniciar_processo(n, num_arestas, desc_offsets, desc_indices, modo):
+    global _grafo
+    _grafo = Grafo_CSR(n, _anexar(desc_offsets), _anexar(desc_indices), num_arestas)
+    _grafo.modo_bfs = modo
+    # Roda quando o processo do pool termina normalmente (close + join)
+    Finalize(None, _fechar_segmentos, exitpriority=10)
+
+
+def _bfs_uma_fonte(v):
+    t0 = time.perf_counter()
+    _, nivel = _grafo.busca_largura(v)
+    t_bfs = time.perf_counter() - t0
+
+    nivel = np.asarray(nivel)
+    return {
+        'vertice': v,
+        'bfs_tempo': t_bfs,
+        'max_nivel': int(nivel.max()) if len(nivel) else -1,
+        'unreachable': int(np.count_nonzero(nivel == -1)),
+    }
+
+
+def bfs_em_lote(grafo, fontes, processos: int = None, modo: str = "niveis"):
+    """
+    Executa uma BFS a partir de cada vértice de `fontes` em um pool de processos.
+
+    Os arrays CSR (offsets e indices) são copiados uma única vez para memória
+    compartilhada (multiprocessing.shared_memory); cada processo apenas se
+    anexa a eles, sem serializar o grafo. Aceita Grafo_CSR ou Lista_Grafo
+    (convertida com Grafo_CSR.de_lista); os vértices são 0-based.
+
+    :param processos: número de processos (padrão: os.cpu_count()).
+    :param modo: modo de BFS usado nos processos ("fila", "niveis" ou "hibrida").
+    :return: lista, na ordem de `fontes`, de dicionários com 'vertice',
+             'bfs_tempo', 'max_nivel' (excentricidade) e 'unreachable'
+             (vértices inacessíveis), as mesmas chaves de testar_bfs_varios.
+    """
+    if not isinstance(grafo, Grafo_CSR):
+        grafo = Grafo_CSR.de_lista(grafo)
+
+    fontes = [int(v) for v in fontes]
+    # Os processos trabalham sobre offsets/indices, na numeração interna de um grafo reordenado
+    internas = fontes if grafo.ordenacao is None else grafo.ordenacao.interno(fontes).tolist()
+    processos = processos or os.cpu_count() or 1
+    # Lotes grandes o bastante para diluir a comunicação, mas ainda balanceados
+    lote = max(1, len(fontes) // (processos * 8))
+
+    seg_offsets, desc_offsets = _compartilhar(grafo.offsets)
+    seg_indices, desc_indices = _compartilhar(grafo.indices)
+    try:
+        with Pool(processos, initializer=_iniciar_processo,
+                  initargs=(grafo.n, grafo.num_arestas, desc_offsets, desc_indices, modo)) as pool:
+            resultados = pool.map(_bfs_uma_fonte, internas, chunksize=lote)
+            # Sem isso, a saída do `with` encerra os processos com terminate() e
+            # os finalizadores deles (que fecham os segmentos) não rodam
+            pool.close()
+            pool.join()
+    finally:
+        for segmento in (seg_offsets, seg_indices):
+            segmento.close()
+            segmento.unlink()
+
+    for resultado, v in zip(resultados, fontes):
+        resultado['vertice'] = v
+    return resultados
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+import numpy as np
+
+# Orçamento padrão de memória do cache de BFS
+LIMITE_PADRAO = 256 * 1024 * 1024
+
+
+class CacheBFS:
+    """
+    Cache LRU dos resultados de BFS (pai, nivel) por vértice de origem.
+
+    Os resultados são guardados como arrays int32 somente leitura e o total
+    de bytes guardados nunca passa de `limite_bytes`: ao inserir, os menos
+    usados recentemente são descartados. Um resultado maior que o orçamento
+    inteiro não é guardado.
+    """
+
+    def __init__(self, limite_bytes: int = LIMITE_PADRAO):
+        self.limite_bytes = limite_bytes
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+        self._entradas = OrderedDict()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obter(self, chave):
+        """Devolve (pai, nivel) guardados para `chave` ou None (contando acerto/falha)."""
+        resultado = self._entradas.get(chave)
+        if resultado is None:
+            self.falhas += 1
+            return None
+        self._entradas.move_to_end(chave)
+        self.acertos += 1
+        return resultado
+
+    def guardar(self, chave, pai, nivel):
+        pai = np.array(pai, dtype=np.int32)
+        nivel = np.array(nivel, dtype=np.int32)
+        pai.flags.writeable = False
+        nivel.flags.writeable = False
+
+        tamanho = pai.nbytes + nivel.nbytes
+        if tamanho > self.limite_bytes:
+            return
+
+        anterior = self._entradas.pop(chave, None)
+        if anterior is not None:
+            self.bytes_usados -= anterior[0].nbytes + anterior[1].nbytes
+
+        while self._entradas and self.bytes_usados + tamanho > self.limite_bytes:
+            _, (p, n) = self._entradas.popitem(last=False)
+            self.bytes_usados -= p.nbytes + n.nbytes
+
+        self._entradas[chave] = (pai, nivel)
+        self.bytes_usados += tamanho
+
+    def invalidar(self):
+        """Descarta todos os resultados (o grafo mudou); os contadores são mantidos."""
+        self._entradas.clear()
+        self.bytes_usados = 0
+
+    def estatisticas(self) -> dict:
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "entradas": len(self._entradas),
+            "bytes_usados": self.bytes_usados,
+            "limite_bytes": self.limite_bytes,
+        }
@@ -0,0 +1,187 @@
+import os
+import hashlib
+import secrets
+import numpy as np
+
+from leitura_arestas import arestas_para_csr, ler_arestas
+
+# Identificação do formato: "GRAFOCSR" em ASCII e versão do layout
+MAGICO = int.from_bytes(b"GRAFOCSR", "little", signed=True)
+VERSAO = 1
+
+# Posições no array de cabeçalho
+_TAMANHO, _MTIME, _HASH, _N, _ARESTAS, _FORA, _DUPLICADAS, _INVALIDAS = range(2, 10)
+
+
+
+def caminho_cache(arquivo: str) -> str:
+    """O cache fica ao lado do arquivo de origem."""
+    return arquivo + ".cache"
+
+
+def _criar_temporario(caminho: str):
+    """
+    Cria um arquivo novo e exclusivo ao lado de `caminho` e devolve (fd,
+    nome). O modo 0666 passa pela umask atual, como em open(), de modo que o
+    cache publicado tem as mesmas permissões de um arquivo comum.
+    """
+    while True:
+        temporario = f"{caminho}.{secrets.token_hex(4)}.tmp"
+        try:
+            return os.open(temporario, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666), temporario
+        except FileExistsError:
+            continue
+
+
+def salvar_arrays(caminho: str, *arrays):
+    """
+    Grava vários arrays em um único arquivo, um registro .npy após o outro.
+
+    A gravação é feita em um arquivo temporário próprio (processos que gravam
+    o mesmo cache ao mesmo tempo não se atrapalham) e renomeada no final, de
+    modo que leitores que já mapearam a versão anterior não são afetados. Se
+    a gravação falhar, o temporário é removido.
+    """
+    fd, temporario = _criar_temporario(caminho)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for a in arrays:
+                np.lib.format.write_array(f, np.ascontiguousarray(a), allow_pickle=False)
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
+        raise
+
+
+def mapear_arrays(caminho: str, modo: str = "r"):
+    """Mapeia em memória (np.memmap) todos os arrays gravados por salvar_arrays."""
+    arrays = []
+    with open(caminho, "rb") as f:
+        tamanho = os.fstat(f.fileno()).st_size
+        while f.tell() < tamanho:
+            versao = np.lib.format.read_magic(f)
+            if versao == (1, 0):
+                forma, fortran, tipo = np.lib.format.read_array_header_1_0(f)
+            else:
+                forma, fortran, tipo = np.lib.format.read_array_header_2_0(f)
+
+            inicio = f.tell()
+            nbytes = int(np.prod(forma, dtype=np.int64)) * tipo.itemsize
+            if nbytes == 0:
+                arrays.append(np.empty(forma, dtype=tipo))
+            else:
+                ordem = "F" if fortran else "C"
+                arrays.append(np.memmap(caminho, dtype=tipo, mode=modo, offset=inicio, shape=forma, order=ordem))
+            f.seek(inicio + nbytes)
+    return arrays
+
+
+def hash_arquivo(arquivo: str) -> int:
+    """Hash de 64 bits (BLAKE2b) do conteúdo do arquivo."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(arquivo, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return int.from_bytes(h.digest(), "little", signed=True)
+
+
+def _cache_valido(arquivo: str, caminho: str):
+    """Devolve os arrays mapeados se o cache corresponde ao arquivo atual, senão None."""
+    if not os.path.exists(caminho):
+        return None
+
+    try:
+        arrays = mapear_arrays(caminho)
+    except (OSError, ValueError):
+        return None
+
+    cabecalho = arrays[0]
+    if len(arrays) != 3 or len(cabecalho) <= _INVALIDAS or cabecalho[0] != MAGICO or cabecalho[1] != VERSAO:
+        return None
+
+    info = os.stat(arquivo)
+    if cabecalho[_TAMANHO] != info.st_size:
+        return None
+
+    if cabecalho[_MTIME] != info.st_mtime_ns:
+        # Mesmo tamanho mas mtime diferente (ex.: arquivo copiado): decide pelo conteúdo
+        if cabecalho[_HASH] != hash_arquivo(arquivo):
+            return None
+        # Guarda o novo mtime para não refazer o hash na próxima leitura; se o
+        # cache não puder ser alterado (somente leitura, de outro usuário),
+        # o conteúdo já foi confirmado pelo hash e os arrays servem assim mesmo
+        try:
+            atualizado = np.memmap(caminho, dtype=cabecalho.dtype, mode="r+", offset=cabecalho.offset,
+                                   shape=cabecalho.shape)
+            atualizado[_MTIME] = info.st_mtime_ns
+            atualizado.flush()
+            del atualizado
+        except OSError:
+            pass
+
+    return arrays
+
+
+def carregar_csr(arquivo: str, usar_cache: bool = True):
+    """
+    Carrega o grafo em formato CSR, usando o cache binário quando possível.
+
+    Na primeira leitura o arquivo texto é convertido (leitura_arestas) e o
+    resultado é gravado em `<arquivo>.cache`; as leituras seguintes apenas
+    mapeiam esse arquivo em memória. O cache é refeito quando tamanho, mtime
+    ou hash do arquivo de origem mudam.
+
+    :return: (n, offsets, indices, num_arestas, descartes); com cache,
+             offsets e indices são np.memmap somente leitura.
+    """
+    caminho = caminho_cache(arquivo)
+
+    if usar_cache:
+        arrays = _cache_valido(arquivo, caminho)
+        if arrays is not None:
+            cabecalho, offsets, indices = arrays
+            descartes = {
+                "fora_intervalo": int(cabecalho[_FORA]),
+                "duplicadas": int(cabecalho[_DUPLICADAS]),
+                "invalidas": int(cabecalho[_INVALIDAS]),
+            }
+            return int(cabecalho[_N]), offsets, indices, int(cabecalho[_ARESTAS]), descartes
+
+    info = os.stat(arquivo) if usar_cache else None
+    n, origem, destino, descartes = ler_arestas(arquivo)
+    offsets, indices = arestas_para_csr(n, origem, destino)
+
+    if usar_cache:
+        cabecalho = np.array([
+            MAGICO, VERSAO, info.st_size, info.st_mtime_ns, hash_arquivo(arquivo),
+            n, len(origem), descartes["fora_intervalo"], descartes["duplicadas"], descartes["invalidas"],
+        ], dtype=np.int64)
+        try:
+            salvar_arrays(caminho, cabecalho, offsets, indices)
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar o cache '{caminho}': {e}")
+
+    return n, offsets, indices, len(origem), descartes
+
+
+def carregar_arestas(arquivo: str, usar_cache: bool = True):
+    """
+    Como leitura_arestas.ler_arestas, mas passando pelo cache binário.
+
+    Com cache, as arestas são reconstruídas a partir do CSR (u <= v), sem a
+    ordem original do arquivo.
+    """
+    if not usar_cache:
+        return ler_arestas(arquivo)
+
+    n, offsets, indices, _, descartes = carregar_csr(arquivo)
+    origem = np.repeat(np.arange(n, dtype=np.int32), np.diff(offsets))
+    destino = np.asarray(indices)
+
+    # Cada aresta aparece nos dois sentidos; laços (u, u) aparecem duas vezes
+    manter = origem < destino
+    lacos = np.unique(origem[origem == destino])
+    return n, np.concatenate([origem[manter], lacos]), np.concatenate([destino[manter], lacos]), descartes
@@ -0,0 +1,29 @@
+"""
+Apoio à busca bidirecional de caminho mínimo (`caminho_minimo(u, v)` de
+Lista_Grafo, Grafo_CSR e Grafo_Matriz).
+
+As três implementações seguem o mesmo esquema: uma BFS a partir de cada
+ponta, expandindo a cada rodada o nível inteiro da menor fronteira, e
+parando no primeiro vértice descoberto por um lado que o outro já tinha
+alcançado. Como cada lado avança um nível completo por vez, esse primeiro
+encontro já dá a menor distância.
+"""
+
+
+def reconstruir_caminho(pai_origem, pai_destino, encontro: int):
+    """
+    Caminho origem -> destino passando por `encontro`, a partir dos pais das
+    duas buscas (-1 na raiz de cada uma). Aceita listas, arrays ou dicionários.
+    """
+    caminho = []
+    x = encontro
+    while x != -1:
+        caminho.append(int(x))
+        x = pai_origem[x]
+    caminho.reverse()
+
+    x = pai_destino[encontro]
+    while x != -1:
+        caminho.append(int(x))
+        x = pai_destino[x]
+    return caminho
@@ -1,3 +1,4 @@
+import os
 import sys
 import time
 import tracemalloc
@@ -14,16 +15,20 @@ except Exception:
 # - Lista_Grafo (grafos_lib.py): Indexação 0-based (vértices 0 a N-1).
 # - Grafo_Matriz (grafos_lib_matrix.py): Indexação 1-based (vértices 1 a N).
 from grafos_lib import Lista_Grafo
-from grafos_lib_matrix import Grafo_Matriz
-
-# Definir limites de recursão para DFS/Componentes Conexos em grafos grandes.
-# O valor 100.000 é necessário para grafos com caminhos longos (72k vértices).
-sys.setrecursionlimit(100000)
+from grafos_lib_matrix import Grafo_Matriz, Grafo_Matriz_Bits, Grafo_Matriz_Blocos
+from grafos_lib_csr import Grafo_CSR
+from uniao_busca import componentes_do_arquivo
+from diametro import diametro_exato
+from bfs_paralela import bfs_em_lote
 
 # --- FUNÇÃO AUXILIAR DE TESTE DE DESEMPENHO ---
 
-def testar_desempenho(grafo_class, arquivo: str, nome_representacao: str, vertice_inicio: int, amostra_bfs_count: int = 0):
-    """Mede o tempo e memória para carregamento, BFS e Componentes Conexos."""
+def testar_desempenho(grafo_class, arquivo: str, nome_representacao: str, vertice_inicio: int, amostra_bfs_count: int = 0, usar_cache: bool = True):
+    """Mede o tempo e memória para carregamento, BFS e Componentes Conexos.
+
+    Com usar_cache, o carregamento usa o cache binário `<arquivo>.cache`
+    (criado na primeira execução); passe False para medir a leitura do texto.
+    """
     
     resultados = {}
     print(f"\n--- Testando {nome_representacao} ({grafo_class.__name__}) ---")
@@ -33,10 +38,10 @@ def testar_desempenho(grafo_class, arquivo: str, nome_representacao: str, vertic
     t0 = time.perf_counter()
     try:
         # Usa o método de carregamento apropriado para cada classe
-        if nome_representacao.startswith("Lista"):
-            grafo = grafo_class.ler_de_arquivo(arquivo)
+        if hasattr(grafo_class, "ler_de_arquivo"):
+            grafo = grafo_class.ler_de_arquivo(arquivo, usar_cache=usar_cache)
         else: # Grafo_Matriz
-            grafo = grafo_class.from_file(arquivo)
+            grafo = grafo_class.from_file(arquivo, usar_cache=usar_cache)
             
     except Exception as e:
         print(f"Erro ao carregar o grafo {nome_representacao}: {e}")
@@ -75,13 +80,13 @@ def testar_desempenho(grafo_class, arquivo: str, nome_representacao: str, vertic
     if amostra_bfs_count and amostra_bfs_count > 0:
         # Seleciona vértices para testar: primeiro (inicio), maior grau, menor grau e aleatórios
         try:
-            if isinstance(grafo.adj, dict):
+            if isinstance(getattr(grafo, "adj", None), dict):
                 keys_vertices = list(grafo.adj.keys())
                 degrees_dict = {v: len(nei) for v, nei in grafo.adj.items()}
             else:
-                # Matriz (numpy): soma por linha. Inclui índice 0 no grafo matriz.
-                keys_vertices = list(range(len(grafo.adj)))
-                degrees_arr = np.sum(grafo.adj, axis=1).tolist()
+                # CSR e Matriz (densa ou em bits): graus() por vértice. Inclui índice 0 no grafo matriz.
+                degrees_arr = grafo.graus().tolist()
+                keys_vertices = list(range(len(degrees_arr)))
                 degrees_dict = {i: int(degrees_arr[i]) for i in keys_vertices}
         except Exception:
             keys_vertices = list(range(grafo.n))
@@ -145,21 +150,78 @@ def testar_desempenho(grafo_class, arquivo: str, nome_representacao: str, vertic
     
     return grafo, resultados
 
-# --- FUNÇÃO PARA CÁLCULO DE DIÂMETRO (Exige O(N * (N+E))) ---
+# --- COMPONENTES SEM MONTAR O GRAFO ---
+
+def testar_componentes_arquivo(arquivo: str):
+    """Mede tempo e memória das componentes por união-busca lidas direto do arquivo (sem montar o grafo)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    n, tamanhos = componentes_do_arquivo(arquivo)
+    t_comp = time.perf_counter() - t0
+    _, mem_pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    resultados = {
+        'comp_tempo': t_comp,
+        'comp_memoria_pico_MB': mem_pico / 1024**2,
+        'n_vertices': n,
+        'n_componentes': len(tamanhos),
+        'max_comp_size': int(tamanhos.max()) if len(tamanhos) else 0,
+        'min_comp_size': int(tamanhos.min()) if len(tamanhos) else 0,
+    }
+
+    print("\n--- Componentes por união-busca direto do arquivo ---")
+    print(f"Tempo (leitura + componentes): {t_comp:.4f} s")
+    print(f"Memória Pico: {resultados['comp_memoria_pico_MB']:.2f} MB")
+    print(f"N° Componentes: {resultados['n_componentes']}")
+    print(f"Maior Componente: {resultados['max_comp_size']}")
+    print(f"Menor Componente: {resultados['min_comp_size']}")
+    return resultados
+
+# --- FUNÇÃO PARA CÁLCULO DE DIÂMETRO ---
+
+def calcular_diametro(grafo: Lista_Grafo, nome_grafo: str, metodo: str = "limites", processos: int = 1):
+    """Calcula o diâmetro (maior caminho mínimo) do grafo.
 
-def calcular_diametro(grafo: Lista_Grafo, nome_grafo: str):
-    """Calcula o diâmetro (maior caminho mínimo) do grafo usando N BFS."""
+    Métodos:
+    - "limites": exato, com poda por limites de excentricidade (diametro.diametro_exato);
+      em grafos reais costuma precisar de poucas dezenas de BFS.
+    - "todos": exato, uma BFS por vértice (O(N * (N+E))); com processos > 1 as BFS
+      são distribuídas em paralelo (bfs_paralela.bfs_em_lote, Lista_Grafo ou Grafo_CSR);
+      senão, Lista_Grafo e Grafo_CSR usam a BFS bit-paralela (Grafo_CSR.excentricidades).
+    - "amostra": estimativa por double-sweep a partir de uma amostra de vértices.
+    - "auto": comportamento antigo ("todos" para N <= 10000, senão "amostra").
+    """
     
     print(f"\n--- Calculando Diâmetro para {nome_grafo} ---")
     
-    # Para grafos muito grandes, calcular N BFS é proibitivo.
-    # Abordagem:
-    # - Se o grafo é pequeno (<= 10000 vértices) realizamos BFS a partir de todos.
-    # - Caso contrário usamos heurística (double-sweep) a partir de amostra de vértices.
+    if metodo == "auto":
+        metodo = "todos" if grafo.n <= 10000 else "amostra"
+    if metodo not in ("limites", "todos", "amostra"):
+        raise ValueError(f"Método de diâmetro desconhecido: {metodo}")
+
     max_distancia_encontrada = 0
     t0 = time.perf_counter()
 
-    if grafo.n <= 10000:
+    if metodo == "limites":
+        print(f"O grafo tem {grafo.n} vértices. Calculando diâmetro exato com poda por limites de excentricidade.")
+        relatorio = []
+        max_distancia_encontrada, num_bfs = diametro_exato(grafo, relatorio=relatorio)
+        for r in relatorio:
+            print(f"BFS {r['bfs']:>4}: vértice {r['vertice']} | excentricidade {r['excentricidade']} | "
+                  f"limites [{r['limite_inferior']}, {r['limite_superior']}] | candidatos {r['candidatos']}")
+        print(f"BFS executadas: {num_bfs} (de {grafo.n} vértices)")
+    elif metodo == "todos" and processos > 1:
+        print(f"O grafo tem {grafo.n} vértices. Calculando diâmetro exato (N BFS em {processos} processos).")
+        resultados = bfs_em_lote(grafo, range(grafo.n), processos=processos)
+        max_distancia_encontrada = max((r['max_nivel'] for r in resultados), default=0)
+    elif metodo == "todos" and not isinstance(grafo, Grafo_Matriz):
+        # BFS bit-paralela: 256 fontes por passada pelas arestas
+        print(f"O grafo tem {grafo.n} vértices. Calculando diâmetro exato (N BFS em lotes de MS-BFS).")
+        csr = grafo if isinstance(grafo, Grafo_CSR) else Grafo_CSR.de_lista(grafo)
+        excentricidade, _ = csr.excentricidades()
+        max_distancia_encontrada = int(excentricidade.max()) if len(excentricidade) else 0
+    elif metodo == "todos":
         vertices_para_testar = grafo.n
         print(f"O grafo tem {grafo.n} vértices. Calculando diâmetro exato (N BFS).")
         for v_inicio in range(grafo.n):
@@ -168,7 +230,7 @@ def calcular_diametro(grafo: Lista_Grafo, nome_grafo: str):
             except Exception as e:
                 print(f"Erro na BFS a partir de {v_inicio}: {e}")
                 continue
-            excentricidade = max(n for n in nivel if n != -1)
+            excentricidade = int(np.max(nivel))
             max_distancia_encontrada = max(max_distancia_encontrada, excentricidade)
             if v_inicio % 50 == 0 and v_inicio > 0:
                 print(f"Progresso: {v_inicio}/{vertices_para_testar}. Diâmetro parcial: {max_distancia_encontrada}")
@@ -178,7 +240,7 @@ def calcular_diametro(grafo: Lista_Grafo, nome_grafo: str):
         print(f"AVISO: O grafo tem {grafo.n} vértices. Calculando diâmetro estimado com heurística (double-sweep) usando {sample_size} amostras.)")
 
         # Seleciona vértices amostrados uniformemente e alguns aleatórios
-        all_vertices = list(grafo.adj.keys()) if isinstance(grafo.adj, dict) else list(range(grafo.n))
+        all_vertices = list(grafo.adj.keys()) if isinstance(getattr(grafo, "adj", None), dict) else list(range(grafo.n))
         step = max(1, len(all_vertices) // sample_size)
         sample = [all_vertices[i] for i in range(0, len(all_vertices), step)][:sample_size]
         # Adiciona alguns vértices aleatórios para diversificar a amostra
@@ -195,18 +257,17 @@ def calcular_diametro(grafo: Lista_Grafo, nome_grafo: str):
                 print(f"Erro na BFS a partir de {v_inicio}: {e}")
                 continue
             # Encontrar vértice mais distante u
-            # Observação: nivel é uma lista com níveis (ou -1)
-            max_nivel = max(n for n in nivel if n != -1)
+            # Observação: nivel é uma lista ou array com níveis (ou -1)
+            nivel = np.asarray(nivel)
             # o vértice mais distante: pega índex do nível máximo
-            farthest_indices = [i for i, lvl in enumerate(nivel) if lvl == max_nivel]
-            u = farthest_indices[0]
+            u = int(np.argmax(nivel))
             # BFS a partir de u
             try:
                 _, nivel2 = grafo.busca_largura(u)
             except Exception as e:
                 print(f"Erro na BFS a partir de {u}: {e}")
                 continue
-            candidate = max(n for n in nivel2 if n != -1)
+            candidate = int(np.max(nivel2))
             if candidate > max_distancia_encontrada:
                 max_distancia_encontrada = candidate
             if idx % 10 == 0 and idx > 0:
@@ -269,9 +330,10 @@ def testar_bfs_varios(grafo: Lista_Grafo, vertices, nome_grafo: str):
         mem_atual, mem_pico_bfs = tracemalloc.get_traced_memory()
         tracemalloc.stop()
 
-        reachable = [n for n in nivel if n != -1]
-        max_nivel = max(reachable) if reachable else -1
-        unreachable_count = sum(1 for n in nivel if n == -1)
+        # Aceita listas (Lista_Grafo) ou arrays int32 (Grafo_CSR com BFS por níveis)
+        nivel = np.asarray(nivel)
+        max_nivel = int(nivel.max()) if len(nivel) else -1
+        unreachable_count = int(np.count_nonzero(nivel == -1))
 
         resultados.append({
             'vertice': v,
@@ -313,18 +375,42 @@ def main_testes():
     
     # 1. Lista de Adjacência (0-based)
     grafo_l_collab, res_l = testar_desempenho(Lista_Grafo, COLLAB_FILE, "Lista de Adjacência", vertice_inicio=0, amostra_bfs_count=5)
+
+    # 1b. Lista de Adjacência compacta (CSR, 0-based)
+    grafo_c_collab, res_c = testar_desempenho(Grafo_CSR, COLLAB_FILE, "Lista CSR", vertice_inicio=0, amostra_bfs_count=5)
     
     # 2. Matriz de Adjacência (1-based). Pode falhar por memória (N^2 ~ 5 GB).
     grafo_m_collab, res_m = testar_desempenho(Grafo_Matriz, COLLAB_FILE, "Matriz de Adjacência", vertice_inicio=1, amostra_bfs_count=5)
 
+    # 3. Matriz de Adjacência compactada em bits (1-based): 8 células por byte.
+    grafo_b_collab, res_b = testar_desempenho(Grafo_Matriz_Bits, COLLAB_FILE, "Matriz de Adjacência (bits)", vertice_inicio=1, amostra_bfs_count=5)
+
+    # 4. Matriz de Adjacência esparsa em blocos (1-based): só blocos com arestas são alocados.
+    grafo_s_collab, res_s = testar_desempenho(Grafo_Matriz_Blocos, COLLAB_FILE, "Matriz de Adjacência (blocos)", vertice_inicio=1, amostra_bfs_count=5)
+
     print("\n--- Sumário EC1 ---")
     print(f"1. Memória Lista (MB): {res_l['carregamento_memoria_MB']:.2f}")
+    if res_c:
+        print(f"   Memória Lista CSR (MB): {res_c['carregamento_memoria_MB']:.2f}")
+        print(f"   Tempo BFS Lista CSR (s): {res_c['bfs_tempo']:.4f}")
     if res_m:
         print(f"   Memória Matriz (MB): {res_m['carregamento_memoria_MB']:.2f}")
         print(f"2. Tempo BFS Lista (s): {res_l['bfs_tempo']:.4f}")
         print(f"   Tempo BFS Matriz (s): {res_m['bfs_tempo']:.4f}")
+    if res_b:
+        print(f"   Memória Matriz bits (MB): {res_b['carregamento_memoria_MB']:.2f}")
+        print(f"   Tempo BFS Matriz bits (s): {res_b['bfs_tempo']:.4f}")
+    if res_s:
+        print(f"   Memória Matriz blocos (MB): {res_s['carregamento_memoria_MB']:.2f}")
+        print(f"   Tempo BFS Matriz blocos (s): {res_s['bfs_tempo']:.4f}")
     print(f"3. Componentes: {res_l['n_componentes']} | Maior: {res_l['max_comp_size']} | Menor: {res_l['min_comp_size']}")
 
+    # Mesma contagem sem montar o grafo (união-busca direto do arquivo)
+    res_u = testar_componentes_arquivo(COLLAB_FILE)
+    print(f"   Componentes (união-busca): {res_u['n_componentes']} em {res_u['comp_tempo']:.4f} s, "
+          f"pico {res_u['comp_memoria_pico_MB']:.2f} MB (DFS: {res_l['comp_tempo']:.4f} s, "
+          f"pico {res_l['comp_memoria_pico_MB']:.2f} MB)")
+
     # ==========================================================
     #                 ESTUDO DE CASO 2: AS GRAPH
     # ==========================================================
@@ -359,6 +445,7 @@ def main_testes():
         print(f"N° Componentes: {res_l_as['n_componentes']}")
         print(f"Maior Componente: {res_l_as['max_comp_size']}")
         print(f"Menor Componente: {res_l_as['min_comp_size']}")
+        testar_componentes_arquivo(AS_FILE)
 
         # 3. Busca em Largura a partir do Vértice 1 (Excentricidade)
         print("\n--- 3. Excentricidade do Vértice 1 (ou 0) ---")
@@ -383,10 +470,33 @@ def main_testes():
 
         print(f"\nExecutando BFS em vértices de amostra: {sample_vertices}")
         bfs_res = testar_bfs_varios(grafo_l_as, sample_vertices, "AS Graph")
+
+        # Mesmas BFS com o CSR e a BFS vetorizada por níveis (mesmos IDs 0-based)
+        grafo_v_as = Grafo_CSR.ler_de_arquivo(AS_FILE, usar_cache=True)
+        grafo_v_as.modo_bfs = "niveis"
+        bfs_res_v = testar_bfs_varios(grafo_v_as, sample_vertices, "AS Graph (CSR, BFS por níveis)")
+
+        # As mesmas BFS distribuídas entre os núcleos (CSR em memória compartilhada)
+        t0 = time.perf_counter()
+        bfs_res_p = bfs_em_lote(grafo_v_as, sample_vertices)
+        print(f"\nBFS em paralelo ({os.cpu_count()} processos): {len(bfs_res_p)} vértices em {time.perf_counter() - t0:.4f} s")
+        for r in bfs_res_p:
+            print(f"Vértice {r['vertice']} -> Tempo: {r['bfs_tempo']:.4f}s | Max nível: {r['max_nivel']} | Inacessíveis: {r['unreachable']}")
+
+        # BFS híbrida (top-down/bottom-up): arestas examinadas por nível
+        relatorio = []
+        t0 = time.perf_counter()
+        grafo_v_as.busca_largura_hibrida(0, relatorio=relatorio)
+        print(f"\nBFS híbrida a partir do vértice 0: {time.perf_counter() - t0:.4f} s "
+              f"(alfa={grafo_v_as.alfa_bfs}, beta={grafo_v_as.beta_bfs})")
+        for r in relatorio:
+            print(f"Nível {r['nivel']:>3} | {r['direcao']:<9} | fronteira {r['fronteira']:>8} | arestas examinadas {r['arestas_examinadas']:>9}")
+        print(f"Total de arestas examinadas: {sum(r['arestas_examinadas'] for r in relatorio)} "
+              f"(BFS top-down examina {int(grafo_v_as.graus().sum())})")
         
-        # 4. Diâmetro da Internet
-        diametro = calcular_diametro(grafo_l_as, "AS Graph")
-        print(f"\n[FIM] Diâmetro Final Estimado (AS Graph): {diametro}")
+        # 4. Diâmetro da Internet: exato, com poda por limites (BFS por níveis)
+        diametro = calcular_diametro(grafo_v_as, "AS Graph", metodo="limites")
+        print(f"\n[FIM] Diâmetro Final (AS Graph): {diametro}")
         
     print("\n==============================================")
     print("TESTES CONCLUÍDOS. VERIFIQUE OS RESULTADOS.")
@@ -0,0 +1,257 @@
+"""
+Consultas sobre um grafo já carregado, usadas pelo modo não interativo do
+main.py (uma operação ou um lote de consultas sobre uma única carga).
+
+Os vértices das consultas e das respostas estão sempre na numeração do
+arquivo de entrada (1-based), qualquer que seja o backend. Uma consulta é
+um dicionário {"op": ..., ...} ou uma linha de texto "op arg1 arg2":
+
+    resumo                      N, arestas, grau mínimo/máximo/médio
+    grau v
+    bfs v [completo]            alcançados e excentricidade (e pai/nível)
+    dfs v [completo]
+    componentes                 número de componentes e maior/menor
+    componente v                tamanho da componente de v
+    distancia u v               número de arestas do menor caminho (-1 se não há)
+    caminho u v                 distância e vértices do menor caminho
+    mesmo_componente u v
+"""
+import contextlib
+import json
+import sys
+import time
+import numpy as np
+
+from grafos_lib import Lista_Grafo
+from grafos_lib_csr import Grafo_CSR
+from grafos_lib_matrix import Grafo_Matriz
+from escrita import pai_1based
+
+
+def _carregador_matriz(formato):
+    def carregar(arquivo, usar_cache, reordenar=None):
+        return Grafo_Matriz.from_file(arquivo, formato=formato, usar_cache=usar_cache, reordenar=reordenar)
+    return carregar
+
+
+# nome -> carregar(arquivo, usar_cache, reordenar=None)
+BACKENDS = {
+    "lista": Lista_Grafo.ler_de_arquivo,
+    "csr": Grafo_CSR.ler_de_arquivo,
+    "matriz": _carregador_matriz("densa"),
+    "matriz_bits": _carregador_matriz("bits"),
+    "matriz_blocos": _carregador_matriz("blocos"),
+}
+
+OPERACOES = ("resumo", "grau", "bfs", "dfs", "componentes", "componente", "distancia", "caminho",
+             "mesmo_componente")
+
+
+class ErroConsulta(ValueError):
+    """Consulta malformada ou com vértice inválido."""
+
+
+def carregar_grafo(arquivo: str, backend: str = "lista", usar_cache: bool = True, saida_log=None,
+                   reordenar: str = None):
+    """
+    Carrega o grafo no backend pedido. As mensagens de progresso da leitura
+    vão para `saida_log` (padrão: stdout), para não misturá-las a uma saída
+    JSON em stdout. `reordenar` renumera os vértices na carga (ver
+    reordenacao.py); consultas e respostas continuam nos ids do arquivo.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {backend}")
+    with contextlib.redirect_stdout(saida_log or sys.stdout):
+        return BACKENDS[backend](arquivo, usar_cache, reordenar)
+
+
+def primeiro_indice(grafo) -> int:
+    """Índice interno do vértice 1 do arquivo (1 na matriz, 0 nos demais)."""
+    return 1 if isinstance(grafo, Grafo_Matriz) else 0
+
+
+def interno(grafo, v: int) -> int:
+    """Converte um vértice do arquivo (1-based) para o índice do backend."""
+    if not 1 <= v <= grafo.n:
+        raise ErroConsulta(f"Vértice {v} fora do intervalo [1, {grafo.n}]")
+    return v - 1 + primeiro_indice(grafo)
+
+
+def _por_vertice(grafo, valores) -> np.ndarray:
+    """Array com um valor por vértice do arquivo (descarta a linha 0 da matriz)."""
+    valores = np.asarray(valores)
+    return valores[1:] if isinstance(grafo, Grafo_Matriz) else valores
+
+
+def _pais(grafo, pai) -> np.ndarray:
+    pai = _por_vertice(grafo, pai)
+    return pai.astype(np.int64) if isinstance(grafo, Grafo_Matriz) else pai_1based(pai)
+
+
+def _graus(grafo) -> np.ndarray:
+    return _por_vertice(grafo, grafo.graus())
+
+
+def _arvore(grafo, pai, nivel, completo: bool) -> dict:
+    nivel = _por_vertice(grafo, nivel)
+    resposta = {
+        "alcancados": int(np.count_nonzero(nivel >= 0)),
+        "excentricidade": int(nivel.max()) if len(nivel) else 0,
+    }
+    if completo:
+        resposta["pai"] = _pais(grafo, pai).tolist()
+        resposta["nivel"] = nivel.astype(np.int64).tolist()
+    return resposta
+
+
+def interpretar(linha: str, operacoes=OPERACOES) -> dict:
+    """Converte uma linha (JSON ou "op arg1 arg2 ...") em uma consulta."""
+    linha = linha.strip()
+    if linha.startswith("{"):
+        try:
+            consulta = json.loads(linha)
+        except json.JSONDecodeError as e:
+            raise ErroConsulta(f"JSON inválido: {e}")
+        if not isinstance(consulta, dict):
+            raise ErroConsulta("A consulta JSON deve ser um objeto")
+        return consulta
+
+    partes = linha.split()
+    op = partes[0]
+    args = partes[1:]
+    if op not in operacoes:
+        raise ErroConsulta(f"Operação desconhecida: {op!r} (use uma de {', '.join(operacoes)})")
+    consulta = {"op": op}
+    completo = "completo" in args
+    args = [a for a in args if a != "completo"]
+    try:
+        numeros = [int(a) for a in args]
+    except ValueError:
+        raise ErroConsulta(f"Argumentos inválidos: {' '.join(args)}")
+
+    if op in ("grau", "bfs", "dfs", "componente"):
+        if len(numeros) != 1:
+            raise ErroConsulta(f"'{op}' espera um vértice")
+        consulta["v"] = numeros[0]
+    elif op in ("distancia", "caminho", "mesmo_componente"):
+        if len(numeros) != 2:
+            raise ErroConsulta(f"'{op}' espera dois vértices")
+        consulta["u"], consulta["v"] = numeros
+    elif numeros:
+        raise ErroConsulta(f"'{op}' não recebe argumentos")
+    if completo:
+        consulta["completo"] = True
+    return consulta
+
+
+def _vertice(consulta: dict, chave: str) -> int:
+    if chave not in consulta:
+        raise ErroConsulta(f"Campo '{chave}' ausente")
+    valor = consulta[chave]
+    if isinstance(valor, bool) or not isinstance(valor, int):
+        raise ErroConsulta(f"Campo '{chave}' deve ser um inteiro")
+    return valor
+
+
+def responder(grafo, consulta: dict) -> dict:
+    """
+    Executa uma consulta e devolve a resposta (JSON-serializável). Erros de
+    consulta viram {"erro": ...} em vez de exceção, para não interromper um lote.
+    """
+    t0 = time.perf_counter()
+    try:
+        resposta = _executar(grafo, consulta)
+    except ErroConsulta as e:
+        resposta = {"erro": str(e)}
+    resposta = {"consulta": consulta, **resposta}
+    resposta["tempo_s"] = time.perf_counter() - t0
+    return resposta
+
+
+def _executar(grafo, consulta: dict) -> dict:
+    op = consulta.get("op")
+
+    if op == "resumo":
+        graus = _graus(grafo)
+        return {
+            "vertices": grafo.n,
+            "arestas": grafo.num_arestas,
+            "grau_min": int(graus.min()) if len(graus) else 0,
+            "grau_max": int(graus.max()) if len(graus) else 0,
+            "grau_medio": float(graus.mean()) if len(graus) else 0.0,
+        }
+
+    if op == "grau":
+        v = interno(grafo, _vertice(consulta, "v"))
+        return {"grau": len(grafo.vizinhos(v))}
+
+    if op in ("bfs", "dfs"):
+        v = interno(grafo, _vertice(consulta, "v"))
+        if op == "bfs":
+            pai, nivel = grafo.busca_largura(v)
+        elif isinstance(grafo, Grafo_Matriz):
+            # A DFS da matriz continuaria pelas demais componentes (nível 0 em
+            # cada raiz); só a árvore de v interessa aqui
+            pai, nivel = grafo.busca_profundidade(v, so_componente=True)
+        else:
+            pai, nivel = grafo.busca_profundidade(v)
+        return _arvore(grafo, pai, nivel, bool(consulta.get("completo")))
+
+    if op == "componentes":
+        tamanhos = grafo.tamanhos_componentes() if hasattr(grafo, "tamanhos_componentes") else \
+            np.fromiter(map(len, grafo.componentes_conexos()), dtype=np.int64)
+        if isinstance(grafo, Grafo_Matriz):
+            # A linha 0 da matriz é um vértice isolado fictício
+            tamanhos = np.sort(tamanhos)[1:] if len(tamanhos) else tamanhos
+        return {
+            "componentes": int(len(tamanhos)),
+            "maior": int(tamanhos.max()) if len(tamanhos) else 0,
+            "menor": int(tamanhos.min()) if len(tamanhos) else 0,
+        }
+
+    if op == "componente":
+        v = interno(grafo, _vertice(consulta, "v"))
+        if hasattr(grafo, "tamanho_componente"):
+            return {"tamanho": grafo.tamanho_componente(v)}
+        return {"tamanho": int(np.count_nonzero(np.asarray(grafo.busca_largura(v)[1]) >= 0))}
+
+    if op in ("distancia", "caminho"):
+        # BFS bidirecional: para no encontro das duas buscas
+        u = interno(grafo, _vertice(consulta, "u"))
+        v = interno(grafo, _vertice(consulta, "v"))
+        distancia, caminho = grafo.caminho_minimo(u, v)
+        if op == "distancia":
+            return {"distancia": distancia}
+        deslocamento = 1 - primeiro_indice(grafo)
+        return {"distancia": distancia, "caminho": [x + deslocamento for x in caminho]}
+
+    if op == "mesmo_componente":
+        u = interno(grafo, _vertice(consulta, "u"))
+        v = interno(grafo, _vertice(consulta, "v"))
+        if hasattr(grafo, "mesmo_componente"):
+            return {"mesmo_componente": bool(grafo.mesmo_componente(u, v))}
+        return {"mesmo_componente": bool(grafo.busca_largura(u)[1][v] >= 0)}
+
+    raise ErroConsulta(f"Operação desconhecida: {op!r} (use uma de {', '.join(OPERACOES)})")
+
+
+def responder_lote(grafo, linhas, saida):
+    """
+    Responde uma consulta por linha de `linhas` (linhas vazias e iniciadas
+    por '#' são ignoradas), gravando uma resposta JSON por linha em `saida`.
+
+    :return: (respondidas, com_erro)
+    """
+    respondidas = com_erro = 0
+    for linha in linhas:
+        if not linha.strip() or linha.lstrip().startswith("#"):
+            continue
+        t0 = time.perf_counter()
+        try:
+            resposta = responder(grafo, interpretar(linha))
+        except ErroConsulta as e:
+            resposta = {"consulta": linha.strip(), "erro": str(e), "tempo_s": time.perf_counter() - t0}
+        respondidas += 1
+        com_erro += "erro" in resposta
+        saida.write(json.dumps(resposta, ensure_ascii=False) + "\n")
+    return respondidas, com_erro
@@ -0,0 +1,77 @@
+import numpy as np
+
+
+def _graus(grafo) -> np.ndarray:
+    return np.asarray(grafo.graus())
+
+
+def diametro_exato(grafo, relatorio: list = None):
+    """
+    Diâmetro exato (maior excentricidade dentro de uma componente) com poda
+    por limites de excentricidade (Takes & Kosters, "BoundingDiameters").
+
+    Cada BFS a partir de v com excentricidade e dá, para todo w da mesma
+    componente, max(e - d(v,w), d(v,w)) <= ecc(w) <= e + d(v,w). Vértices cujo
+    limite superior não passa do maior valor já encontrado não podem mudar o
+    resultado e saem dos candidatos. A próxima BFS alterna entre o candidato
+    de maior limite superior e o de menor limite inferior (empate: maior grau).
+
+    As componentes são tratadas da maior para a menor; uma componente com
+    tamanho - 1 <= diâmetro atual é ignorada sem nenhuma BFS.
+
+    Funciona com qualquer grafo que tenha busca_largura e componentes_conexos
+    (Lista_Grafo, Grafo_CSR e as variantes de Grafo_Matriz).
+
+    :param relatorio: se for uma lista, recebe um dicionário por BFS com o
+                      vértice, a excentricidade, os limites do diâmetro (na
+                      componente em andamento) e o número de candidatos restantes.
+    :return: (diametro, numero_de_bfs)
+    """
+    graus = _graus(grafo)
+    componentes = sorted(grafo.componentes_conexos(), key=len, reverse=True)
+
+    diametro = 0
+    num_bfs = 0
+
+    for componente in componentes:
+        if len(componente) - 1 <= diametro:
+            break
+
+        vertices = np.asarray(componente, dtype=np.int64)
+        inferior = np.zeros(len(vertices), dtype=np.int64)
+        superior = np.full(len(vertices), len(vertices) - 1, dtype=np.int64)
+        candidatos = np.ones(len(vertices), dtype=bool)
+        graus_c = graus[vertices]
+        pelo_superior = True
+
+        while candidatos.any():
+            # Seleção alternada; sem limites ainda, começa pelo vértice de maior grau
+            idx = np.flatnonzero(candidatos)
+            chave = superior[idx] if pelo_superior else -inferior[idx]
+            melhores = idx[chave == chave.max()]
+            i = int(melhores[np.argmax(graus_c[melhores])])
+            pelo_superior = not pelo_superior
+
+            _, nivel = grafo.busca_largura(int(vertices[i]))
+            d = np.asarray(nivel)[vertices]
+            ecc = int(d.max())
+            num_bfs += 1
+
+            np.maximum(inferior, np.maximum(ecc - d, d), out=inferior)
+            np.minimum(superior, ecc + d, out=superior)
+            diametro = max(diametro, ecc)
+            candidatos[i] = False
+            candidatos &= superior > diametro
+
+            if relatorio is not None:
+                restantes = superior[candidatos]
+                relatorio.append({
+                    "bfs": num_bfs,
+                    "vertice": int(vertices[i]),
+                    "excentricidade": ecc,
+                    "limite_inferior": diametro,
+                    "limite_superior": max(diametro, int(restantes.max()) if len(restantes) else 0),
+                    "candidatos": int(len(restantes)),
+                })
+
+    return diametro, num_bfs
@@ -0,0 +1,84 @@
+import os
+import numpy as np
+
+# Linhas formatadas de uma vez (uma string por lote, uma chamada de f.write)
+LINHAS_POR_LOTE = 65536
+# Buffer do arquivo de saída
+TAMANHO_BUFFER = 8 * 1024 * 1024
+
+FORMATOS_SAIDA = ("texto", "npy")
+
+
+def abrir_saida(arquivo: str):
+    return open(arquivo, "w", buffering=TAMANHO_BUFFER)
+
+
+def escrever_tabela(f, modelo: str, *colunas, linhas_por_lote: int = LINHAS_POR_LOTE):
+    """
+    Escreve `modelo % (colunas[0][i], colunas[1][i], ...)` para cada i.
+
+    Cada lote é formatado com uma única operação: o modelo é repetido k
+    vezes e recebe os valores das k linhas intercalados em uma tupla, o que
+    evita uma f-string e um f.write por linha. Os valores devem ser inteiros.
+    """
+    colunas = [np.asarray(c, dtype=np.int64) for c in colunas]
+    total = len(colunas[0])
+
+    for i in range(0, total, linhas_por_lote):
+        valores = np.column_stack([c[i:i + linhas_por_lote] for c in colunas]).ravel().tolist()
+        f.write((modelo * (len(valores) // len(colunas))) % tuple(valores))
+
+
+def escrever_componentes(f, componentes, deslocamento: int = 0, vertices_por_lote: int = LINHAS_POR_LOTE):
+    """Escreve o bloco "Componente i — tamanho t / Vértices: ..." de cada componente, em lotes."""
+    partes = []
+    acumulado = 0
+
+    for i, componente in enumerate(componentes):
+        vertices = (np.asarray(componente, dtype=np.int64) + deslocamento).tolist()
+        partes.append(f"Componente {i+1} — tamanho {len(vertices)}\nVértices: ")
+        partes.append(" ".join(map(str, vertices)))
+        partes.append("\n\n")
+        acumulado += len(vertices) + 1
+        if acumulado >= vertices_por_lote:
+            f.write("".join(partes))
+            partes = []
+            acumulado = 0
+
+    f.write("".join(partes))
+
+
+def salvar_colunas(arquivo: str, **colunas):
+    """
+    Saída binária colunar: cada coluna vai para `<arquivo sem extensão>.<nome>.npy`,
+    que pode ser mapeado em memória com np.load(caminho, mmap_mode="r").
+
+    :return: lista dos caminhos gravados.
+    """
+    base = os.path.splitext(arquivo)[0]
+    caminhos = []
+    for nome, valores in colunas.items():
+        caminho = f"{base}.{nome}.npy"
+        np.save(caminho, np.ascontiguousarray(valores))
+        caminhos.append(caminho)
+    return caminhos
+
+
+def colunas_componentes(componentes, deslocamento: int = 0):
+    """Componentes em formato CSR: (vertices concatenados, inicio de cada componente)."""
+    tamanhos = np.fromiter(map(len, componentes), dtype=np.int64, count=len(componentes))
+    inicio = np.zeros(len(componentes) + 1, dtype=np.int64)
+    np.cumsum(tamanhos, out=inicio[1:])
+    vertices = np.concatenate([np.asarray(c, dtype=np.int32) for c in componentes]) if componentes else np.empty(0, dtype=np.int32)
+    return vertices + np.int32(deslocamento), inicio
+
+
+def validar_formato(formato: str):
+    if formato not in FORMATOS_SAIDA:
+        raise ValueError(f"Formato de saída desconhecido: {formato}")
+
+
+def pai_1based(pai) -> np.ndarray:
+    """Converte pais 0-based para a numeração da saída (1-based, -1 = sem pai)."""
+    pai = np.asarray(pai, dtype=np.int64)
+    return np.where(pai != -1, pai + 1, -1)
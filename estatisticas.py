@@ -0,0 +1,103 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+_SEM_FASE = nullcontext()
+
+
+class EstatisticasBusca:
+    """
+    Contadores de uma busca (BFS, DFS ou componentes conexas).
+
+    Passe uma instância em `busca_largura(inicio, estatisticas=...)` (e nos
+    equivalentes de DFS e componentes) de `Lista_Grafo` ou `Grafo_Matriz`:
+    o mesmo algoritmo preenche os campos abaixo, com os ganchos testados uma
+    vez por nível ou por fase (os contadores que dependem de cada aresta são
+    calculados no fim, a partir do resultado). Sem `estatisticas`, o custo é
+    só o desses testes.
+
+    - vertices_visitados, arestas_examinadas (entradas de adjacência lidas);
+    - linhas_lidas: linhas da matriz varridas (só `Grafo_Matriz`);
+    - pico_fila: maior fronteira de um nível (BFS) ou pilha (DFS);
+    - fronteiras: vértices em cada nível da BFS (índice = nível);
+    - tempos_niveis: segundos gastos em cada nível da BFS;
+    - tempos: segundos por fase ("inicializacao", "percurso", ...);
+    - componentes: número de componentes encontradas;
+    - acertos_cache: BFS respondidas pelo cache de BFS (sem percurso, nada
+      mais é contado nelas).
+
+    `ao_nivel(nivel, tamanho_fronteira, arestas_examinadas)` é chamado ao
+    fim de cada nível da BFS, se fornecido. Uma mesma instância acumula os
+    contadores de várias chamadas; use `zerar()` entre elas se preferir.
+    """
+
+    def __init__(self, ao_nivel=None):
+        self.ao_nivel = ao_nivel
+        self.zerar()
+
+    def zerar(self):
+        self.algoritmo = None
+        self.vertices_visitados = 0
+        self.arestas_examinadas = 0
+        self.linhas_lidas = 0
+        self.pico_fila = 0
+        self.componentes = 0
+        self.acertos_cache = 0
+        self.fronteiras = []
+        self.tempos_niveis = []
+        self.tempos = {}
+
+    @contextmanager
+    def fase(self, nome: str):
+        """Acumula em tempos[nome] o tempo gasto dentro do bloco `with`."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos[nome] = self.tempos.get(nome, 0.0) + time.perf_counter() - t0
+
+    def registrar_nivel(self, nivel: int, tamanho: int, arestas: int, segundos: float):
+        self.fronteiras.append(tamanho)
+        self.tempos_niveis.append(segundos)
+        if tamanho > self.pico_fila:
+            self.pico_fila = tamanho
+        if self.ao_nivel is not None:
+            self.ao_nivel(nivel, tamanho, arestas)
+
+    def como_dict(self) -> dict:
+        return {
+            "algoritmo": self.algoritmo,
+            "vertices_visitados": self.vertices_visitados,
+            "arestas_examinadas": self.arestas_examinadas,
+            "linhas_lidas": self.linhas_lidas,
+            "pico_fila": self.pico_fila,
+            "componentes": self.componentes,
+            "acertos_cache": self.acertos_cache,
+            "fronteiras": list(self.fronteiras),
+            "tempos_niveis": list(self.tempos_niveis),
+            "tempos": dict(self.tempos),
+        }
+
+    def resumo(self, niveis: bool = True) -> str:
+        linhas = [
+            f"{self.algoritmo}: {self.vertices_visitados} vértices visitados, "
+            f"{self.arestas_examinadas} arestas examinadas, pico da fila/pilha {self.pico_fila}",
+        ]
+        if self.linhas_lidas:
+            linhas.append(f"  linhas da matriz lidas: {self.linhas_lidas}")
+        if self.componentes:
+            linhas.append(f"  componentes: {self.componentes}")
+        if self.acertos_cache:
+            linhas.append(f"  respondidas pelo cache de BFS: {self.acertos_cache}")
+        if self.tempos:
+            linhas.append("  tempos: " + ", ".join(f"{k} {v:.4f} s" for k, v in self.tempos.items()))
+        if self.fronteiras and not niveis:
+            linhas.append(f"  níveis: {len(self.fronteiras)}, maior fronteira {max(self.fronteiras)}")
+            return "\n".join(linhas)
+        for nivel, (tamanho, segundos) in enumerate(zip(self.fronteiras, self.tempos_niveis)):
+            linhas.append(f"  nível {nivel}: fronteira {tamanho}, {segundos:.4f} s")
+        return "\n".join(linhas)
+
+
+def fase(estatisticas, nome: str):
+    """estatisticas.fase(nome), ou um contexto vazio quando estatisticas é None."""
+    return _SEM_FASE if estatisticas is None else estatisticas.fase(nome)
@@ -0,0 +1,250 @@
+"""
+Gerador de grafos sintéticos para testes de escala.
+
+Grava arquivos no mesmo formato lido por `ler_de_arquivo`/`from_file`:
+primeira linha com N e depois um par "u v" (1-based) por linha. Todos os
+modelos usam um gerador com semente e produzem as arestas em lotes
+vetorizados que são escritos à medida que saem, de modo que a memória
+depende do tamanho do lote e não do número de arestas (exceto no
+Barabási–Albert, que guarda 4 bytes por aresta).
+
+Modelos:
+    er       Erdős–Rényi G(n, p), sem laços nem arestas repetidas
+    ba       Barabási–Albert (ligação preferencial, graus em lei de potência)
+    grade    grade linhas × colunas
+    caminho  cadeia 1-2-...-N (pior caso de profundidade da DFS)
+    floresta árvores aleatórias disjuntas (várias componentes)
+
+Exemplo:
+    python3 gerador_grafos.py er grafo_er.txt --n 1000000 --grau-medio 10 --semente 1
+    python3 gerador_grafos.py ba grafo_ba.txt --n 1000000 --k 5 --semente 1 --embaralhar
+"""
+import argparse
+import sys
+import time
+import numpy as np
+
+from escrita import abrir_saida, escrever_tabela
+
+# Número aproximado de arestas geradas (e escritas) por lote
+LOTE = 1 << 20
+
+
+def erdos_renyi(n: int, p: float, rng, lote: int = LOTE):
+    """
+    G(n, p): cada par u < v é aresta com probabilidade p.
+
+    Os pares são numerados linha a linha do triângulo superior e percorridos
+    em faixas de linhas com cerca de `lote` arestas esperadas; em cada faixa
+    o número de arestas é binomial e as posições são sorteadas sem
+    reposição, então não há arestas repetidas.
+    """
+    if not 0 <= p <= 1:
+        raise ValueError(f"Probabilidade inválida: {p}")
+    if n < 2 or p == 0:
+        return
+
+    celulas_por_faixa = lote / p
+    a = 0
+    while a < n - 1:
+        linhas = int(min(n - 1 - a, max(1, celulas_por_faixa // (n - 1 - a)), 1 << 22))
+        tamanhos = n - 1 - np.arange(a, a + linhas, dtype=np.int64)
+        fim = np.cumsum(tamanhos)
+
+        k = int(rng.binomial(int(fim[-1]), p))
+        if k:
+            pos = np.sort(rng.choice(int(fim[-1]), size=k, replace=False, shuffle=False))
+            linha = np.searchsorted(fim, pos, side="right")
+            inicio_linha = fim[linha] - tamanhos[linha]
+            u = a + linha
+            v = u + 1 + (pos - inicio_linha)
+            yield u, v
+
+        a += linhas
+
+
+def barabasi_albert(n: int, k: int, rng, lote: int = LOTE, fracao: float = 0.05):
+    """
+    Ligação preferencial: começa com um clique de k+1 vértices e cada novo
+    vértice liga-se a k vértices escolhidos com probabilidade proporcional
+    ao grau (sorteio de uma ponta de aresta, como em Batagelj–Brandes).
+
+    Os vértices entram em lotes de até `fracao` do tamanho atual do grafo;
+    dentro de um lote os alvos são sorteados entre os vértices anteriores a
+    ele, o que vetoriza a geração com distorção desprezível nos graus.
+    Alvos repetidos de um mesmo vértice são sorteados de novo algumas vezes
+    e, se persistirem, descartados. Só o destino de cada aresta é guardado
+    (int32); a origem de uma aresta é função do seu índice.
+    """
+    if k < 1 or n <= k:
+        raise ValueError(f"Barabási–Albert exige 1 <= k < n (k={k}, n={n})")
+
+    u0, v0 = np.triu_indices(k + 1, 1)
+    m0 = len(u0)
+    yield u0.astype(np.int64), v0.astype(np.int64)
+
+    # A aresta e >= m0 sai do vértice k+1 + (e - m0) // k
+    destinos = np.empty(m0 + (n - k - 1) * k, dtype=np.int32)
+    destinos[:m0] = v0
+    origens0 = u0.astype(np.int32)
+    m = m0
+
+    t = k + 1
+    while t < n:
+        b = int(min(n - t, max(1, t * fracao), max(1, lote // k)))
+
+        # Sorteia uma ponta entre as 2m já existentes
+        pontas = rng.integers(0, 2 * m, size=(b, k))
+        alvos = _ponta(pontas, destinos, origens0, m0, k)
+        alvos.sort(axis=1)
+        for _ in range(4):
+            repetidos = np.zeros(alvos.shape, dtype=bool)
+            repetidos[:, 1:] = alvos[:, 1:] == alvos[:, :-1]
+            total = int(np.count_nonzero(repetidos))
+            if not total:
+                break
+            alvos[repetidos] = _ponta(rng.integers(0, 2 * m, size=total), destinos, origens0, m0, k)
+            alvos.sort(axis=1)
+
+        validos = np.ones(alvos.shape, dtype=bool)
+        validos[:, 1:] = alvos[:, 1:] != alvos[:, :-1]
+
+        destinos[m:m + b * k] = alvos.ravel()
+        origem = np.repeat(np.arange(t, t + b, dtype=np.int64), k)
+        validos = validos.ravel()
+        yield origem[validos], alvos.ravel()[validos].astype(np.int64)
+
+        m += b * k
+        t += b
+
+
+def _ponta(pontas, destinos, origens0, m0: int, k: int):
+    """Vértice de cada ponta: 2e é a origem e 2e+1 o destino da aresta e."""
+    e = pontas >> 1
+    eh_origem = (pontas & 1) == 0
+    vertice = destinos[e].astype(np.int64)
+    origem = np.where(e < m0, origens0[np.minimum(e, m0 - 1)], k + 1 + (e - m0) // k)
+    return np.where(eh_origem, origem, vertice)
+
+
+def grade(linhas: int, colunas: int, lote: int = LOTE):
+    """Grade linhas × colunas; o vértice (i, j) é i*colunas + j."""
+    n = linhas * colunas
+    passo = max(1, lote // 2)
+    for i in range(0, n, passo):
+        ids = np.arange(i, min(n, i + passo), dtype=np.int64)
+        horizontal = ids[(ids % colunas) != colunas - 1]
+        vertical = ids[ids + colunas < n]
+        yield (np.concatenate([horizontal, vertical]),
+               np.concatenate([horizontal + 1, vertical + colunas]))
+
+
+def caminho(n: int, lote: int = LOTE):
+    """Cadeia 0-1-...-(n-1): uma única componente de profundidade n-1."""
+    return grade(1, n, lote)
+
+
+def floresta(n: int, arvores: int, rng, lote: int = LOTE):
+    """
+    `arvores` árvores aleatórias disjuntas sobre intervalos contíguos de
+    vértices com tamanhos sorteados. Cada vértice que não é raiz liga-se a
+    um vértice anterior, sorteado uniformemente, da mesma árvore.
+    """
+    if not 1 <= arvores <= n:
+        raise ValueError(f"Número de árvores inválido: {arvores} (n={n})")
+
+    raizes = np.zeros(arvores, dtype=np.int64)
+    raizes[1:] = np.sort(rng.choice(n - 1, size=arvores - 1, replace=False, shuffle=False)) + 1
+
+    for i in range(0, n, lote):
+        v = np.arange(i, min(n, i + lote), dtype=np.int64)
+        raiz = raizes[np.searchsorted(raizes, v, side="right") - 1]
+        filhos = v > raiz
+        v, raiz = v[filhos], raiz[filhos]
+        yield raiz + rng.integers(0, v - raiz), v
+
+
+def escrever_grafo(arquivo: str, n: int, lotes, permutacao=None) -> int:
+    """
+    Grava N e as arestas de `lotes` (pares de arrays 0-based) em 1-based.
+    Com `permutacao`, o vértice v é gravado como permutacao[v].
+
+    :return: número de arestas gravadas.
+    """
+    total = 0
+    with abrir_saida(arquivo) as f:
+        f.write(f"{n}\n")
+        for u, v in lotes:
+            if permutacao is not None:
+                u, v = permutacao[u], permutacao[v]
+            escrever_tabela(f, "%d %d\n", u + 1, v + 1)
+            total += len(u)
+    return total
+
+
+def _criar_lotes(args, rng):
+    if args.modelo == "er":
+        if args.p is not None:
+            p = args.p
+        elif args.arestas is not None:
+            p = args.arestas / (args.n * (args.n - 1) / 2)
+        else:
+            p = args.grau_medio / (args.n - 1)
+        return args.n, erdos_renyi(args.n, min(p, 1.0), rng, args.lote)
+    if args.modelo == "ba":
+        return args.n, barabasi_albert(args.n, args.k, rng, args.lote)
+    if args.modelo == "grade":
+        return args.linhas * args.colunas, grade(args.linhas, args.colunas, args.lote)
+    if args.modelo == "caminho":
+        return args.n, caminho(args.n, args.lote)
+    if args.modelo == "floresta":
+        return args.n, floresta(args.n, args.arvores, rng, args.lote)
+    raise ValueError(f"Modelo desconhecido: {args.modelo}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera grafos sintéticos no formato de entrada do projeto.")
+    sub = parser.add_subparsers(dest="modelo", required=True)
+
+    er = sub.add_parser("er", help="Erdős–Rényi G(n, p)")
+    er.add_argument("--n", type=int, required=True)
+    densidade = er.add_mutually_exclusive_group()
+    densidade.add_argument("--p", type=float, help="probabilidade de cada aresta")
+    densidade.add_argument("--arestas", type=float, help="número esperado de arestas")
+    densidade.add_argument("--grau-medio", type=float, default=10.0)
+
+    ba = sub.add_parser("ba", help="Barabási–Albert (lei de potência)")
+    ba.add_argument("--n", type=int, required=True)
+    ba.add_argument("--k", type=int, default=5, help="arestas por vértice novo")
+
+    gr = sub.add_parser("grade", help="grade linhas × colunas")
+    gr.add_argument("--linhas", type=int, required=True)
+    gr.add_argument("--colunas", type=int, required=True)
+
+    ca = sub.add_parser("caminho", help="cadeia de N vértices")
+    ca.add_argument("--n", type=int, required=True)
+
+    fl = sub.add_parser("floresta", help="árvores aleatórias disjuntas")
+    fl.add_argument("--n", type=int, required=True)
+    fl.add_argument("--arvores", type=int, default=10)
+
+    for p in (er, ba, gr, ca, fl):
+        p.add_argument("saida", help="arquivo de arestas a gravar")
+        p.add_argument("--semente", type=int, default=None)
+        p.add_argument("--embaralhar", action="store_true",
+                       help="renumera os vértices com uma permutação aleatória")
+        p.add_argument("--lote", type=int, default=LOTE, help="arestas por lote")
+
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(args.semente)
+
+    t0 = time.perf_counter()
+    n, lotes = _criar_lotes(args, rng)
+    permutacao = rng.permutation(n).astype(np.int64) if args.embaralhar else None
+    m = escrever_grafo(args.saida, n, lotes, permutacao)
+    print(f"'{args.saida}': {n} vértices, {m} arestas ({args.modelo}) em {time.perf_counter() - t0:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
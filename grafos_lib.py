@@ -1,158 +1,356 @@
-import sys
-import numpy as np
-from collections import deque
-
-
-sys.setrecursionlimit(100000)
-
-class Lista_Grafo:
-    def __init__(self, num_vertices: int):
-        
-        self.n = num_vertices
-        self.adj = {i: [] for i in range(num_vertices)}
-        self.num_arestas = 0
-
-    @staticmethod
-    def ler_de_arquivo(arquivo: str):
-        
-        with open(arquivo, "r") as f:
-            linhas = f.read().strip().split("\n")
-
-        n = int(linhas[0])
-        grafo = Lista_Grafo(n)
-
-        for linha in linhas[1:]:
-            if linha.strip() == "":
-                continue
-            u, v = map(int, linha.split())
-            
-            u_0 = u - 1
-            v_0 = v - 1
-            
-            if u_0 < 0 or u_0 >= n or v_0 < 0 or v_0 >= n:
-                 print(f"Aviso: Vértice(s) ({u}, {v}) fora do intervalo [1, {n}] ignorado(s).")
-                 continue
-                 
-            grafo.add_arestas(u_0, v_0)
-
-        return grafo
-
-    def add_arestas(self, u: int, v: int):
-    
-        if v not in self.adj[u]: 
-            self.adj[u].append(v)
-            self.adj[v].append(u)
-            self.num_arestas += 1
-
-    def salvar_resumo(self, arquivo: str):
-        
-        with open(arquivo, "w") as f:
-            f.write(f"Vértices: {self.n}\n")
-            f.write(f"Arestas: {self.num_arestas}\n")
-            f.write("Graus:\n")
-            for v in range(self.n):
-                f.write(f"vértice {v+1}: grau {len(self.adj[v])}\n")
-
-    def busca_largura(self, inicio: int):
-       
-        visitado = [False] * self.n
-        pai  = [-1] * self.n
-        nivel   = [-1] * self.n
-
-        fila = deque([inicio])
-        visitado[inicio] = True
-        nivel[inicio] = 0
-
-        while fila:
-            u = fila.popleft()
-            for v in self.adj[u]:
-                if not visitado[v]:
-                    visitado[v] = True
-                    pai[v] = u
-                    nivel[v] = nivel[u] + 1
-                    fila.append(v)
-
-        return pai, nivel
-
-    def salvar_busca_largura(self, inicio: int, arquivo: str):
-        
-        pai, nivel = self.busca_largura(inicio)
-
-        with open(arquivo, "w") as f:
-            f.write(f"Árvore de Busca em Largura a partir do vértice {inicio+1}\n")
-            for v in range(self.n):
-                pai_1based = pai[v] + 1 if pai[v] != -1 else -1
-                f.write(f"vértice {v+1}: pai = {pai_1based}, nível = {nivel[v]}\n")
-
-    
-    def busca_profundidade(self, inicio: int):
-        visitado = [False] * self.n
-        pai  = [-1] * self.n
-        nivel   = [-1] * self.n
-
-        def visitar(u, profundidade):
-            visitado[u] = True
-            nivel[u] = profundidade
-            for v in self.adj[u]:
-                if not visitado[v]:
-                    pai[v] = u
-                    visitar(v, profundidade + 1)
-
-        visitar(inicio, 0)
-        return pai, nivel
-
-    def salvar_busca_profundidade(self, inicio: int, arquivo: str):
-        pai, nivel = self.busca_profundidade(inicio)
-
-        with open(arquivo, "w") as f:
-            f.write(f"Árvore de busca em profundidade a partir do vértice {inicio+1}\n")
-            for v in range(self.n):
-                pai_1based = pai[v] + 1 if pai[v] != -1 else -1
-                f.write(f"vértice {v+1}: pai = {pai_1based}, nível = {nivel[v]}\n")
-
-    
-    def componentes_conexos(self):
-        
-        visitado = [False] * self.n
-        componentes = []
-
-        def dfs_coletar(u, componente):
-            visitado[u] = True
-            componente.append(u)
-            for v in self.adj[u]:
-                if not visitado[v]:
-                    dfs_coletar(v, componente)
-
-        for v in range(self.n):
-            if not visitado[v]:
-                componente = []
-                dfs_coletar(v, componente)
-                
-                componentes.append(componente)
-
-        return componentes
-
-    def salvar_componentes(self, arquivo: str):
-        componentes = self.componentes_conexos()
-
-        with open(arquivo, "w") as f:
-            f.write(f"Número de componentes conexas: {len(componentes)}\n\n")
-
-            for i, componente_0based in enumerate(componentes):
-                # Converte os vértices para 1-based na saída
-                componente_1based = [v + 1 for v in componente_0based]
-                f.write(f"Componente {i+1} — tamanho {len(componente_1based)}\n")
-                f.write("Vértices: " + " ".join(map(str, componente_1based)) + "\n\n")
-
-
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Uso correto:")
-        print("python3 grafos_lib.py arquivo_entrada.txt")
-        sys.exit(1)
-    
-    texto_entrada = sys.argv[1]
-    grafo = Lista_Grafo.ler_de_arquivo(texto_entrada) 
-    resumo_saida = "resumo_grafo_lista.txt"
-    grafo.salvar_resumo(resumo_saida) 
+import sys
+import time
+import numpy as np
+
+from cache_grafo import carregar_csr
+from uniao_busca import UniaoBusca
+from cache_bfs import CacheBFS, LIMITE_PADRAO
+from estatisticas import fase
+from caminho_minimo import reconstruir_caminho
+from reordenacao import Ordenacao, com_ids_originais, reordenar_csr
+from escrita import (abrir_saida, colunas_componentes, escrever_componentes, escrever_tabela,
+                     pai_1based, salvar_colunas, validar_formato)
+
+
+class Lista_Grafo:
+    # Métodos que, com reordenação, recebem e devolvem vértices na numeração do
+    # arquivo: nome -> (parâmetros que são vértices, tradução do resultado em
+    # reordenacao.Ordenacao ou None) (ver reordenacao.com_ids_originais)
+    IDS_ORIGINAIS = {
+        "add_arestas": (("u", "v"), None),
+        "manter_componentes": ((), None),
+        "mesmo_componente": (("u", "v"), None),
+        "tamanho_componente": (("u",), None),
+        "vizinhos": (("u",), "vizinhos"),
+        "graus": ((), "por_vertice"),
+        "busca_largura": (("inicio",), "arvore"),
+        "caminho_minimo": (("u", "v"), "caminho"),
+        "busca_profundidade": (("inicio",), "arvore"),
+        "componentes_conexos": ((), "componentes"),
+    }
+
+    def __init__(self, num_vertices: int):
+        
+        self.n = num_vertices
+        self.adj = {i: [] for i in range(num_vertices)}
+        self.num_arestas = 0
+        # Contagem de linhas descartadas na leitura (ver leitura_arestas.ler_arestas)
+        self.descartes = None
+        # União-busca mantida por add_arestas (ver manter_componentes)
+        self.uniao = None
+        # Cache LRU de resultados de BFS por origem (ver ativar_cache_bfs)
+        self.cache_bfs = None
+        # Renumeração feita na carga (ver reordenacao.py); None = ids do arquivo
+        self.ordenacao = None
+
+    @staticmethod
+    def ler_de_arquivo(arquivo: str, usar_cache: bool = False, reordenar: str = None):
+
+        # Leitura vetorizada em blocos; duplicatas e vértices fora do intervalo
+        # já chegam removidos e contabilizados em `descartes`. Com usar_cache,
+        # a partir da segunda leitura o CSR vem do cache binário (cache_grafo).
+        n, offsets, indices, num_arestas, descartes = carregar_csr(arquivo, usar_cache)
+
+        # Com `reordenar` (um de reordenacao.CRITERIOS), as listas são montadas
+        # na nova numeração; os métodos públicos continuam nos ids do arquivo
+        ordenacao = None
+        if reordenar:
+            ordenacao = Ordenacao.de_csr(offsets, indices, reordenar)
+            offsets, indices = reordenar_csr(offsets, indices, ordenacao.ordem)
+
+        grafo = Lista_Grafo(n)
+        off = offsets.tolist()
+        vizinhos = indices.tolist()
+        grafo.adj = {u: vizinhos[off[u]:off[u + 1]] for u in range(n)}
+        grafo.num_arestas = num_arestas
+        grafo.descartes = descartes
+
+        return grafo if ordenacao is None else com_ids_originais(grafo, ordenacao)
+
+    def add_arestas(self, u: int, v: int):
+    
+        if v not in self.adj[u]: 
+            self.adj[u].append(v)
+            self.adj[v].append(u)
+            self.num_arestas += 1
+            if self.uniao is not None:
+                self.uniao.unir(u, v)
+            if self.cache_bfs is not None:
+                self.cache_bfs.invalidar()
+
+    def ativar_cache_bfs(self, limite_bytes: int = LIMITE_PADRAO):
+        """Passa a guardar os resultados de busca_largura por origem (LRU, ver cache_bfs.CacheBFS)."""
+        self.cache_bfs = CacheBFS(limite_bytes)
+
+    def manter_componentes(self):
+        """
+        Passa a manter as componentes conexas de forma incremental: uma
+        UniaoBusca é montada com as arestas atuais e atualizada a cada
+        add_arestas. As consultas abaixo ativam isso na primeira chamada.
+        """
+        graus = [len(self.adj[u]) for u in range(self.n)]
+        origem = np.repeat(np.arange(self.n, dtype=np.int64), graus)
+        destino = np.fromiter((v for u in range(self.n) for v in self.adj[u]), dtype=np.int64, count=len(origem))
+
+        self.uniao = UniaoBusca(self.n)
+        self.uniao.unir_arestas(origem, destino)
+
+    def mesmo_componente(self, u: int, v: int) -> bool:
+        if self.uniao is None:
+            self.manter_componentes()
+        return self.uniao.mesmo_conjunto(u, v)
+
+    def num_componentes(self) -> int:
+        if self.uniao is None:
+            self.manter_componentes()
+        return self.uniao.num_componentes
+
+    def tamanho_componente(self, u: int) -> int:
+        if self.uniao is None:
+            self.manter_componentes()
+        return self.uniao.tamanho_de(u)
+
+    def tamanhos_componentes(self) -> np.ndarray:
+        """Tamanhos de todas as componentes, na ordem de componentes_conexos (O(n))."""
+        if self.uniao is None:
+            self.manter_componentes()
+        return self.uniao.componentes(None if self.ordenacao is None else self.ordenacao.ordem)
+
+    def vizinhos(self, u: int) -> list:
+        return self.adj[u]
+
+    def graus(self) -> np.ndarray:
+        return np.fromiter((len(self.adj[v]) for v in range(self.n)), dtype=np.int64, count=self.n)
+
+    def salvar_resumo(self, arquivo: str, formato: str = "texto"):
+        validar_formato(formato)
+        graus = self.graus()
+
+        if formato == "npy":
+            return salvar_colunas(arquivo, grau=graus)
+
+        with abrir_saida(arquivo) as f:
+            f.write(f"Vértices: {self.n}\n")
+            f.write(f"Arestas: {self.num_arestas}\n")
+            f.write("Graus:\n")
+            escrever_tabela(f, "vértice %d: grau %d\n", np.arange(1, self.n + 1), graus)
+        return [arquivo]
+
+    def busca_largura(self, inicio: int, estatisticas=None):
+        """
+        BFS a partir de `inicio`, um nível por vez (mesma ordem de visita da
+        BFS com fila). Com `estatisticas` (estatisticas.EstatisticasBusca),
+        registra o tamanho, as arestas e o tempo de cada nível.
+        """
+        est = estatisticas
+        if est is not None:
+            est.algoritmo = "busca_largura"
+
+        if self.cache_bfs is not None:
+            guardado = self.cache_bfs.obter(inicio)
+            if guardado is not None:
+                if est is not None:
+                    est.acertos_cache += 1
+                return guardado[0].tolist(), guardado[1].tolist()
+
+        with fase(est, "inicializacao"):
+            visitado = [False] * self.n
+            pai  = [-1] * self.n
+            nivel   = [-1] * self.n
+
+        with fase(est, "percurso"):
+            visitado[inicio] = True
+            nivel[inicio] = 0
+            fronteira = [inicio]
+            profundidade = 0
+
+            while fronteira:
+                t_nivel = time.perf_counter() if est is not None else 0.0
+                profundidade += 1
+                proxima = []
+                for u in fronteira:
+                    for v in self.adj[u]:
+                        if not visitado[v]:
+                            visitado[v] = True
+                            pai[v] = u
+                            nivel[v] = profundidade
+                            proxima.append(v)
+
+                if est is not None:
+                    arestas = sum(len(self.adj[u]) for u in fronteira)
+                    est.registrar_nivel(profundidade - 1, len(fronteira), arestas, time.perf_counter() - t_nivel)
+                    est.vertices_visitados += len(fronteira)
+                    est.arestas_examinadas += arestas
+                fronteira = proxima
+
+        if self.cache_bfs is not None:
+            self.cache_bfs.guardar(inicio, pai, nivel)
+        return pai, nivel
+
+    def caminho_minimo(self, u: int, v: int):
+        """
+        Menor caminho entre u e v por BFS bidirecional (ver caminho_minimo.py):
+        a cada rodada expande o nível inteiro da menor fronteira e para no
+        primeiro encontro, sem percorrer o resto da componente.
+
+        :return: (distancia, caminho) com o caminho [u, ..., v], ou (-1, []).
+        """
+        if u == v:
+            return 0, [u]
+
+        # Pais de cada lado em dicionários: só os vértices alcançados ocupam memória
+        pais = ({u: -1}, {v: -1})
+        fronteiras = [[u], [v]]
+
+        while fronteiras[0] and fronteiras[1]:
+            lado = 0 if len(fronteiras[0]) <= len(fronteiras[1]) else 1
+            meus, outros = pais[lado], pais[1 - lado]
+            proxima = []
+
+            for x in fronteiras[lado]:
+                for y in self.adj[x]:
+                    if y not in meus:
+                        meus[y] = x
+                        if y in outros:
+                            caminho = reconstruir_caminho(pais[0], pais[1], y)
+                            return len(caminho) - 1, caminho
+                        proxima.append(y)
+
+            fronteiras[lado] = proxima
+
+        return -1, []
+
+    def salvar_busca_largura(self, inicio: int, arquivo: str, formato: str = "texto"):
+        """Salva a árvore da BFS em texto ou, com formato="npy", nas colunas pai/nivel (ver escrita.salvar_colunas)."""
+        validar_formato(formato)
+        pai, nivel = self.busca_largura(inicio)
+        pai = pai_1based(pai)
+
+        if formato == "npy":
+            return salvar_colunas(arquivo, pai=pai.astype(np.int32), nivel=np.asarray(nivel, dtype=np.int32))
+
+        with abrir_saida(arquivo) as f:
+            f.write(f"Árvore de Busca em Largura a partir do vértice {inicio+1}\n")
+            escrever_tabela(f, "vértice %d: pai = %d, nível = %d\n", np.arange(1, self.n + 1), pai, nivel)
+        return [arquivo]
+
+    def busca_profundidade(self, inicio: int, estatisticas=None):
+        est = estatisticas
+        if est is not None:
+            est.algoritmo = "busca_profundidade"
+
+        with fase(est, "inicializacao"):
+            visitado = [False] * self.n
+            pai  = [-1] * self.n
+            nivel   = [-1] * self.n
+
+        # Pilha explícita de iteradores (próximo vizinho de cada vértice na
+        # pilha): mesma ordem da versão recursiva, sem limite de recursão
+        with fase(est, "percurso"):
+            visitado[inicio] = True
+            nivel[inicio] = 0
+            pilha = [(inicio, iter(self.adj[inicio]))]
+
+            while pilha:
+                u, vizinhos = pilha[-1]
+                for v in vizinhos:
+                    if not visitado[v]:
+                        visitado[v] = True
+                        pai[v] = u
+                        nivel[v] = nivel[u] + 1
+                        pilha.append((v, iter(self.adj[v])))
+                        break
+                else:
+                    pilha.pop()
+
+        if est is not None:
+            # Um vértice só sai da pilha depois de examinar todos os vizinhos,
+            # e a pilha guarda o caminho da raiz até o topo (nível + 1)
+            alcancados = [u for u in range(self.n) if visitado[u]]
+            est.vertices_visitados += len(alcancados)
+            est.arestas_examinadas += sum(len(self.adj[u]) for u in alcancados)
+            est.pico_fila = max(est.pico_fila, max(nivel) + 1)
+        return pai, nivel
+
+    def salvar_busca_profundidade(self, inicio: int, arquivo: str, formato: str = "texto"):
+        validar_formato(formato)
+        pai, nivel = self.busca_profundidade(inicio)
+        pai = pai_1based(pai)
+
+        if formato == "npy":
+            return salvar_colunas(arquivo, pai=pai.astype(np.int32), nivel=np.asarray(nivel, dtype=np.int32))
+
+        with abrir_saida(arquivo) as f:
+            f.write(f"Árvore de busca em profundidade a partir do vértice {inicio+1}\n")
+            escrever_tabela(f, "vértice %d: pai = %d, nível = %d\n", np.arange(1, self.n + 1), pai, nivel)
+        return [arquivo]
+
+    def componentes_conexos(self, estatisticas=None):
+        est = estatisticas
+        if est is not None:
+            est.algoritmo = "componentes_conexos"
+
+        with fase(est, "inicializacao"):
+            visitado = [False] * self.n
+            componentes = []
+        pico = 0
+
+        with fase(est, "percurso"):
+            for s in range(self.n):
+                if visitado[s]:
+                    continue
+
+                # DFS iterativa: os vértices entram no componente em pré-ordem,
+                # como na versão recursiva
+                visitado[s] = True
+                componente = [s]
+                pilha = [iter(self.adj[s])]
+
+                while pilha:
+                    for v in pilha[-1]:
+                        if not visitado[v]:
+                            visitado[v] = True
+                            componente.append(v)
+                            pilha.append(iter(self.adj[v]))
+                            if est is not None and len(pilha) > pico:
+                                pico = len(pilha)
+                            break
+                    else:
+                        pilha.pop()
+
+                componentes.append(componente)
+
+        if est is not None:
+            # Todas as listas de adjacência são lidas até o fim
+            est.vertices_visitados += self.n
+            est.arestas_examinadas += sum(len(vizinhos) for vizinhos in self.adj.values())
+            est.pico_fila = max(est.pico_fila, pico, 1 if self.n else 0)
+            est.componentes += len(componentes)
+        return componentes
+
+    def salvar_componentes(self, arquivo: str, formato: str = "texto"):
+        """Salva as componentes em texto ou, com formato="npy", nas colunas vertices/inicio (CSR, 1-based)."""
+        validar_formato(formato)
+        componentes = self.componentes_conexos()
+
+        if formato == "npy":
+            vertices, inicio = colunas_componentes(componentes, deslocamento=1)
+            return salvar_colunas(arquivo, vertices=vertices, inicio=inicio)
+
+        with abrir_saida(arquivo) as f:
+            f.write(f"Número de componentes conexas: {len(componentes)}\n\n")
+            # Vértices 1-based na saída
+            escrever_componentes(f, componentes, deslocamento=1)
+        return [arquivo]
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso correto:")
+        print("python3 grafos_lib.py arquivo_entrada.txt")
+        sys.exit(1)
+    
+    texto_entrada = sys.argv[1]
+    grafo = Lista_Grafo.ler_de_arquivo(texto_entrada) 
+    resumo_saida = "resumo_grafo_lista.txt"
+    grafo.salvar_resumo(resumo_saida) 
     print(f"Resumo do grafo salvo em '{resumo_saida}'")
\ No newline at end of file
@@ -0,0 +1,621 @@
+import sys
+import numpy as np
+from collections import deque
+
+from cache_grafo import carregar_csr
+from leitura_arestas import arestas_para_csr
+from cache_bfs import CacheBFS, LIMITE_PADRAO
+from caminho_minimo import reconstruir_caminho
+from reordenacao import Ordenacao, com_ids_originais, reordenar_csr
+from escrita import (abrir_saida, colunas_componentes, escrever_componentes, escrever_tabela,
+                     pai_1based, salvar_colunas, validar_formato)
+
+
+def _bits_por_fonte(mascaras: np.ndarray, k: int) -> np.ndarray:
+    """Desempacota máscaras (linhas de palavras uint64) em uma matriz booleana linhas x k."""
+    bytes_ = np.ascontiguousarray(mascaras, dtype="<u8").view(np.uint8)
+    return np.unpackbits(bytes_, axis=1, count=k, bitorder="little").view(bool)
+
+
+class Grafo_CSR:
+    """
+    Lista de adjacência compacta e imutável no formato CSR (indexação 0-based).
+
+    Os vizinhos do vértice u ficam contíguos em indices[offsets[u]:offsets[u+1]],
+    na mesma ordem de inserção usada pela Lista_Grafo, de modo que BFS, DFS e
+    componentes produzem exatamente os mesmos resultados.
+    """
+    # Métodos que, com reordenação, recebem e devolvem vértices na numeração do
+    # arquivo: nome -> (parâmetros que são vértices, tradução do resultado em
+    # reordenacao.Ordenacao ou None) (ver reordenacao.com_ids_originais)
+    IDS_ORIGINAIS = {
+        "vizinhos": (("u",), "vizinhos"),
+        "graus": ((), "por_vertice"),
+        "busca_largura": (("inicio",), "arvore"),
+        "busca_largura_fila": (("inicio",), "arvore"),
+        "busca_largura_niveis": (("inicio",), "arvore"),
+        "busca_largura_hibrida": (("inicio",), "arvore"),
+        "distancias_multiplas": (("fontes",), "por_fonte"),
+        "excentricidades": (("fontes",), None),
+        "caminho_minimo": (("u", "v"), "caminho"),
+        "busca_profundidade": (("inicio",), "arvore"),
+        "componentes_conexos": ((), "componentes"),
+    }
+
+    def __init__(self, num_vertices: int, offsets: np.ndarray, indices: np.ndarray, num_arestas: int):
+
+        self.n = num_vertices
+        self.offsets = offsets
+        self.indices = indices
+        self.num_arestas = num_arestas
+        # Contagem de linhas descartadas na leitura (ver leitura_arestas.ler_arestas)
+        self.descartes = None
+        # Algoritmo usado por busca_largura: "fila" (igual à Lista_Grafo), "niveis"
+        # (vetorizado) ou "hibrida" (top-down/bottom-up, limiares alfa_bfs e beta_bfs)
+        self.modo_bfs = "fila"
+        self.alfa_bfs = 14
+        self.beta_bfs = 24
+        # Cache LRU de resultados de BFS por (origem, modo) (ver ativar_cache_bfs)
+        self.cache_bfs = None
+        # Renumeração feita na carga (ver reordenacao.py); None = ids do arquivo
+        self.ordenacao = None
+
+    def ativar_cache_bfs(self, limite_bytes: int = LIMITE_PADRAO):
+        """Passa a guardar os resultados de busca_largura por origem e modo (LRU, ver cache_bfs.CacheBFS)."""
+        self.cache_bfs = CacheBFS(limite_bytes)
+
+    @staticmethod
+    def montar(num_vertices: int, origem: np.ndarray, destino: np.ndarray):
+        """Monta o grafo a partir das arestas (0-based, já sem duplicatas)."""
+        offsets, indices = arestas_para_csr(num_vertices, origem, destino)
+        return Grafo_CSR(num_vertices, offsets, indices, len(origem))
+
+    @staticmethod
+    def ler_de_arquivo(arquivo: str, usar_cache: bool = False, reordenar: str = None):
+
+        # Com usar_cache, offsets/indices são mapeados direto do cache binário
+        n, offsets, indices, num_arestas, descartes = carregar_csr(arquivo, usar_cache)
+
+        # Com `reordenar` (um de reordenacao.CRITERIOS), os arrays passam para a
+        # nova numeração; os métodos públicos continuam nos ids do arquivo
+        ordenacao = None
+        if reordenar:
+            ordenacao = Ordenacao.de_csr(offsets, indices, reordenar)
+            offsets, indices = reordenar_csr(offsets, indices, ordenacao.ordem)
+
+        grafo = Grafo_CSR(n, offsets, indices, num_arestas)
+        grafo.descartes = descartes
+        return grafo if ordenacao is None else com_ids_originais(grafo, ordenacao)
+
+    @staticmethod
+    def de_lista(grafo):
+        """Converte uma Lista_Grafo já carregada para o formato CSR."""
+        graus = np.fromiter((len(grafo.adj[v]) for v in range(grafo.n)), dtype=np.int64, count=grafo.n)
+        tipo = np.int32 if graus.sum() < np.iinfo(np.int32).max else np.int64
+
+        offsets = np.zeros(grafo.n + 1, dtype=tipo)
+        np.cumsum(graus, out=offsets[1:])
+        indices = np.fromiter((v for u in range(grafo.n) for v in grafo.adj[u]), dtype=np.int32, count=int(offsets[-1]))
+
+        csr = Grafo_CSR(grafo.n, offsets, indices, grafo.num_arestas)
+        # As listas já estão na numeração interna da Lista_Grafo: a mesma ordenação vale
+        return csr if grafo.ordenacao is None else com_ids_originais(csr, grafo.ordenacao)
+
+    def vizinhos(self, u: int) -> np.ndarray:
+
+        return self.indices[self.offsets[u]:self.offsets[u + 1]]
+
+    def graus(self) -> np.ndarray:
+
+        return np.diff(self.offsets)
+
+    def salvar_resumo(self, arquivo: str, formato: str = "texto"):
+        validar_formato(formato)
+        graus = self.graus()
+
+        if formato == "npy":
+            return salvar_colunas(arquivo, grau=graus)
+
+        with abrir_saida(arquivo) as f:
+            f.write(f"Vértices: {self.n}\n")
+            f.write(f"Arestas: {self.num_arestas}\n")
+            f.write("Graus:\n")
+            escrever_tabela(f, "vértice %d: grau %d\n", np.arange(1, self.n + 1), graus)
+        return [arquivo]
+
+    def busca_largura(self, inicio: int, modo: str = None):
+        """
+        BFS a partir de `inicio`. O modo (padrão: self.modo_bfs) escolhe o algoritmo:
+        - "fila": fila de vértices, devolve listas Python (igual à Lista_Grafo);
+        - "niveis": expande um nível inteiro por vez com NumPy, devolve arrays int32;
+        - "hibrida": alterna top-down/bottom-up (ver busca_largura_hibrida).
+        Os dois primeiros produzem os mesmos pai e nível; o híbrido, os mesmos níveis.
+        Com ativar_cache_bfs, os resultados são reaproveitados por (origem, modo).
+        """
+        modo = modo or self.modo_bfs
+        if modo == "niveis":
+            busca = self.busca_largura_niveis
+        elif modo == "hibrida":
+            busca = self.busca_largura_hibrida
+        elif modo == "fila":
+            busca = self.busca_largura_fila
+        else:
+            raise ValueError(f"Modo de BFS desconhecido: {modo}")
+
+        if self.cache_bfs is None:
+            return busca(inicio)
+
+        guardado = self.cache_bfs.obter((inicio, modo))
+        if guardado is None:
+            guardado = busca(inicio)
+            self.cache_bfs.guardar((inicio, modo), *guardado)
+        elif modo == "fila":
+            return guardado[0].tolist(), guardado[1].tolist()
+        return guardado
+
+    def busca_largura_fila(self, inicio: int):
+        """BFS com fila, devolve listas Python (mesma ordem e resultados da Lista_Grafo)."""
+
+        # Offsets como lista Python: acesso escalar barato no laço principal
+        off = self.offsets.tolist()
+        indices = self.indices
+
+        visitado = [False] * self.n
+        pai  = [-1] * self.n
+        nivel   = [-1] * self.n
+
+        fila = deque([inicio])
+        visitado[inicio] = True
+        nivel[inicio] = 0
+
+        while fila:
+            u = fila.popleft()
+            for v in indices[off[u]:off[u + 1]].tolist():
+                if not visitado[v]:
+                    visitado[v] = True
+                    pai[v] = u
+                    nivel[v] = nivel[u] + 1
+                    fila.append(v)
+
+        return pai, nivel
+
+    def _vizinhos_de(self, vertices: np.ndarray, inicios: np.ndarray = None):
+        """
+        Gather vetorizado: vizinhos de todos os `vertices`, concatenados na
+        ordem dada, a partir da posição `inicios` de cada um (padrão: offsets).
+
+        :return: (vizinhos, graus) com graus = quantidade lida de cada vértice.
+        """
+        if inicios is None:
+            inicios = self.offsets[vertices]
+        graus = self.offsets[vertices + 1] - inicios
+        total = int(graus.sum())
+        deslocamentos = np.cumsum(graus) - graus
+        posicoes = np.arange(total) - np.repeat(deslocamentos - inicios, graus)
+        return self.indices[posicoes], graus
+
+    def _passo_top_down(self, fronteira: np.ndarray, visitado: np.ndarray, primeira: np.ndarray):
+        """
+        Expande a fronteira (em ordem de fila) de uma vez. Cada vértice novo
+        recebe como pai o primeiro vértice da fronteira que o alcança.
+
+        :return: (novos, pais, arestas_examinadas)
+        """
+        vizinhos, graus = self._vizinhos_de(fronteira)
+        origens = np.repeat(fronteira, graus)
+
+        nao_visitados = ~visitado[vizinhos]
+        vizinhos = vizinhos[nao_visitados]
+        origens = origens[nao_visitados]
+
+        # Primeira posição em que cada vértice aparece na expansão deste nível
+        ordem = np.arange(len(vizinhos))
+        primeira[vizinhos] = len(vizinhos)
+        np.minimum.at(primeira, vizinhos, ordem)
+        eh_primeira = primeira[vizinhos] == ordem
+
+        return vizinhos[eh_primeira], origens[eh_primeira], len(nao_visitados)
+
+    def _passo_bottom_up(self, na_fronteira: np.ndarray, visitado: np.ndarray, rodadas: int = 8):
+        """
+        Passo bottom-up: cada vértice não visitado procura, na ordem da sua
+        lista de adjacência, um vizinho que esteja na fronteira e para no
+        primeiro encontrado. As primeiras `rodadas` verificam um vizinho por
+        vez para todos os candidatos ainda sem pai (parada antecipada); os
+        que restam verificam o resto da lista de uma só vez.
+
+        :return: (novos, pais, arestas_examinadas)
+        """
+        offsets = self.offsets
+        candidatos = np.flatnonzero(~visitado)
+        posicao = offsets[candidatos].astype(np.int64)
+        fim = offsets[candidatos + 1]
+        pais = np.full(len(candidatos), -1, dtype=np.int64)
+        ativos = np.arange(len(candidatos))
+        examinadas = 0
+
+        for _ in range(rodadas):
+            ativos = ativos[posicao[ativos] < fim[ativos]]
+            if len(ativos) == 0:
+                break
+            vizinhos = self.indices[posicao[ativos]]
+            examinadas += len(ativos)
+            achou = na_fronteira[vizinhos]
+            pais[ativos[achou]] = vizinhos[achou]
+            ativos = ativos[~achou]
+            posicao[ativos] += 1
+
+        ativos = ativos[posicao[ativos] < fim[ativos]]
+        if len(ativos):
+            vizinhos, graus = self._vizinhos_de(candidatos[ativos], posicao[ativos])
+            examinadas += len(vizinhos)
+            acertos = np.flatnonzero(na_fronteira[vizinhos])
+            segmento = np.repeat(np.arange(len(ativos)), graus)[acertos]
+            # Primeiro acerto de cada candidato (acertos já estão em ordem de posição)
+            primeiro = np.ones(len(acertos), dtype=bool)
+            primeiro[1:] = segmento[1:] != segmento[:-1]
+            pais[ativos[segmento[primeiro]]] = vizinhos[acertos[primeiro]]
+
+        encontrados = pais >= 0
+        return candidatos[encontrados], pais[encontrados], examinadas
+
+    def busca_largura_niveis(self, inicio: int):
+        """
+        BFS síncrona por níveis: a fronteira inteira é expandida de uma vez,
+        com gather dos vizinhos no CSR e máscara dos já visitados.
+
+        A fronteira é mantida na ordem em que a fila da BFS tradicional
+        visitaria os vértices, e cada vértice novo recebe como pai o primeiro
+        vértice da fronteira (nessa ordem) que o alcança; por isso pai e nível
+        são idênticos aos da versão com fila. Cada nível custa algumas chamadas
+        NumPy: ótimo para grafos de mundo pequeno (poucos níveis largos), mas
+        em cadeias longas (milhares de níveis estreitos) o modo "fila" é melhor.
+        """
+        pai = np.full(self.n, -1, dtype=np.int32)
+        nivel = np.full(self.n, -1, dtype=np.int32)
+        visitado = np.zeros(self.n, dtype=bool)
+        primeira = np.zeros(self.n, dtype=np.int64)
+
+        fronteira = np.array([inicio], dtype=np.int64)
+        visitado[inicio] = True
+        nivel[inicio] = 0
+        profundidade = 0
+
+        while len(fronteira):
+            novos, pais, _ = self._passo_top_down(fronteira, visitado, primeira)
+            if len(novos) == 0:
+                break
+
+            profundidade += 1
+            visitado[novos] = True
+            pai[novos] = pais
+            nivel[novos] = profundidade
+            fronteira = novos.astype(np.int64)
+
+        return pai, nivel
+
+    def busca_largura_hibrida(self, inicio: int, alfa: float = None, beta: float = None, relatorio: list = None):
+        """
+        BFS com otimização de direção (top-down / bottom-up, Beamer et al.).
+
+        Começa top-down e passa para bottom-up quando as arestas a examinar
+        a partir da fronteira (m_f) superam m_u / alfa, sendo m_u a soma dos
+        graus dos vértices ainda não visitados; volta para top-down quando a
+        fronteira tem menos de n / beta vértices. Em grafos de mundo pequeno
+        (diâmetro baixo e fronteira intermediária enorme) isso evita examinar
+        a maior parte das arestas que levam a vértices já visitados.
+
+        Os níveis são idênticos aos da BFS com fila; os pais formam uma árvore
+        de BFS válida, mas nos passos bottom-up o pai é o primeiro vizinho (na
+        lista de adjacência) que está na fronteira.
+
+        :param alfa: Limiar top-down -> bottom-up (padrão: self.alfa_bfs).
+        :param beta: Limiar bottom-up -> top-down (padrão: self.beta_bfs).
+        :param relatorio: Se for uma lista, recebe um dicionário por nível com
+                          nivel, direcao, fronteira e arestas_examinadas.
+        :return: (pai, nivel) como arrays int32.
+        """
+        alfa = self.alfa_bfs if alfa is None else alfa
+        beta = self.beta_bfs if beta is None else beta
+
+        graus = self.graus()
+        pai = np.full(self.n, -1, dtype=np.int32)
+        nivel = np.full(self.n, -1, dtype=np.int32)
+        visitado = np.zeros(self.n, dtype=bool)
+        primeira = np.zeros(self.n, dtype=np.int64)
+
+        fronteira = np.array([inicio], dtype=np.int64)
+        visitado[inicio] = True
+        nivel[inicio] = 0
+        arestas_nao_exploradas = int(graus.sum()) - int(graus[inicio])
+        direcao = "top-down"
+        profundidade = 0
+
+        while len(fronteira):
+            arestas_fronteira = int(graus[fronteira].sum())
+            if direcao == "top-down" and arestas_fronteira > arestas_nao_exploradas / alfa:
+                direcao = "bottom-up"
+            elif direcao == "bottom-up" and len(fronteira) < self.n / beta:
+                direcao = "top-down"
+
+            if direcao == "top-down":
+                novos, pais, examinadas = self._passo_top_down(fronteira, visitado, primeira)
+            else:
+                na_fronteira = np.zeros(self.n, dtype=bool)
+                na_fronteira[fronteira] = True
+                novos, pais, examinadas = self._passo_bottom_up(na_fronteira, visitado)
+
+            if relatorio is not None:
+                relatorio.append({
+                    "nivel": profundidade,
+                    "direcao": direcao,
+                    "fronteira": len(fronteira),
+                    "arestas_examinadas": examinadas,
+                })
+
+            if len(novos) == 0:
+                break
+
+            profundidade += 1
+            visitado[novos] = True
+            pai[novos] = pais
+            nivel[novos] = profundidade
+            arestas_nao_exploradas -= int(graus[novos].sum())
+            fronteira = novos.astype(np.int64)
+
+        return pai, nivel
+
+    def _busca_largura_bits(self, fontes, distancias: bool):
+        """
+        BFS de várias fontes ao mesmo tempo (MS-BFS, bit-paralela).
+
+        Cada vértice guarda uma máscara de bits (palavras uint64, um bit por
+        fonte) com as fontes que já o alcançaram; a fronteira é a máscara das
+        fontes que o alcançaram no último nível. Uma única passada pelas
+        arestas da fronteira (OR das máscaras dos vizinhos) avança todas as
+        BFS ao mesmo tempo. Quando a fronteira cobre boa parte das arestas, a
+        passada é feita sobre o CSR inteiro (reduceat por vértice).
+
+        :return: (excentricidade, inacessiveis, dist) por fonte; dist é a
+                 matriz k x n de distâncias (-1 = inacessível) ou None.
+        """
+        fontes = np.asarray(fontes, dtype=np.int64)
+        k = len(fontes)
+        palavras = max(1, (k + 63) // 64)
+        posicao = np.arange(k)
+
+        bits = np.zeros((k, palavras), dtype=np.uint64)
+        bits[posicao, posicao // 64] = np.left_shift(np.uint64(1), (posicao % 64).astype(np.uint64))
+        fronteira = np.zeros((self.n, palavras), dtype=np.uint64)
+        np.bitwise_or.at(fronteira, fontes, bits)
+        visto = fronteira.copy()
+
+        excentricidade = np.zeros(k, dtype=np.int32)
+        dist = None
+        if distancias:
+            dist = np.full((k, self.n), -1, dtype=np.int16 if self.n <= np.iinfo(np.int16).max else np.int32)
+            dist[posicao, fontes] = 0
+
+        graus = self.graus()
+        com_vizinhos = np.flatnonzero(graus)
+        total_arestas = len(self.indices)
+        ativos = np.unique(fontes)
+        nivel = 0
+
+        while len(ativos):
+            nivel += 1
+            if int(graus[ativos].sum()) > total_arestas // 4:
+                # Passada completa: OR das máscaras de todos os vizinhos de cada vértice
+                alvo = com_vizinhos
+                acumulado = np.bitwise_or.reduceat(fronteira[self.indices], self.offsets[com_vizinhos], axis=0)
+            else:
+                vizinhos, g = self._vizinhos_de(ativos)
+                ordem = np.argsort(vizinhos, kind="stable")
+                vizinhos = vizinhos[ordem]
+                mascaras = np.repeat(fronteira[ativos], g, axis=0)[ordem]
+                inicio = np.flatnonzero(np.r_[True, vizinhos[1:] != vizinhos[:-1]]) if len(vizinhos) else vizinhos
+                alvo = vizinhos[inicio]
+                acumulado = np.bitwise_or.reduceat(mascaras, inicio, axis=0) if len(inicio) else mascaras
+
+            novo = acumulado & ~visto[alvo]
+            tem_novo = novo.any(axis=1)
+            alvo, novo = alvo[tem_novo], novo[tem_novo]
+
+            fronteira[ativos] = 0
+            fronteira[alvo] = novo
+            visto[alvo] |= novo
+            ativos = alvo
+            if len(alvo) == 0:
+                break
+
+            alcancaram = _bits_por_fonte(np.bitwise_or.reduce(novo, axis=0)[None, :], k)[0]
+            excentricidade[alcancaram] = nivel
+            if distancias:
+                linha, fonte = np.nonzero(_bits_por_fonte(novo, k))
+                dist[fonte, alvo[linha]] = nivel
+
+        alcancados = np.zeros(k, dtype=np.int64)
+        for i in range(0, self.n, 65536):
+            alcancados += _bits_por_fonte(visto[i:i + 65536], k).sum(axis=0)
+
+        return excentricidade, self.n - alcancados, dist
+
+    def distancias_multiplas(self, fontes) -> np.ndarray:
+        """
+        Matriz k x n de distâncias a partir de cada vértice de `fontes`
+        (-1 = inacessível), com todas as fontes em uma única MS-BFS.
+        Usa int16 quando n cabe nesse tipo.
+        """
+        return self._busca_largura_bits(fontes, distancias=True)[2]
+
+    def excentricidades(self, fontes=None, lote: int = 256):
+        """
+        Excentricidade (maior nível alcançado) e número de vértices
+        inacessíveis de cada fonte (padrão: todos os vértices), processando
+        `lote` fontes por MS-BFS. Equivale a uma busca_largura por fonte.
+
+        :return: (excentricidade, inacessiveis) como arrays, na ordem de `fontes`.
+        """
+        fontes = np.arange(self.n) if fontes is None else np.asarray(fontes, dtype=np.int64)
+        excentricidade = np.zeros(len(fontes), dtype=np.int32)
+        inacessiveis = np.zeros(len(fontes), dtype=np.int64)
+
+        for i in range(0, len(fontes), lote):
+            e, inac, _ = self._busca_largura_bits(fontes[i:i + lote], distancias=False)
+            excentricidade[i:i + lote] = e
+            inacessiveis[i:i + lote] = inac
+
+        return excentricidade, inacessiveis
+
+    def caminho_minimo(self, u: int, v: int):
+        """
+        Menor caminho entre u e v por BFS bidirecional (ver caminho_minimo.py).
+        Cada rodada expande, com o gather vetorizado de _vizinhos_de, o nível
+        inteiro da fronteira com menos arestas a examinar e para no primeiro
+        vértice já alcançado pelo outro lado.
+
+        :return: (distancia, caminho) com o caminho [u, ..., v], ou (-1, []).
+        """
+        if u == v:
+            return 0, [u]
+
+        pais = (np.full(self.n, -1, dtype=np.int32), np.full(self.n, -1, dtype=np.int32))
+        alcancado = (np.zeros(self.n, dtype=bool), np.zeros(self.n, dtype=bool))
+        alcancado[0][u] = True
+        alcancado[1][v] = True
+        fronteiras = [np.array([u], dtype=np.int64), np.array([v], dtype=np.int64)]
+
+        while len(fronteiras[0]) and len(fronteiras[1]):
+            custos = [int((self.offsets[f + 1] - self.offsets[f]).sum()) for f in fronteiras]
+            lado = 0 if custos[0] <= custos[1] else 1
+            fronteira = fronteiras[lado]
+
+            vizinhos, graus = self._vizinhos_de(fronteira)
+            origens = np.repeat(fronteira, graus)
+            novos_mask = ~alcancado[lado][vizinhos]
+            vizinhos, origens = vizinhos[novos_mask], origens[novos_mask]
+            novos, primeiras = np.unique(vizinhos, return_index=True)
+            pais[lado][novos] = origens[primeiras]
+            alcancado[lado][novos] = True
+
+            encontros = novos[alcancado[1 - lado][novos]]
+            if len(encontros):
+                caminho = reconstruir_caminho(pais[0], pais[1], int(encontros[0]))
+                return len(caminho) - 1, caminho
+
+            fronteiras[lado] = novos.astype(np.int64)
+
+        return -1, []
+
+    def salvar_busca_largura(self, inicio: int, arquivo: str, formato: str = "texto"):
+        """Salva a árvore da BFS em texto ou, com formato="npy", nas colunas pai/nivel (ver escrita.salvar_colunas)."""
+        validar_formato(formato)
+        pai, nivel = self.busca_largura(inicio)
+        pai = pai_1based(pai)
+
+        if formato == "npy":
+            return salvar_colunas(arquivo, pai=pai.astype(np.int32), nivel=np.asarray(nivel, dtype=np.int32))
+
+        with abrir_saida(arquivo) as f:
+            f.write(f"Árvore de Busca em Largura a partir do vértice {inicio+1}\n")
+            escrever_tabela(f, "vértice %d: pai = %d, nível = %d\n", np.arange(1, self.n + 1), pai, nivel)
+        return [arquivo]
+
+    def busca_profundidade(self, inicio: int):
+
+        off = self.offsets.tolist()
+        indices = self.indices
+
+        visitado = [False] * self.n
+        pai  = [-1] * self.n
+        nivel   = [-1] * self.n
+
+        # Pilha explícita de iteradores: reproduz a ordem da versão recursiva
+        visitado[inicio] = True
+        nivel[inicio] = 0
+        pilha = [(inicio, iter(indices[off[inicio]:off[inicio + 1]].tolist()))]
+
+        while pilha:
+            u, vizinhos = pilha[-1]
+            for v in vizinhos:
+                if not visitado[v]:
+                    visitado[v] = True
+                    pai[v] = u
+                    nivel[v] = nivel[u] + 1
+                    pilha.append((v, iter(indices[off[v]:off[v + 1]].tolist())))
+                    break
+            else:
+                pilha.pop()
+
+        return pai, nivel
+
+    def salvar_busca_profundidade(self, inicio: int, arquivo: str, formato: str = "texto"):
+        validar_formato(formato)
+        pai, nivel = self.busca_profundidade(inicio)
+        pai = pai_1based(pai)
+
+        if formato == "npy":
+            return salvar_colunas(arquivo, pai=pai.astype(np.int32), nivel=np.asarray(nivel, dtype=np.int32))
+
+        with abrir_saida(arquivo) as f:
+            f.write(f"Árvore de busca em profundidade a partir do vértice {inicio+1}\n")
+            escrever_tabela(f, "vértice %d: pai = %d, nível = %d\n", np.arange(1, self.n + 1), pai, nivel)
+        return [arquivo]
+
+    def componentes_conexos(self):
+
+        off = self.offsets.tolist()
+        indices = self.indices
+
+        visitado = [False] * self.n
+        componentes = []
+
+        for s in range(self.n):
+            if visitado[s]:
+                continue
+
+            visitado[s] = True
+            componente = [s]
+            pilha = [iter(indices[off[s]:off[s + 1]].tolist())]
+
+            while pilha:
+                for v in pilha[-1]:
+                    if not visitado[v]:
+                        visitado[v] = True
+                        componente.append(v)
+                        pilha.append(iter(indices[off[v]:off[v + 1]].tolist()))
+                        break
+                else:
+                    pilha.pop()
+
+            componentes.append(componente)
+
+        return componentes
+
+    def salvar_componentes(self, arquivo: str, formato: str = "texto"):
+        """Salva as componentes em texto ou, com formato="npy", nas colunas vertices/inicio (CSR, 1-based)."""
+        validar_formato(formato)
+        componentes = self.componentes_conexos()
+
+        if formato == "npy":
+            vertices, inicio = colunas_componentes(componentes, deslocamento=1)
+            return salvar_colunas(arquivo, vertices=vertices, inicio=inicio)
+
+        with abrir_saida(arquivo) as f:
+            f.write(f"Número de componentes conexas: {len(componentes)}\n\n")
+            # Vértices 1-based na saída
+            escrever_componentes(f, componentes, deslocamento=1)
+        return [arquivo]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso correto:")
+        print("python3 grafos_lib_csr.py arquivo_entrada.txt")
+        sys.exit(1)
+
+    texto_entrada = sys.argv[1]
+    grafo = Grafo_CSR.ler_de_arquivo(texto_entrada)
+    resumo_saida = "resumo_grafo_csr.txt"
+    grafo.salvar_resumo(resumo_saida)
+    print(f"Resumo do grafo salvo em '{resumo_saida}'")
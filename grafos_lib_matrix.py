@@ -1,30 +1,178 @@
 import sys
+import time
 import numpy as np
 
+from cache_grafo import carregar_arestas
+from uniao_busca import UniaoBusca
+from cache_bfs import CacheBFS, LIMITE_PADRAO
+from estatisticas import fase
+from caminho_minimo import reconstruir_caminho
+from leitura_arestas import arestas_para_csr
+from reordenacao import Ordenacao, com_ids_originais
+from escrita import (TAMANHO_BUFFER, abrir_saida, colunas_componentes, escrever_componentes,
+                     escrever_tabela, salvar_colunas, validar_formato)
+
+# Tabela de popcount por byte (fallback para NumPy < 2.0, sem np.bitwise_count)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(a: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(a)
+    return _POPCOUNT[a]
+
+
+def _indices_bits(linha: np.ndarray) -> np.ndarray:
+    """Posições (crescentes) dos bits ligados de uma linha compactada."""
+    bytes_nz = np.flatnonzero(linha)
+    bits = np.unpackbits(linha[bytes_nz][:, None], axis=1).view(bool)
+    return (bytes_nz[:, None] * 8 + np.arange(8))[bits]
+
+
+def _concatenar(partes) -> np.ndarray:
+    return np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
+
+
 class Grafo_Matriz:
-    def __init__(self, num_vertices: int):
+    FORMATO = "densa"
+    # Limite (em bytes) do bloco de linhas da fronteira materializado por vez na BFS
+    LIMITE_BLOCO_BFS = 32 * 1024 * 1024
+    # Métodos que, com reordenação, recebem e devolvem vértices na numeração do
+    # arquivo: nome -> (parâmetros que são vértices, tradução do resultado em
+    # reordenacao.Ordenacao ou None) (ver reordenacao.com_ids_originais)
+    IDS_ORIGINAIS = {
+        "tem_aresta": (("u", "v"), None),
+        "linha": (("u",), "por_vertice"),
+        "vizinhos": (("u",), "vizinhos"),
+        "graus": ((), "por_vertice"),
+        "add_arestas": (("u", "v"), None),
+        "manter_componentes": ((), None),
+        "mesmo_componente": (("u", "v"), None),
+        "tamanho_componente": (("u",), None),
+        "busca_largura": (("inicio",), "arvore"),
+        "caminho_minimo": (("u", "v"), "caminho"),
+        "busca_profundidade": (("inicio",), "arvore"),
+        "componentes_conexos": ((), "componentes"),
+    }
+
+    def __init__(self, num_vertices: int, adj=None):
         
         self.n = num_vertices
         
-        self.adj = np.zeros((num_vertices + 1, num_vertices + 1), dtype=np.uint8)
+        self.adj = self._alocar(num_vertices) if adj is None else adj
         
         self.num_arestas = 0
+        # União-busca mantida por add_arestas (ver manter_componentes)
+        self.uniao = None
+        # Cache LRU de resultados de BFS por origem (ver ativar_cache_bfs)
+        self.cache_bfs = None
+        # Renumeração feita na carga (ver reordenacao.py); None = ids do arquivo
+        self.ordenacao = None
 
     
-    @staticmethod
-    def from_file(arquivo: str):
-        # Usa o método estático criar_matriz_adjacencias para ler arquivo de forma robusta.
-        matriz = Grafo_Matriz.criar_matriz_adjacencias(arquivo)
-        if matriz is None:
+    @classmethod
+    def from_file(cls, arquivo: str, formato: str = None, usar_cache: bool = False, reordenar: str = None):
+        # Usa o mesmo caminho de criar_matriz_adjacencias para ler arquivo de forma robusta.
+        formato = formato or cls.FORMATO
+        lido = Grafo_Matriz._ler_matriz(arquivo, formato, usar_cache, reordenar)
+        if lido is None:
             raise ValueError("Falha ao criar matriz de adjacências a partir do arquivo.")
+        matriz, ordenacao = lido
 
         # Determina N a partir da forma da matriz (n+1 por conta do índice 0 não usado)
         N = matriz.shape[0] - 1
-        grafo = Grafo_Matriz(N)
-        grafo.adj = matriz
+        grafo = FORMATOS[formato](N, adj=matriz)
         # Conta arestas: cada aresta é contada duas vezes na matriz (i,j) e (j,i)
-        grafo.num_arestas = int(np.sum(matriz) // 2)
-        return grafo
+        grafo.num_arestas = int(np.sum(grafo.graus()) // 2)
+        return grafo if ordenacao is None else com_ids_originais(grafo, ordenacao)
+
+    # --- Primitivas de armazenamento (sobrescritas pelos outros formatos) ---
+
+    @staticmethod
+    def _alocar(n: int):
+        return np.zeros((n + 1, n + 1), dtype=np.uint8)
+
+    @staticmethod
+    def _preencher(matriz, origem: np.ndarray, destino: np.ndarray):
+        matriz[origem, destino] = 1
+        matriz[destino, origem] = 1
+
+    def tem_aresta(self, u: int, v: int) -> bool:
+        return bool(self.adj[u, v])
+
+    def _inserir(self, u: int, v: int):
+        self.adj[u, v] = 1 # A->B
+        self.adj[v, u] = 1 # B->A (Não-direcionado)
+
+    def linha(self, u: int) -> np.ndarray:
+        """Linha u da matriz como vetor uint8 de tamanho n+1."""
+        return self.adj[u]
+
+    def vizinhos(self, u: int) -> np.ndarray:
+        return np.flatnonzero(self.adj[u])
+
+    def graus(self) -> np.ndarray:
+        return np.sum(self.adj, axis=1)
+
+    def _nova_mascara(self):
+        """Conjunto de visitados no formato nativo da matriz."""
+        return np.zeros(self.n + 1, dtype=bool)
+
+    def _visitado(self, mascara, u: int) -> bool:
+        return mascara[u]
+
+    def _marcar(self, mascara, u: int):
+        mascara[u] = True
+
+    def _expandir(self, u: int, mascara) -> np.ndarray:
+        """Devolve (em ordem crescente) os vizinhos de u ainda não visitados e os marca."""
+        novos = np.flatnonzero((self.adj[u] != 0) & ~mascara)
+        mascara[novos] = True
+        return novos
+
+    def _primeiro_nao_visitado(self, u: int, mascara, inicio: int = 0) -> int:
+        """Menor vizinho v >= inicio de u ainda não visitado, ou -1."""
+        if inicio > self.n:
+            return -1
+        candidatos = (self.adj[u, inicio:] != 0) & ~mascara[inicio:]
+        v = int(candidatos.argmax())
+        return inicio + v if candidatos[v] else -1
+
+    def _linhas_por_bloco(self) -> int:
+        return max(1, self.LIMITE_BLOCO_BFS // (self.n + 1))
+
+    def _passo_nivel(self, fronteira: np.ndarray, mascara):
+        """
+        Expande um nível inteiro: as linhas da fronteira (em blocos de até
+        LIMITE_BLOCO_BFS bytes) são combinadas com um OR por coluna e
+        mascaradas pelos visitados. O pai de cada vértice novo é a primeira
+        linha da fronteira que o alcança.
+
+        :return: (novos, pais) na ordem em que a BFS com fila os visitaria;
+                 os novos já saem marcados em `mascara`.
+        """
+        novos_blocos, pais_blocos = [], []
+        passo = self._linhas_por_bloco()
+
+        for i in range(0, len(fronteira), passo):
+            bloco = fronteira[i:i + passo]
+            linhas = (self.adj[bloco] != 0) & ~mascara
+            novos = np.flatnonzero(linhas.any(axis=0))
+            if len(novos) == 0:
+                continue
+            quem = linhas[:, novos].argmax(axis=0)
+            ordem = np.lexsort((novos, quem))
+            novos_blocos.append(novos[ordem])
+            pais_blocos.append(bloco[quem[ordem]])
+            mascara[novos] = True
+
+        return _concatenar(novos_blocos), _concatenar(pais_blocos)
+
+    def _soma_graus(self, vertices: np.ndarray) -> int:
+        """Entradas não nulas nas linhas de `vertices` (em blocos, como _passo_nivel)."""
+        passo = self._linhas_por_bloco()
+        return sum(int(np.count_nonzero(self.adj[vertices[i:i + passo]]))
+                   for i in range(0, len(vertices), passo))
 
 
     def add_arestas(self, u: int, v: int):
@@ -32,159 +180,303 @@ class Grafo_Matriz:
         if u < 0 or u > self.n or v < 0 or v > self.n:
             raise IndexError(f"Vértice(s) fora do intervalo [1, {self.n}]")
 
-        if self.adj[u, v] == 0: 
-            self.adj[u, v] = 1 # A->B
-            self.adj[v, u] = 1 # B->A (Não-direcionado)
+        if not self.tem_aresta(u, v): 
+            self._inserir(u, v)
             self.num_arestas += 1
+            if self.uniao is not None:
+                self.uniao.unir(u, v)
+            if self.cache_bfs is not None:
+                self.cache_bfs.invalidar()
 
-    def save_resumo(self, arquivo: str):
-        
-        graus = np.sum(self.adj, axis=1)
+    def ativar_cache_bfs(self, limite_bytes: int = LIMITE_PADRAO):
+        """Passa a guardar os resultados de busca_largura por origem (LRU, ver cache_bfs.CacheBFS)."""
+        self.cache_bfs = CacheBFS(limite_bytes)
 
-        with open(arquivo, "w") as f:
+    def manter_componentes(self):
+        """
+        Passa a manter as componentes conexas de forma incremental: uma
+        UniaoBusca (sobre 0..n, como componentes_conexos) é montada com as
+        arestas atuais e atualizada a cada add_arestas. As consultas abaixo
+        ativam isso na primeira chamada.
+        """
+        vizinhos = [self.vizinhos(u) for u in range(self.n + 1)]
+        origem = np.repeat(np.arange(self.n + 1, dtype=np.int64), [len(l) for l in vizinhos])
+        destino = np.concatenate(vizinhos).astype(np.int64)
+
+        self.uniao = UniaoBusca(self.n + 1)
+        self.uniao.unir_arestas(origem, destino)
+
+    def mesmo_componente(self, u: int, v: int) -> bool:
+        if self.uniao is None:
+            self.manter_componentes()
+        return self.uniao.mesmo_conjunto(u, v)
+
+    def num_componentes(self) -> int:
+        if self.uniao is None:
+            self.manter_componentes()
+        return self.uniao.num_componentes
+
+    def tamanho_componente(self, u: int) -> int:
+        if self.uniao is None:
+            self.manter_componentes()
+        return self.uniao.tamanho_de(u)
+
+    def tamanhos_componentes(self) -> np.ndarray:
+        """Tamanhos de todas as componentes, na ordem de componentes_conexos (O(n))."""
+        if self.uniao is None:
+            self.manter_componentes()
+        return self.uniao.componentes(None if self.ordenacao is None else self.ordenacao.ordem)
+
+    def save_resumo(self, arquivo: str, formato: str = "texto"):
+        validar_formato(formato)
+        graus = self.graus()
+
+        if formato == "npy":
+            return salvar_colunas(arquivo, grau=graus)
+
+        with abrir_saida(arquivo) as f:
             f.write(f"Vértices: {self.n}\n")
             f.write(f"Arestas: {self.num_arestas}\n")
             f.write("Graus:\n")
-            for v in range( self.n + 1):
-                f.write(f"vértice {v}: grau {graus[v]}\n")
+            escrever_tabela(f, "vértice %d: grau %d\n", np.arange(self.n + 1), graus)
+        return [arquivo]
 
     
-    def busca_largura(self, inicio: int):
-       
-        from collections import deque
-
-        visitado = np.zeros(self.n + 1, dtype=bool)
-        pai  = np.full(self.n + 1, -1, dtype=np.int32)
-        nivel   = np.full(self.n + 1, -1, dtype=np.int32)
-
-        fila = deque([inicio])
-        visitado[inicio] = True
+    def busca_largura(self, inicio: int, estatisticas=None):
+        """
+        BFS por níveis: a fronteira é tratada como um vetor e cada nível sai
+        de uma redução (OR) sobre as linhas da fronteira, mascarada pelos
+        visitados (ver _passo_nivel). Pai e nível são os mesmos da BFS com fila.
+        Com `estatisticas` (estatisticas.EstatisticasBusca), registra cada
+        nível; as arestas examinadas são contadas à parte (fase "contagem"),
+        fora da fase "expansao".
+        """
+        est = estatisticas
+        if est is not None:
+            est.algoritmo = "busca_largura"
+
+        if self.cache_bfs is not None:
+            guardado = self.cache_bfs.obter(inicio)
+            if guardado is not None:
+                if est is not None:
+                    est.acertos_cache += 1
+                return guardado
+
+        with fase(est, "inicializacao"):
+            visitado = self._nova_mascara()
+            pai  = np.full(self.n + 1, -1, dtype=np.int32)
+            nivel   = np.full(self.n + 1, -1, dtype=np.int32)
+
+        self._marcar(visitado, inicio)
         nivel[inicio] = 0
-
-        while fila:
-            u = fila.popleft()
-            
-            vizinhos = np.where(self.adj[u] == 1)[0] 
-            
-            for v in vizinhos:
-                if v >= 0 and not visitado[v]:
-                    visitado[v] = True
-                    pai[v] = u
-                    nivel[v] = nivel[u] + 1
-                    fila.append(v)
-
+        fronteira = np.array([inicio], dtype=np.int64)
+        profundidade = 0
+        if est is not None:
+            est.vertices_visitados += 1
+
+        while len(fronteira):
+            t_nivel = time.perf_counter() if est is not None else 0.0
+            with fase(est, "expansao"):
+                novos, pais = self._passo_nivel(fronteira, visitado)
+            if est is not None:
+                with est.fase("contagem"):
+                    arestas = self._soma_graus(fronteira)
+                est.linhas_lidas += len(fronteira)
+                est.arestas_examinadas += arestas
+                est.vertices_visitados += len(novos)
+                est.registrar_nivel(profundidade, len(fronteira), arestas, time.perf_counter() - t_nivel)
+            if len(novos) == 0:
+                break
+
+            with fase(est, "atualizacao"):
+                profundidade += 1
+                pai[novos] = pais
+                nivel[novos] = profundidade
+            fronteira = novos
+
+        if self.cache_bfs is not None:
+            self.cache_bfs.guardar(inicio, pai, nivel)
         return pai, nivel
     
     
-    def salvar_busca_largura(self, inicio: int, arquivo: str):
-        
+    def caminho_minimo(self, u: int, v: int):
+        """
+        Menor caminho entre u e v (1-based) por BFS bidirecional (ver
+        caminho_minimo.py): cada rodada expande com _passo_nivel o nível
+        inteiro da menor fronteira e para no primeiro encontro.
+
+        :return: (distancia, caminho) com o caminho [u, ..., v], ou (-1, []).
+        """
+        if u < 1 or u > self.n or v < 1 or v > self.n:
+            raise IndexError(f"Vértice(s) fora do intervalo [1, {self.n}]")
+        if u == v:
+            return 0, [u]
+
+        mascaras = (self._nova_mascara(), self._nova_mascara())
+        self._marcar(mascaras[0], u)
+        self._marcar(mascaras[1], v)
+        pais = (np.full(self.n + 1, -1, dtype=np.int32), np.full(self.n + 1, -1, dtype=np.int32))
+        # A máscara pode estar em bits; `alcancado` permite o teste vetorizado do encontro
+        alcancado = (np.zeros(self.n + 1, dtype=bool), np.zeros(self.n + 1, dtype=bool))
+        alcancado[0][u] = True
+        alcancado[1][v] = True
+        fronteiras = [np.array([u], dtype=np.int64), np.array([v], dtype=np.int64)]
+
+        while len(fronteiras[0]) and len(fronteiras[1]):
+            lado = 0 if len(fronteiras[0]) <= len(fronteiras[1]) else 1
+            novos, pais_novos = self._passo_nivel(fronteiras[lado], mascaras[lado])
+            pais[lado][novos] = pais_novos
+            alcancado[lado][novos] = True
+
+            encontros = novos[alcancado[1 - lado][novos]]
+            if len(encontros):
+                caminho = reconstruir_caminho(pais[0], pais[1], int(encontros[0]))
+                return len(caminho) - 1, caminho
+
+            fronteiras[lado] = novos
+
+        return -1, []
+
+    def salvar_busca_largura(self, inicio: int, arquivo: str, formato: str = "texto"):
+        """Salva a árvore da BFS em texto ou, com formato="npy", nas colunas pai/nivel (ver escrita.salvar_colunas)."""
+        validar_formato(formato)
         pai, nivel = self.busca_largura(inicio)
 
-        with open(arquivo, "w") as f:
+        if formato == "npy":
+            return salvar_colunas(arquivo, pai=pai, nivel=nivel)
+
+        with abrir_saida(arquivo) as f:
             f.write(f"Árvore de Busca em Largura a partir do vértice {inicio}\n")
-            for v in range(self.n + 1): 
-                f.write(f"vértice {v}: pai = {pai[v]}, nível = {nivel[v]}\n")
+            escrever_tabela(f, "vértice %d: pai = %d, nível = %d\n", np.arange(self.n + 1), pai, nivel)
+        return [arquivo]
 
 
-    def busca_profundidade(self, inicio: int):
-        
-        
-        visitado = np.zeros(self.n + 1, dtype=bool)
-        pai = np.full(self.n + 1, -1, dtype=np.int32)
-        nivel = np.full(self.n + 1, -1, dtype=np.int32)
+    def busca_profundidade(self, inicio: int, estatisticas=None, so_componente: bool = False):
+        """
+        DFS a partir de `inicio`, que depois segue pelos vértices ainda não
+        visitados (nível 0 em cada nova raiz). Com `so_componente`, para ao
+        fim da árvore de `inicio` e os demais ficam com pai e nível -1.
+        """
+        est = estatisticas
+        if est is not None:
+            est.algoritmo = "busca_profundidade"
+
+        with fase(est, "inicializacao"):
+            visitado = self._nova_mascara()
+            pai = np.full(self.n + 1, -1, dtype=np.int32)
+            nivel = np.full(self.n + 1, -1, dtype=np.int32)
+            # Próxima coluna a examinar em cada linha: o que ficou para trás já foi visitado
+            proximo = [0] * (self.n + 1)
         
         def dfs_iterativa(u_inicial):
             stack = [u_inicial] 
-            visitado[u_inicial] = True
+            self._marcar(visitado, u_inicial)
             nivel[u_inicial] = 0
 
             while stack:
                 u = stack[-1]
 
-                vizinhos = np.where(self.adj[u] == 1)[0]
-                proximo_vizinho = None
-                
-                for v in vizinhos:
-                    if v >= 0 and v <= self.n and not visitado[v]:
-                        proximo_vizinho = v
-                        break 
+                v = self._primeiro_nao_visitado(u, visitado, proximo[u])
 
-                if proximo_vizinho is not None:
-                    v = proximo_vizinho
+                if v != -1:
+                    proximo[u] = v + 1
                     pai[v] = u
                     nivel[v] = nivel[u] + 1
-                    visitado[v] = True
+                    self._marcar(visitado, v)
                     stack.append(v)
                     
                 else:
                     stack.pop() 
 
-        if inicio >= 0 and inicio <= self.n and not visitado[inicio]:
-            dfs_iterativa(inicio)
-
-        for u in range(self.n + 1):
-            if not visitado[u]: 
-                dfs_iterativa(u) 
-
+        with fase(est, "percurso"):
+            if inicio >= 0 and inicio <= self.n and not self._visitado(visitado, inicio):
+                dfs_iterativa(inicio)
+
+            if not so_componente:
+                for u in range(self.n + 1):
+                    if not self._visitado(visitado, u):
+                        dfs_iterativa(u)
+
+        if est is not None:
+            # Cada passo lê uma linha e empilha um vértice ou desempilha o topo;
+            # uma linha só sai da pilha varrida até o fim, e a pilha guarda o
+            # caminho da raiz até o topo (nível + 1)
+            alcancados = np.flatnonzero(nivel >= 0)
+            raizes = int(np.count_nonzero(nivel == 0))
+            est.vertices_visitados += len(alcancados)
+            with est.fase("contagem"):
+                est.arestas_examinadas += self._soma_graus(alcancados)
+            est.linhas_lidas += 2 * len(alcancados) - raizes
+            est.pico_fila = max(est.pico_fila, int(nivel.max()) + 1)
         return pai, nivel
 
 
-    def salvar_busca_profundidade(self, inicio: int, arquivo: str):
-    
+    def salvar_busca_profundidade(self, inicio: int, arquivo: str, formato: str = "texto"):
+        validar_formato(formato)
         pai, nivel = self.busca_profundidade(inicio) 
 
-        with open(arquivo, "w") as f:
+        if formato == "npy":
+            return salvar_colunas(arquivo, pai=pai, nivel=nivel)
+
+        with abrir_saida(arquivo) as f:
             f.write(f"Árvore de Busca em Profundidade (DFS) a partir do vértice {inicio}\n")
             f.write("Vértice | Pai | Nível (Profundidade)\n") 
             f.write("-" * 40 + "\n")
-            
-            for v in range(self.n + 1):
-                f.write(f"{v} | {pai[v]} | {nivel[v]}\n")
+            escrever_tabela(f, "%d | %d | %d\n", np.arange(self.n + 1), pai, nivel)
+        return [arquivo]
 
 
-    def componentes_conexos(self):
-        
-        visitado = np.zeros(self.n + 1, dtype=bool) 
-        componentes = []
+    def componentes_conexos(self, estatisticas=None):
+        est = estatisticas
+        if est is not None:
+            est.algoritmo = "componentes_conexos"
+
+        with fase(est, "inicializacao"):
+            visitado = self._nova_mascara()
+            componentes = []
 
         for v_inicial in range(self.n + 1):
             
-            if not visitado[v_inicial]:
+            if not self._visitado(visitado, v_inicial):
                 
-                componente_atual = []
-                stack = [v_inicial]
-                visitado[v_inicial] = True
-
-                while stack:
-                    u = stack.pop() 
-                    componente_atual.append(u)
-                    
-                    vizinhos = np.where(self.adj[u] == 1)[0]
-                    
-                    for v in vizinhos:
-                        if v >= 0 and v <= self.n and not visitado[v]: 
-                            visitado[v] = True
-                            stack.append(v) 
+                # Componente obtido por BFS em níveis (ordem de descoberta)
+                componente_atual = [v_inicial]
+                self._marcar(visitado, v_inicial)
+                fronteira = np.array([v_inicial], dtype=np.int64)
+
+                while len(fronteira):
+                    if est is not None:
+                        with est.fase("contagem"):
+                            est.arestas_examinadas += self._soma_graus(fronteira)
+                        est.linhas_lidas += len(fronteira)
+                        est.pico_fila = max(est.pico_fila, len(fronteira))
+                    with fase(est, "expansao"):
+                        fronteira, _ = self._passo_nivel(fronteira, visitado)
+                    componente_atual.extend(fronteira.tolist())
                 
                 componentes.append(componente_atual) 
 
+        if est is not None:
+            est.vertices_visitados += self.n + 1
+            est.componentes += len(componentes)
         return componentes
     
-    def salvar_componentes(self, arquivo: str):
-            
+    def salvar_componentes(self, arquivo: str, formato: str = "texto"):
+            """Salva as componentes em texto ou, com formato="npy", nas colunas vertices/inicio (CSR)."""
+            validar_formato(formato)
             componentes = self.componentes_conexos()
 
-            with open(arquivo, "w") as f:
-                f.write(f"Número de componentes conexas: {len(componentes)}\n\n")
+            if formato == "npy":
+                vertices, inicio = colunas_componentes(componentes)
+                return salvar_colunas(arquivo, vertices=vertices, inicio=inicio)
 
-                for i, componente in enumerate(componentes):
-                    f.write(f"Componente {i+1} — tamanho {len(componente)}\n") 
-                    
-                    f.write("Vértices: " + " ".join(map(str, componente)) + "\n\n")
-    
+            with abrir_saida(arquivo) as f:
+                f.write(f"Número de componentes conexas: {len(componentes)}\n\n")
+                escrever_componentes(f, componentes)
+            return [arquivo]
 
     @staticmethod
-    def criar_matriz_adjacencias(arquivo: str) -> np.ndarray:
+    def criar_matriz_adjacencias(arquivo: str, formato: str = "densa", usar_cache: bool = False):
         """
         Lê um arquivo de conexões de grafo e cria sua matriz de adjacências.
 
@@ -192,102 +484,376 @@ class Grafo_Matriz:
         - A primeira linha com a quantidade de vértices (N).
         - As linhas seguintes com pares de vértices representando as arestas (v1 v2).
 
-        :param nome_arquivo: O caminho para o arquivo de entrada.
-        :return: Uma matriz de adjacências como um array NumPy (uint8).
+        :param arquivo: O caminho para o arquivo de entrada.
+        :param formato: "densa" (uint8, um byte por célula), "bits" (8 células por byte)
+                        ou "blocos" (blocos densos alocados só onde há arestas).
+        :param usar_cache: Lê as arestas do cache binário ao lado do arquivo (cache_grafo),
+                           criando-o na primeira leitura.
+        :return: A matriz de adjacências no formato pedido.
         """
-        try:
-            with open(arquivo, 'r') as f:
-                try:
-                    primeira_linha = f.readline().strip()
-                    if primeira_linha == "":
-                        print("Erro: Arquivo vazio.")
-                        return None
-
-                    if primeira_linha.isdigit():
-                        N = int(primeira_linha)
-                        print(f"Número de vértices (N) lido: {N}")
-                    else:
-                        f.seek(0)
-                        max_v = 0
-                        edges = []
-                        for linha_tmp in f:
-                            linha_tmp = linha_tmp.strip()
-                            if not linha_tmp or linha_tmp.startswith('#'):
-                                continue
-                            partes = linha_tmp.split()
-                            if len(partes) != 2:
-                                continue
-                            try:
-                                u_tmp = int(partes[0])
-                                v_tmp = int(partes[1])
-                                edges.append((u_tmp, v_tmp))
-                                if u_tmp > max_v:
-                                    max_v = u_tmp
-                                if v_tmp > max_v:
-                                    max_v = v_tmp
-                            except ValueError:
-                                continue
-                        if max_v == 0:
-                            print("Aviso: Não foi possível inferir N do arquivo; assumindo N=0.")
-                            return None
-                        N = max_v
-                        f.seek(0)
-                        print(f"Aviso: Primeira linha não continha N. Inferido N = {N} a partir das arestas.")
-
-                except ValueError:
-                    print("Erro: A primeira linha do arquivo deve ser um número inteiro (quantidade de vértices).")
-                    return None
-                
-                matriz_adj = np.zeros((N + 1, N + 1), dtype=np.uint8)
-                print(f"Matriz de adjacências {N}x{N} inicializada com tipo {matriz_adj.dtype}.")
-
-                num_arestas = 0
-                for linha in f:
-                    linha = linha.strip()
-                    if not linha or linha.startswith('#'):
-                        continue
-                    
-                    try:
-                        partes = linha.split()
-                        if len(partes) != 2:
-                            continue
-
-                        u = int(partes[0])
-                        v = int(partes[1])
-
-                        if 1 <= u <= N and 1 <= v <= N:
-                            matriz_adj[u, v] = 1
-                            matriz_adj[v, u] = 1
-                            num_arestas += 1
-                        else:
-                            print(f"⚠️ Aviso: Vértice fora do limite (1 a {N}): {u} ou {v}. Linha ignorada.")
-
-                    except ValueError:
-                        print(f"⚠️ Aviso: Linha inválida ignorada: '{linha}'")
-                
-                print(f"Processamento concluído. {num_arestas} arestas lidas.")
-                return matriz_adj
+        lido = Grafo_Matriz._ler_matriz(arquivo, formato, usar_cache)
+        return None if lido is None else lido[0]
+
+    @staticmethod
+    def _ler_matriz(arquivo: str, formato: str, usar_cache: bool, reordenar: str = None):
+        """
+        Corpo de criar_matriz_adjacencias. Com `reordenar` (um de
+        reordenacao.CRITERIOS), as arestas são renumeradas antes de preencher
+        a matriz.
 
+        :return: (matriz, ordenacao ou None), ou None se a leitura falhar.
+        """
+        try:
+            N, origem, destino, _ = carregar_arestas(arquivo, usar_cache)
         except FileNotFoundError:
             print(f"Erro: O arquivo '{arquivo}' não foi encontrado.")
             return None
+        except ValueError:
+            print("Erro: A primeira linha do arquivo deve ser um número inteiro (quantidade de vértices).")
+            return None
         except Exception as e:
             print(f"Ocorreu um erro inesperado: {e}")
             return None
 
+        if N == 0:
+            print("Erro: Arquivo vazio.")
+            return None
+        print(f"Número de vértices (N) lido: {N}")
+
+        ordenacao = None
+        if reordenar:
+            offsets, indices = arestas_para_csr(N, origem, destino)
+            ordenacao = Ordenacao.de_csr(offsets, indices, reordenar, base=1)
+            origem, destino = ordenacao.posicao[origem + 1] - 1, ordenacao.posicao[destino + 1] - 1
+
+        classe = FORMATOS[formato]
+        matriz_adj = classe._alocar(N)
+        print(f"Matriz de adjacências {N}x{N} ({formato}) inicializada com {matriz_adj.nbytes / 1024**2:.2f} MB.")
+
+        # Arestas chegam 0-based; a matriz usa índices 1-based
+        classe._preencher(matriz_adj, origem.astype(np.intp) + 1, destino.astype(np.intp) + 1)
+
+        print(f"Processamento concluído. {len(origem)} arestas lidas.")
+        return matriz_adj, ordenacao
+
     def representacao_matriz_adjacencias(self) -> None:
         """Imprime a representação da matriz de adjacências (1-based)."""
-        N = self.adj.shape[0] - 1
-        print("\n--- Matriz de Adjacências ---")
+        self._escrever_representacao(sys.stdout)
+
+    def salvar_representacao_matriz(self, arquivo: str):
+        """Grava a mesma saída de representacao_matriz_adjacencias direto no arquivo."""
+        with abrir_saida(arquivo) as f:
+            self._escrever_representacao(f)
+        return [arquivo]
+
+    def _escrever_representacao(self, f):
+        N = self.n
+        f.write("\n--- Matriz de Adjacências ---\n")
         # Cabeçalhos 1..N
-        indices = [str(i) for i in range(1, N+1)]
-        print("Vértice | " + " ".join(indices))
-        print("\n" * (2))
+        f.write("Vértice | " + " ".join(map(str, range(1, N+1))) + "\n")
+        f.write("\n" * 2 + "\n")
+
+        # Células 0/1 viram um dígito ASCII cada; as linhas saem em lotes
+        texto = np.full(2 * N, ord(" "), dtype=np.uint8)
+        texto[-1:] = ord("\n")
+        partes = []
         for i in range(1, N+1):
-            linha_str = " ".join(map(str, self.adj[i, 1:N+1]))
-            print(f"    {i}   | {linha_str}")
+            celulas = self.linha(i)[1:N+1]
+            if N and celulas.max() > 9:
+                linha_str = " ".join(map(str, celulas)) + "\n"
+            else:
+                texto[0::2] = celulas + ord("0")
+                linha_str = texto.tobytes().decode("ascii")
+            partes.append(f"    {i}   | {linha_str}")
+            if len(partes) * (2 * N + 12) >= TAMANHO_BUFFER or i == N:
+                f.write("".join(partes))
+                partes = []
     
 
+class Grafo_Matriz_Bits(Grafo_Matriz):
+    """
+    Matriz de adjacências compactada em bits (8 células por byte, ordem do
+    np.packbits): a linha u ocupa ceil((n+1)/8) bytes. Vizinhos, graus, BFS,
+    DFS e componentes operam direto sobre as linhas compactadas, com
+    operações bit a bit e popcount; o conjunto de visitados também é um bitset.
+    """
+    FORMATO = "bits"
+
+    @staticmethod
+    def _alocar(n: int):
+        return np.zeros((n + 1, (n + 8) // 8), dtype=np.uint8)
+
+    @staticmethod
+    def _preencher(matriz, origem: np.ndarray, destino: np.ndarray):
+        bits = np.left_shift(1, 7 - (destino & 7)).astype(np.uint8)
+        np.bitwise_or.at(matriz, (origem, destino >> 3), bits)
+        bits = np.left_shift(1, 7 - (origem & 7)).astype(np.uint8)
+        np.bitwise_or.at(matriz, (destino, origem >> 3), bits)
+
+    def tem_aresta(self, u: int, v: int) -> bool:
+        return bool(self.adj[u, v >> 3] & (0x80 >> (v & 7)))
+
+    def _inserir(self, u: int, v: int):
+        self.adj[u, v >> 3] |= 0x80 >> (v & 7)
+        self.adj[v, u >> 3] |= 0x80 >> (u & 7)
+
+    def linha(self, u: int) -> np.ndarray:
+        return np.unpackbits(self.adj[u], count=self.n + 1)
+
+    def vizinhos(self, u: int) -> np.ndarray:
+        return _indices_bits(self.adj[u])
+
+    def graus(self) -> np.ndarray:
+        return np.sum(_popcount(self.adj), axis=1, dtype=np.int64)
+
+    def _nova_mascara(self):
+        return np.zeros(self.adj.shape[1], dtype=np.uint8)
+
+    def _visitado(self, mascara, u: int) -> bool:
+        return bool(mascara[u >> 3] & (0x80 >> (u & 7)))
+
+    def _marcar(self, mascara, u: int):
+        mascara[u >> 3] |= 0x80 >> (u & 7)
+
+    def _expandir(self, u: int, mascara) -> np.ndarray:
+        novos = self.adj[u] & ~mascara
+        mascara |= novos
+        return _indices_bits(novos)
+
+    def _primeiro_nao_visitado(self, u: int, mascara, inicio: int = 0) -> int:
+        b0 = inicio >> 3
+        candidatos = self.adj[u, b0:] & ~mascara[b0:]
+        if len(candidatos) == 0:
+            return -1
+        # Descarta as colunas anteriores a `inicio` no primeiro byte
+        candidatos[0] &= 0xFF >> (inicio & 7)
+        nao_nulos = np.flatnonzero(candidatos)
+        if len(nao_nulos) == 0:
+            return -1
+        b = int(nao_nulos[0])
+        # Bit mais significativo do byte = menor índice de coluna
+        return (b0 + b) * 8 + 8 - int(candidatos[b]).bit_length()
+
+    def _passo_nivel(self, fronteira: np.ndarray, mascara):
+        novos_blocos, pais_blocos = [], []
+        passo = self._linhas_por_bloco()
+
+        for i in range(0, len(fronteira), passo):
+            bloco = fronteira[i:i + passo]
+            linhas = self.adj[bloco] & ~mascara
+            alcancados = np.bitwise_or.reduce(linhas, axis=0)
+            novos = _indices_bits(alcancados)
+            if len(novos) == 0:
+                continue
+            # Só as colunas dos vértices novos são extraídas para achar o pai
+            bits = (linhas[:, novos >> 3] & (0x80 >> (novos & 7)).astype(np.uint8)) != 0
+            quem = bits.argmax(axis=0)
+            ordem = np.lexsort((novos, quem))
+            novos_blocos.append(novos[ordem])
+            pais_blocos.append(bloco[quem[ordem]])
+            mascara |= alcancados
+
+        return _concatenar(novos_blocos), _concatenar(pais_blocos)
+
+    def _soma_graus(self, vertices: np.ndarray) -> int:
+        passo = self._linhas_por_bloco()
+        return sum(int(_popcount(self.adj[vertices[i:i + passo]]).sum(dtype=np.int64))
+                   for i in range(0, len(vertices), passo))
+
+
+class MatrizBlocos:
+    """
+    Matriz esparsa em blocos: a matriz (n x n) é dividida em blocos densos
+    de tamanho B x B (uint8), e só os blocos que contêm alguma aresta são
+    alocados. Mantém a semântica de consulta m[u, v] em O(1) (um acesso a
+    dicionário) e m[u] devolve a linha densa, como em um np.ndarray.
+    """
+
+    def __init__(self, n: int, tamanho_bloco: int = 16):
+
+        self.n = n
+        self.B = tamanho_bloco
+        self.nb = (n + tamanho_bloco - 1) // tamanho_bloco
+        self.blocos = np.zeros((0, tamanho_bloco, tamanho_bloco), dtype=np.uint8)
+        self.num_blocos = 0
+        # chave (bi * nb + bj) -> posição do bloco em self.blocos
+        self.posicao = {}
+        # linha de blocos bi -> (colunas de bloco ordenadas, posições correspondentes)
+        self.linhas = {}
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def nbytes(self):
+        return self.blocos[:self.num_blocos].nbytes
+
+    def _reservar(self, quantidade: int):
+        """Garante espaço para mais `quantidade` blocos (crescimento geométrico)."""
+        necessario = self.num_blocos + quantidade
+        if necessario > len(self.blocos):
+            novos = np.zeros((max(necessario, 2 * len(self.blocos)), self.B, self.B), dtype=np.uint8)
+            novos[:self.num_blocos] = self.blocos[:self.num_blocos]
+            self.blocos = novos
+
+    def _bloco(self, bi: int, bj: int, criar: bool = False):
+        chave = bi * self.nb + bj
+        p = self.posicao.get(chave)
+        if p is None and criar:
+            self._reservar(1)
+            p = self.num_blocos
+            self.num_blocos += 1
+            self.posicao[chave] = p
+
+            colunas, posicoes = self.linhas.get(bi, (np.empty(0, np.int64), np.empty(0, np.int64)))
+            i = np.searchsorted(colunas, bj)
+            self.linhas[bi] = (np.insert(colunas, i, bj), np.insert(posicoes, i, p))
+        return p
+
+    def __getitem__(self, chave):
+        if isinstance(chave, tuple):
+            u, v = chave
+            p = self._bloco(u // self.B, v // self.B)
+            return np.uint8(0) if p is None else self.blocos[p, u % self.B, v % self.B]
+
+        linha = np.zeros(self.n, dtype=np.uint8)
+        linha[self.vizinhos(chave)] = 1
+        return linha
+
+    def __setitem__(self, chave, valor):
+        u, v = chave
+        p = self._bloco(u // self.B, v // self.B, criar=bool(valor))
+        if p is not None:
+            self.blocos[p, u % self.B, v % self.B] = valor
+
+    def preencher(self, linhas: np.ndarray, colunas: np.ndarray):
+        """Marca as células (linhas[i], colunas[i]) alocando os blocos de uma vez."""
+        chaves = (linhas // self.B) * self.nb + colunas // self.B
+        unicas, inversa = np.unique(chaves, return_inverse=True)
+
+        posicoes = np.array([self.posicao.get(c, -1) for c in unicas.tolist()], dtype=np.int64)
+        faltam = posicoes < 0
+        novas = unicas[faltam]
+
+        if len(novas):
+            self._reservar(len(novas))
+            posicoes[faltam] = np.arange(self.num_blocos, self.num_blocos + len(novas))
+            self.num_blocos += len(novas)
+            self.posicao.update(zip(novas.tolist(), posicoes[faltam].tolist()))
+
+            # As chaves já vêm ordenadas: agrupa por linha de blocos e mescla com o que existia
+            bi = novas // self.nb
+            bj = novas % self.nb
+            inicios = np.flatnonzero(np.r_[True, np.diff(bi) != 0])
+            for linha, col, pos in zip(bi[inicios].tolist(), np.split(bj, inicios[1:]), np.split(posicoes[faltam], inicios[1:])):
+                if linha in self.linhas:
+                    col_antigas, pos_antigas = self.linhas[linha]
+                    col = np.concatenate([col_antigas, col])
+                    pos = np.concatenate([pos_antigas, pos])
+                    ordem = np.argsort(col, kind="stable")
+                    col, pos = col[ordem], pos[ordem]
+                self.linhas[linha] = (col, pos)
+
+        self.blocos[posicoes[inversa], linhas % self.B, colunas % self.B] = 1
+
+    def vizinhos(self, u: int) -> np.ndarray:
+        """Colunas (crescentes) não nulas da linha u, varrendo só os blocos alocados."""
+        colunas, posicoes = self.linhas.get(u // self.B, (None, None))
+        if colunas is None:
+            return np.empty(0, dtype=np.int64)
+        i, j = np.nonzero(self.blocos[posicoes, u % self.B])
+        return colunas[i] * self.B + j
+
+    def primeiro_nao_visitado(self, u: int, mascara: np.ndarray, inicio: int = 0) -> int:
+        """
+        Menor coluna v >= inicio não nula da linha u com mascara[v] falso, ou
+        -1. Varre os blocos alocados da linha a partir do bloco de `inicio`,
+        um por vez, parando no primeiro que tiver um candidato.
+        """
+        colunas, posicoes = self.linhas.get(u // self.B, (None, None))
+        if colunas is None:
+            return -1
+        r = u % self.B
+        for i in range(int(colunas.searchsorted(inicio // self.B)), len(colunas)):
+            base = int(colunas[i]) * self.B
+            fatia = mascara[base:base + self.B]
+            candidatos = (self.blocos[posicoes[i], r, :len(fatia)] != 0) & ~fatia
+            if base < inicio:
+                candidatos[:inicio - base] = False
+            j = int(candidatos.argmax())
+            if candidatos[j]:
+                return base + j
+        return -1
+
+    def graus(self) -> np.ndarray:
+        graus = np.zeros(self.nb * self.B, dtype=np.int64)
+        for bi, (_, posicoes) in self.linhas.items():
+            graus[bi * self.B:(bi + 1) * self.B] += self.blocos[posicoes].sum(axis=(0, 2), dtype=np.int64)
+        return graus[:self.n]
+
+
+class Grafo_Matriz_Blocos(Grafo_Matriz):
+    """
+    Matriz de adjacências esparsa em blocos (ver MatrizBlocos): só os blocos
+    B x B com arestas ocupam memória. adj[u, v] continua valendo, e a
+    varredura de linha em BFS, DFS e componentes percorre apenas os blocos
+    alocados da linha.
+    """
+    FORMATO = "blocos"
+
+    @staticmethod
+    def _alocar(n: int):
+        return MatrizBlocos(n + 1)
+
+    @staticmethod
+    def _preencher(matriz, origem: np.ndarray, destino: np.ndarray):
+        matriz.preencher(np.concatenate([origem, destino]), np.concatenate([destino, origem]))
+
+    def vizinhos(self, u: int) -> np.ndarray:
+        return self.adj.vizinhos(u)
+
+    def graus(self) -> np.ndarray:
+        return self.adj.graus()
+
+    def _expandir(self, u: int, mascara) -> np.ndarray:
+        vizinhos = self.adj.vizinhos(u)
+        novos = vizinhos[~mascara[vizinhos]]
+        mascara[novos] = True
+        return novos
+
+    def _primeiro_nao_visitado(self, u: int, mascara, inicio: int = 0) -> int:
+        return self.adj.primeiro_nao_visitado(u, mascara, inicio)
+
+    def _passo_nivel(self, fronteira: np.ndarray, mascara):
+        # Linhas esparsas: concatena só os vizinhos da fronteira (blocos alocados)
+        listas = [self.adj.vizinhos(u) for u in fronteira.tolist()]
+        graus = np.fromiter(map(len, listas), dtype=np.int64, count=len(listas))
+        vizinhos = _concatenar(listas)
+        origens = np.repeat(fronteira, graus)
+
+        nao_visitados = ~mascara[vizinhos]
+        vizinhos = vizinhos[nao_visitados]
+        origens = origens[nao_visitados]
+
+        _, primeiras = np.unique(vizinhos, return_index=True)
+        primeiras.sort()
+        novos = vizinhos[primeiras]
+        mascara[novos] = True
+        return novos, origens[primeiras]
+
+    def _soma_graus(self, vertices: np.ndarray) -> int:
+        return sum(len(self.adj.vizinhos(u)) for u in vertices.tolist())
+
+
+# Formatos de armazenamento aceitos por from_file / criar_matriz_adjacencias
+FORMATOS = {
+    "densa": Grafo_Matriz,
+    "bits": Grafo_Matriz_Bits,
+    "blocos": Grafo_Matriz_Blocos,
+}
+
+
 if __name__ == "__main__":
     if len(sys.argv) != 2:
         print("Uso correto:")
@@ -0,0 +1,176 @@
+import os
+import numpy as np
+
+# Tamanho (em bytes) de cada bloco lido do arquivo de arestas
+TAMANHO_BLOCO = 16 * 1024 * 1024
+
+_NOVA_LINHA = ord("\n")
+_COMENTARIO = ord("#")
+
+
+def iterar_blocos(f, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Lê o arquivo binário em blocos que sempre terminam em fim de linha."""
+    restante = os.fstat(f.fileno()).st_size - f.tell()
+    resto = b""
+    while True:
+        # Nunca pede mais do que o que falta ler: f.read(n) reserva n bytes
+        bloco = f.read(max(0, min(tamanho_bloco, restante)))
+        restante -= len(bloco)
+        if not bloco:
+            break
+        bloco = resto + bloco
+        corte = bloco.rfind(b"\n") + 1
+        if corte == 0:
+            resto = bloco
+            continue
+        resto = bloco[corte:]
+        yield bloco[:corte]
+
+    if resto.strip():
+        yield resto + b"\n"
+
+
+def converter_bloco(dados: bytes):
+    """
+    Converte um bloco de linhas "u v" em um array (k, 2) de int64.
+
+    A validação é vetorizada sobre os bytes do bloco: linhas vazias e
+    comentários (#) são ignorados; linhas que não têm exatamente dois inteiros
+    não negativos são descartadas e contadas.
+
+    :return: (pares, numero_de_linhas_invalidas)
+    """
+    buf = np.frombuffer(dados, dtype=np.uint8)
+    nova_linha = buf == _NOVA_LINHA
+    espaco = nova_linha | (buf == 32) | (buf == 9) | (buf == 13)
+
+    # Índice da linha de cada byte (o '\n' pertence à linha que ele encerra)
+    linha = np.cumsum(nova_linha) - nova_linha
+    num_linhas = int(np.count_nonzero(nova_linha))
+
+    inicio_token = ~espaco
+    inicio_token[1:] &= espaco[:-1]
+    linha_token = linha[inicio_token]
+    tokens_por_linha = np.bincount(linha_token, minlength=num_linhas)
+
+    # Linhas cujo primeiro token começa com '#' são comentários
+    comentario = np.zeros(num_linhas, dtype=bool)
+    novo = np.ones(len(linha_token), dtype=bool)
+    novo[1:] = linha_token[1:] != linha_token[:-1]
+    primeiros = np.flatnonzero(inicio_token)[novo]
+    comentario[linha[primeiros[buf[primeiros] == _COMENTARIO]]] = True
+
+    nao_digito = ~espaco & ((buf < 48) | (buf > 57))
+    com_lixo = np.bincount(linha[nao_digito], minlength=num_linhas) > 0
+
+    validas = (tokens_por_linha == 2) & ~com_lixo
+    invalidas = int(np.count_nonzero((tokens_por_linha > 0) & ~validas & ~comentario))
+
+    if not validas.all():
+        buf = buf[validas[linha]]
+        dados = buf.tobytes()
+
+    if len(buf) == 0:
+        return np.empty((0, 2), dtype=np.int64), invalidas
+
+    valores = np.fromstring(dados, dtype=np.int64, sep=" ")
+    return valores.reshape(-1, 2), invalidas
+
+
+def _ler_cabecalho(f):
+    """Devolve N da primeira linha, ou None se ela já for uma aresta."""
+    while True:
+        inicio = f.tell()
+        linha = f.readline()
+        if not linha:
+            return None
+        partes = linha.split()
+        if partes and not partes[0].startswith(b"#"):
+            break
+
+    if len(partes) == 1:
+        return int(partes[0])
+
+    # Sem cabeçalho: N será inferido a partir das arestas
+    f.seek(inicio)
+    return None
+
+
+def arestas_para_csr(num_vertices: int, origem: np.ndarray, destino: np.ndarray):
+    """
+    Monta os arrays CSR (offsets, indices) de um grafo não direcionado.
+
+    Cada aresta (u, v) gera as entradas u->v e v->u; a ordenação estável
+    pelo vértice de origem preserva a ordem em que as arestas apareceram.
+    """
+    m = len(origem)
+    tipo = np.int32 if 2 * m < np.iinfo(np.int32).max else np.int64
+
+    fonte = np.empty(2 * m, dtype=np.int32)
+    alvo = np.empty(2 * m, dtype=np.int32)
+    fonte[0::2] = origem
+    fonte[1::2] = destino
+    alvo[0::2] = destino
+    alvo[1::2] = origem
+
+    ordem = np.argsort(fonte, kind="stable")
+    indices = alvo[ordem]
+
+    offsets = np.zeros(num_vertices + 1, dtype=tipo)
+    np.cumsum(np.bincount(fonte, minlength=num_vertices), out=offsets[1:])
+
+    return offsets, indices
+
+
+def ler_arestas(arquivo: str, tamanho_bloco: int = TAMANHO_BLOCO):
+    """
+    Lê um arquivo de arestas (primeira linha N, depois pares "u v" 1-based).
+
+    O arquivo é convertido em blocos para arrays NumPy; arestas fora do
+    intervalo [1, N] e repetidas (em qualquer sentido) são descartadas com
+    np.unique, mantendo a primeira ocorrência e a ordem do arquivo. Se a
+    primeira linha não contiver N, ele é inferido como o maior vértice lido.
+
+    :return: (n, origem, destino, descartes) com origem/destino 0-based em
+             int32 e descartes = {"fora_intervalo", "duplicadas", "invalidas"}.
+    """
+    limite = np.iinfo(np.int32).max
+    blocos = []
+    invalidas = 0
+    fora_intervalo = 0
+
+    with open(arquivo, "rb") as f:
+        n = _ler_cabecalho(f)
+
+        for dados in iterar_blocos(f, tamanho_bloco):
+            pares, inv = converter_bloco(dados)
+            invalidas += inv
+
+            maximo = n if n is not None else limite
+            dentro = ((pares >= 1) & (pares <= maximo)).all(axis=1)
+            fora_intervalo += len(pares) - int(np.count_nonzero(dentro))
+            blocos.append((pares[dentro] - 1).astype(np.int32))
+
+    arestas = np.concatenate(blocos) if blocos else np.empty((0, 2), dtype=np.int32)
+    if n is None:
+        n = int(arestas.max()) + 1 if len(arestas) else 0
+
+    origem = arestas[:, 0]
+    destino = arestas[:, 1]
+
+    # Remove arestas repetidas (u, v) / (v, u), mantendo a primeira ocorrência
+    chaves = np.minimum(origem, destino).astype(np.int64) * n + np.maximum(origem, destino)
+    _, primeiras = np.unique(chaves, return_index=True)
+    primeiras.sort()
+
+    descartes = {
+        "fora_intervalo": fora_intervalo,
+        "duplicadas": len(chaves) - len(primeiras),
+        "invalidas": invalidas,
+    }
+
+    if fora_intervalo or invalidas:
+        print(f"Aviso: {fora_intervalo} aresta(s) fora do intervalo [1, {n}] e "
+              f"{invalidas} linha(s) inválida(s) ignorada(s).")
+
+    return n, origem[primeiras].copy(), destino[primeiras].copy(), descartes
@@ -1,28 +1,151 @@
 from grafos_lib import Lista_Grafo
 from grafos_lib_matrix import Grafo_Matriz
+from consultas import BACKENDS, ErroConsulta, carregar_grafo, interno, responder_lote
+from cache_bfs import LIMITE_PADRAO
+from triangulos import salvar_agrupamento
+from reordenacao import CRITERIOS
+import argparse
+import os
 import sys
-import io
-import contextlib
+import time
 
-def main():
+# Operações do modo não interativo (uma por execução, com saída em arquivo)
+OPERACOES_ARQUIVO = ("resumo", "bfs", "dfs", "componentes", "agrupamento", "representacao")
 
-    if len(sys.argv) != 2:
-        print("Uso correto:")
-        print("python3 main.py arquivo_entrada.txt")
-        sys.exit(1)
-    
-    texto_entrada = sys.argv[1]
+SAIDAS_PADRAO = {
+    "resumo": "resumo_grafo_{backend}.txt",
+    "bfs": "busca_largura_{backend}.txt",
+    "dfs": "busca_profundidade_{backend}.txt",
+    "componentes": "componentes_conexos_{backend}.txt",
+    "agrupamento": "agrupamento_{backend}.txt",
+    "representacao": "representacao_grafo_{backend}.txt",
+}
+
+
+def _argumentos(argv):
+    parser = argparse.ArgumentParser(
+        description="Análise de grafos. Sem --operacao/--lote, abre o menu interativo.",
+        epilog="Exemplos:\n"
+               "  python3 main.py grafo.txt --backend csr --operacao bfs --origem 1 10 --saida bfs.txt\n"
+               "  python3 main.py grafo.txt --backend csr --lote consultas.txt --saida respostas.jsonl\n"
+               "  echo 'distancia 1 5' | python3 main.py grafo.txt --lote -",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivo", help="arquivo de arestas (primeira linha N, depois 'u v')")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="lista")
+    parser.add_argument("--operacao", choices=OPERACOES_ARQUIVO,
+                        help="executa uma operação e grava o resultado (formato dos salvar_*)")
+    parser.add_argument("--origem", type=int, nargs="+", default=[1],
+                        help="vértice(s) de origem de bfs/dfs, numeração do arquivo (1-based)")
+    parser.add_argument("--saida", help="arquivo de saída; com várias origens recebe o sufixo _<origem>")
+    parser.add_argument("--formato", choices=["texto", "npy"], default="texto")
+    parser.add_argument("--lote", metavar="CONSULTAS",
+                        help="arquivo com uma consulta por linha ('-' = stdin); respostas em JSON por linha")
+    parser.add_argument("--cache-bfs", type=float, default=LIMITE_PADRAO / 1024**2, metavar="MB",
+                        help="orçamento do cache de BFS no modo lote (0 desativa)")
+    parser.add_argument("--sem-cache", action="store_true", help="não usa o cache binário do grafo")
+    parser.add_argument("--reordenar", choices=CRITERIOS,
+                        help="renumera os vértices na carga para localidade de memória (saídas nos ids do arquivo)")
+    return parser.parse_args(argv)
+
+
+def _caminho_saida(args, origem=None):
+    saida = args.saida or SAIDAS_PADRAO[args.operacao].format(backend=args.backend)
+    if origem is not None and len(args.origem) > 1:
+        base, ext = os.path.splitext(saida)
+        saida = f"{base}_{origem}{ext}"
+    return saida
+
+
+def _caminhos(caminhos) -> str:
+    """Arquivos gravados por um salvar_* (com formato="npy", um por coluna)."""
+    return ", ".join(f"'{c}'" for c in caminhos)
+
+
+def executar_operacao(grafo, args):
+    """Modo não interativo: uma operação, resultado gravado pelos salvar_* do backend."""
+    if args.operacao == "resumo":
+        salvar = getattr(grafo, "salvar_resumo", None) or grafo.save_resumo
+        gravados = salvar(_caminho_saida(args), formato=args.formato)
+        print(f"Resumo salvo em {_caminhos(gravados)}")
+
+    elif args.operacao in ("bfs", "dfs"):
+        salvar = grafo.salvar_busca_largura if args.operacao == "bfs" else grafo.salvar_busca_profundidade
+        for origem in args.origem:
+            gravados = salvar(interno(grafo, origem), _caminho_saida(args, origem), formato=args.formato)
+            print(f"Busca a partir de {origem} salva em {_caminhos(gravados)}")
+
+    elif args.operacao == "componentes":
+        gravados = grafo.salvar_componentes(_caminho_saida(args), formato=args.formato)
+        print(f"Componentes Conexos salvos em {_caminhos(gravados)}")
+
+    elif args.operacao == "agrupamento":
+        gravados = salvar_agrupamento(grafo, _caminho_saida(args), formato=args.formato)
+        print(f"Triângulos e agrupamento salvos em {_caminhos(gravados)}")
+
+    elif args.operacao == "representacao":
+        if not isinstance(grafo, Grafo_Matriz):
+            raise SystemExit("A representação só existe para os backends de matriz.")
+        gravados = grafo.salvar_representacao_matriz(_caminho_saida(args))
+        print(f"Representação salva em {_caminhos(gravados)}")
+
+
+def executar_lote(grafo, args):
+    """Modo lote: responde todas as consultas com o grafo carregado uma única vez."""
+    if args.cache_bfs > 0:
+        grafo.ativar_cache_bfs(int(args.cache_bfs * 1024**2))
+
+    entrada = sys.stdin if args.lote == "-" else open(args.lote, encoding="utf-8")
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida else sys.stdout
+    t0 = time.perf_counter()
+    try:
+        respondidas, com_erro = responder_lote(grafo, entrada, saida)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+        else:
+            saida.flush()
+
+    print(f"{respondidas} consulta(s) respondida(s) ({com_erro} com erro) em "
+          f"{time.perf_counter() - t0:.4f} s", file=sys.stderr)
+    return 1 if com_erro else 0
+
+
+def main(argv=None):
+    args = _argumentos(argv)
+
+    if args.operacao is None and args.lote is None:
+        return interativo(args.arquivo)
+    if args.operacao and args.lote:
+        raise SystemExit("Use --operacao ou --lote, não os dois.")
+
+    # No modo lote as respostas podem ir para stdout: o progresso da leitura vai para stderr
+    t0 = time.perf_counter()
+    grafo = carregar_grafo(args.arquivo, args.backend, usar_cache=not args.sem_cache,
+                           saida_log=sys.stderr if args.lote else None, reordenar=args.reordenar)
+    print(f"Grafo carregado ({args.backend}) em {time.perf_counter() - t0:.4f} s",
+          file=sys.stderr if args.lote else sys.stdout)
+
+    if args.lote:
+        return executar_lote(grafo, args)
+    try:
+        executar_operacao(grafo, args)
+    except ErroConsulta as e:
+        raise SystemExit(f"Erro: {e}")
+    return 0
+
+
+def interativo(entrada: str):
 
     print("1 - Usar Lista de Adjacência \n"
           "2 - Usar Matriz de Adjacência")
 
     escolha = input("Escolha a opção (1 ou 2): ").strip()
 
-    entrada = sys.argv[1]
-
     if escolha == "1":
         print("\nLista de adjacência escolhida")
-        grafo_l = Lista_Grafo.ler_de_arquivo(entrada)
+        grafo_l = Lista_Grafo.ler_de_arquivo(entrada, usar_cache=True)
         print("Grafo carregado com sucesso!\n")
         print("Qual função deseja chamar?\n")
         funcao = int(input("1 - Resumo do grafo \n"
@@ -51,7 +174,7 @@ def main():
     elif escolha == "2":
         print("\nMatriz de Adjacência escolhida")
         
-        grafo = Grafo_Matriz.from_file(entrada)
+        grafo = Grafo_Matriz.from_file(entrada, usar_cache=True)
         print("Grafo carregado com sucesso!")
         saida = "resumo_grafo_matriz.txt"
         grafo.save_resumo(saida)
@@ -65,14 +188,9 @@ def main():
 
         if funcao == 1:
             saida = "representacao_grafo_matriz.txt"
-            # Captura a impressão da representação e salva em arquivo
-            buf = io.StringIO()
-            with contextlib.redirect_stdout(buf):
-                grafo.representacao_matriz_adjacencias()
-            conteudo = buf.getvalue()
+            # Grava a representação direto no arquivo (mesma saída do print)
             try:
-                with open(saida, 'w') as f:
-                    f.write(conteudo)
+                grafo.salvar_representacao_matriz(saida)
                 print(f"Representação salva em '{saida}'")
             except Exception as e:
                 print(f"Erro ao salvar representação em '{saida}': {e}")
@@ -96,4 +214,4 @@ def main():
     
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,343 @@
+"""
+Oráculo de distâncias por marcos (landmarks).
+
+Uma BFS a partir de cada um de k marcos gera uma tabela n x k de distâncias
+(uint8 sempre que cabem, uma linha contígua por vértice). Pela desigualdade
+triangular, para qualquer par (u, v):
+
+    max_l |d(l,u) - d(l,v)|  <=  d(u,v)  <=  min_l d(l,u) + d(l,v)
+
+então `limites(u, v)` responde em O(k) lendo duas linhas da tabela, e
+`limites_em_lote` faz o mesmo para milhões de pares com NumPy. O índice
+pode ser gravado e depois mapeado em memória (cache_grafo.salvar_arrays /
+mapear_arrays), e o limite inferior serve de heurística admissível para a
+busca exata `caminho_exato` (A* com marcos, "ALT").
+
+Os vértices seguem a numeração do grafo usado na construção (0-based na
+Lista_Grafo/Grafo_CSR, 1-based na Grafo_Matriz).
+
+Exemplo:
+    python3 oraculo_distancias.py construir as_graph.txt as_graph.marcos --marcos 16 --estrategia distante
+    python3 oraculo_distancias.py consultar as_graph.marcos pares.txt --saida distancias.txt
+"""
+import argparse
+import heapq
+import sys
+import time
+import numpy as np
+
+from cache_grafo import mapear_arrays, salvar_arrays
+from caminho_minimo import reconstruir_caminho
+from diametro import _graus
+from escrita import abrir_saida, escrever_tabela
+from grafos_lib import Lista_Grafo
+from grafos_lib_csr import Grafo_CSR
+from grafos_lib_matrix import Grafo_Matriz
+from leitura_arestas import converter_bloco, iterar_blocos
+
+MAGICO = int.from_bytes(b"MARCOSDI", "little", signed=True)
+VERSAO = 1
+
+ESTRATEGIAS = ("grau", "aleatorio", "distante")
+
+# Fontes por MS-BFS na construção pelo CSR (uma palavra de 64 bits por vértice)
+FONTES_POR_LOTE = 64
+
+
+def _base(grafo) -> int:
+    return 1 if isinstance(grafo, Grafo_Matriz) else 0
+
+
+def _distancias_de(grafo, fonte: int) -> np.ndarray:
+    """Distâncias (-1 = inacessível) de `fonte` a todos os vértices, na ordem do arquivo."""
+    if isinstance(grafo, Grafo_CSR):
+        nivel = grafo.busca_largura(fonte, modo="niveis")[1]
+    else:
+        nivel = grafo.busca_largura(fonte)[1]
+    nivel = np.asarray(nivel, dtype=np.int64)
+    return nivel[1:] if isinstance(grafo, Grafo_Matriz) else nivel
+
+
+def _vizinhos(grafo, x: int):
+    vizinhos = grafo.vizinhos(x)
+    return vizinhos if isinstance(vizinhos, list) else vizinhos.tolist()
+
+
+class OraculoDistancias:
+    """
+    Tabela de distâncias aos marcos: `distancias[i, j]` é a distância do
+    vértice i (ordem do arquivo) ao marco j, ou `SEM_CAMINHO` (o maior valor
+    do tipo) se o marco não alcança o vértice.
+    """
+
+    def __init__(self, marcos: np.ndarray, distancias: np.ndarray, base: int = 0):
+        self.marcos = marcos
+        self.distancias = distancias
+        self.base = base
+        self.n, self.k = distancias.shape
+        self.SEM_CAMINHO = int(np.iinfo(distancias.dtype).max)
+
+    # --- Construção ---
+
+    @classmethod
+    def construir(cls, grafo, k: int = 16, estrategia: str = "distante", semente: int = None):
+        """
+        Escolhe k marcos e faz uma BFS a partir de cada um.
+
+        - "grau": os k vértices de maior grau (bons em grafos com hubs);
+        - "aleatorio": k vértices sorteados (com `semente`);
+        - "distante": farthest-first; começa pelo vértice de maior grau e
+          cada novo marco é o vértice mais distante dos já escolhidos
+          (vértices ainda não alcançados contam como infinitamente
+          distantes, então cada componente ganha um marco antes de qualquer
+          componente ganhar o segundo). Empates vão para o maior grau.
+
+        Com Lista_Grafo a construção é feita sobre uma cópia em CSR, e os
+        marcos de "grau"/"aleatorio" saem em MS-BFS de até 64 fontes por vez.
+        """
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia desconhecida: {estrategia} (use uma de {', '.join(ESTRATEGIAS)})")
+
+        base = _base(grafo)
+        graus = _graus(grafo)
+        if base:
+            graus = graus[1:]
+        n = len(graus)
+        k = min(k, n)
+        if isinstance(grafo, Lista_Grafo):
+            grafo = Grafo_CSR.de_lista(grafo)
+
+        if estrategia == "distante":
+            marcos, colunas = cls._escolher_distantes(grafo, graus, k)
+        else:
+            if estrategia == "grau":
+                marcos = np.argsort(-graus, kind="stable")[:k]
+            else:
+                marcos = np.sort(np.random.default_rng(semente).choice(n, size=k, replace=False))
+            colunas = cls._bfs_dos_marcos(grafo, marcos)
+
+        return cls._montar(marcos, colunas, base)
+
+    @staticmethod
+    def _bfs_dos_marcos(grafo, marcos):
+        if isinstance(grafo, Grafo_CSR):
+            colunas = []
+            for i in range(0, len(marcos), FONTES_POR_LOTE):
+                colunas.extend(grafo.distancias_multiplas(marcos[i:i + FONTES_POR_LOTE]))
+            return colunas
+        base = _base(grafo)
+        return [_distancias_de(grafo, int(m) + base) for m in marcos]
+
+    @staticmethod
+    def _escolher_distantes(grafo, graus, k: int):
+        n = len(graus)
+        base = _base(grafo)
+        infinito = n + 1
+        minimo = np.full(n, infinito, dtype=np.int64)
+        marcos, colunas = [], []
+
+        for _ in range(k):
+            # Maior distância mínima aos marcos; empate (inclusive entre os não alcançados) pelo grau
+            chave = minimo * (int(graus.max(initial=0)) + 1) + graus
+            chave[marcos] = -1
+            m = int(np.argmax(chave))
+            marcos.append(m)
+
+            dist = _distancias_de(grafo, m + base)
+            colunas.append(dist)
+            np.minimum(minimo, np.where(dist >= 0, dist, infinito), out=minimo)
+
+        return np.array(marcos, dtype=np.int64), colunas
+
+    @classmethod
+    def _montar(cls, marcos, colunas, base: int):
+        maior = max((int(np.max(c)) for c in colunas), default=0)
+        # O maior valor do tipo fica reservado para "sem caminho"
+        tipo = next(t for t in (np.uint8, np.uint16, np.uint32) if maior < np.iinfo(t).max)
+
+        sem_caminho = np.iinfo(tipo).max
+        n = len(colunas[0]) if colunas else 0
+        distancias = np.empty((n, len(colunas)), dtype=tipo)
+        for j, c in enumerate(colunas):
+            c = np.asarray(c)
+            distancias[:, j] = np.where(c >= 0, c, sem_caminho)
+        return cls(np.asarray(marcos, dtype=np.int64), distancias, base)
+
+    # --- Persistência ---
+
+    def salvar(self, caminho: str):
+        cabecalho = np.array([MAGICO, VERSAO, self.n, self.k, self.base], dtype=np.int64)
+        salvar_arrays(caminho, cabecalho, self.marcos, self.distancias)
+
+    @classmethod
+    def carregar(cls, caminho: str):
+        """Mapeia o índice em memória (np.memmap): só as linhas consultadas são lidas do disco."""
+        arrays = mapear_arrays(caminho)
+        if len(arrays) != 3 or len(arrays[0]) < 5 or arrays[0][0] != MAGICO:
+            raise ValueError(f"'{caminho}' não é um índice de marcos")
+        if arrays[0][1] != VERSAO:
+            raise ValueError(f"Versão do índice não suportada: {arrays[0][1]}")
+        cabecalho, marcos, distancias = arrays
+        return cls(marcos, distancias, int(cabecalho[4]))
+
+    # --- Consultas ---
+
+    def limites(self, u: int, v: int):
+        """
+        (inferior, superior) para d(u, v), em O(k).
+
+        (-1, -1): algum marco alcança só um dos dois (componentes diferentes);
+        superior = -1: nenhum marco alcança u e v (sem limite superior).
+        """
+        if u == v:
+            return 0, 0
+        du = self.distancias[u - self.base].astype(np.int64)
+        dv = self.distancias[v - self.base].astype(np.int64)
+        tem_u = du != self.SEM_CAMINHO
+        tem_v = dv != self.SEM_CAMINHO
+        if (tem_u != tem_v).any():
+            return -1, -1
+        if not tem_u.any():
+            return 1, -1
+        du, dv = du[tem_u], dv[tem_u]
+        return max(1, int(np.abs(du - dv).max())), int((du + dv).min())
+
+    def limites_em_lote(self, us, vs):
+        """
+        Versão vetorizada de `limites` para arrays de pares.
+
+        :return: (inferior, superior) como arrays int32, com as mesmas convenções.
+        """
+        us = np.asarray(us, dtype=np.int64) - self.base
+        vs = np.asarray(vs, dtype=np.int64) - self.base
+        du = self.distancias[us].astype(np.int32)
+        dv = self.distancias[vs].astype(np.int32)
+        tem_u = du != self.SEM_CAMINHO
+        tem_v = dv != self.SEM_CAMINHO
+        ambos = tem_u & tem_v
+
+        inferior = np.where(ambos, np.abs(du - dv), 0).max(axis=1, initial=0)
+        superior = np.where(ambos, du + dv, np.iinfo(np.int32).max).min(axis=1, initial=np.iinfo(np.int32).max)
+        inferior = np.maximum(inferior, 1)
+        superior[~ambos.any(axis=1)] = -1
+
+        separados = (tem_u != tem_v).any(axis=1)
+        inferior[separados] = -1
+        superior[separados] = -1
+        iguais = us == vs
+        inferior[iguais] = 0
+        superior[iguais] = 0
+        return inferior, superior
+
+    def _heuristica(self, vertices, destino_linha) -> np.ndarray:
+        """Limite inferior de d(x, destino) para cada x (0 onde não há marco em comum)."""
+        dx = self.distancias[np.asarray(vertices, dtype=np.int64) - self.base].astype(np.int32)
+        dt = destino_linha
+        validos = (dx != self.SEM_CAMINHO) & (dt != self.SEM_CAMINHO)
+        return np.where(validos, np.abs(dx - dt), 0).max(axis=1, initial=0)
+
+    def caminho_exato(self, grafo, u: int, v: int):
+        """
+        Menor caminho exato por A* com a heurística dos marcos (ALT): a busca
+        é guiada na direção de v e expande bem menos vértices que uma BFS.
+        Se os limites já coincidem em componentes diferentes, não há busca.
+
+        :return: (distancia, caminho) como em caminho_minimo, ou (-1, []).
+        """
+        if u == v:
+            return 0, [u]
+        inferior, _ = self.limites(u, v)
+        if inferior == -1:
+            return -1, []
+
+        destino = self.distancias[v - self.base].astype(np.int32)
+        custo = {u: 0}
+        pai = {u: -1}
+        heap = [(int(self._heuristica([u], destino)[0]), 0, u)]
+
+        while heap:
+            _, g, x = heapq.heappop(heap)
+            if x == v:
+                caminho = reconstruir_caminho(pai, {v: -1}, v)
+                return len(caminho) - 1, caminho
+            if g > custo[x]:
+                continue
+
+            novos = [y for y in _vizinhos(grafo, x) if g + 1 < custo.get(y, g + 2)]
+            if not novos:
+                continue
+            h = self._heuristica(novos, destino).tolist()
+            for y, hy in zip(novos, h):
+                custo[y] = g + 1
+                pai[y] = x
+                heapq.heappush(heap, (g + 1 + hy, g + 1, y))
+
+        return -1, []
+
+
+def _consultar_arquivo(oraculo: OraculoDistancias, arquivo: str, saida: str):
+    """
+    Pares "u v" (1-based, um por linha) -> linhas "u v inferior superior".
+    Como na leitura de arestas, pares fora de [1, n] e linhas inválidas são
+    ignorados e contados.
+
+    :return: (pares respondidos, {"fora_intervalo", "invalidas"})
+    """
+    total = 0
+    descartes = {"fora_intervalo": 0, "invalidas": 0}
+    with open(arquivo, "rb") as entrada, abrir_saida(saida) as f:
+        for dados in iterar_blocos(entrada):
+            pares, invalidas = converter_bloco(dados)
+            descartes["invalidas"] += invalidas
+            dentro = ((pares >= 1) & (pares <= oraculo.n)).all(axis=1)
+            descartes["fora_intervalo"] += len(pares) - int(np.count_nonzero(dentro))
+            pares = pares[dentro]
+            if len(pares) == 0:
+                continue
+            internos = pares - 1 + oraculo.base
+            inferior, superior = oraculo.limites_em_lote(internos[:, 0], internos[:, 1])
+            escrever_tabela(f, "%d %d %d %d\n", pares[:, 0], pares[:, 1], inferior, superior)
+            total += len(pares)
+    return total, descartes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Oráculo de distâncias por marcos.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    co = sub.add_parser("construir", help="escolhe os marcos, faz as BFS e grava o índice")
+    co.add_argument("arquivo", help="arquivo de arestas")
+    co.add_argument("indice", help="arquivo do índice a gravar")
+    co.add_argument("--marcos", type=int, default=16)
+    co.add_argument("--estrategia", choices=ESTRATEGIAS, default="distante")
+    co.add_argument("--semente", type=int, default=None)
+    co.add_argument("--sem-cache", action="store_true", help="não usa o cache binário do grafo")
+
+    cs = sub.add_parser("consultar", help="limites de distância para os pares 'u v' (1-based) de um arquivo")
+    cs.add_argument("indice")
+    cs.add_argument("pares")
+    cs.add_argument("--saida", default="distancias_marcos.txt")
+
+    args = parser.parse_args(argv)
+    t0 = time.perf_counter()
+
+    if args.comando == "construir":
+        grafo = Grafo_CSR.ler_de_arquivo(args.arquivo, usar_cache=not args.sem_cache)
+        oraculo = OraculoDistancias.construir(grafo, args.marcos, args.estrategia, args.semente)
+        oraculo.salvar(args.indice)
+        print(f"Índice com {oraculo.k} marcos ({args.estrategia}) para {oraculo.n} vértices salvo em "
+              f"'{args.indice}' ({oraculo.distancias.nbytes / 1024**2:.2f} MB) em {time.perf_counter() - t0:.2f} s")
+    else:
+        oraculo = OraculoDistancias.carregar(args.indice)
+        total, descartes = _consultar_arquivo(oraculo, args.pares, args.saida)
+        segundos = time.perf_counter() - t0
+        if descartes["fora_intervalo"] or descartes["invalidas"]:
+            print(f"Aviso: {descartes['fora_intervalo']} par(es) fora do intervalo [1, {oraculo.n}] e "
+                  f"{descartes['invalidas']} linha(s) inválida(s) ignorado(s).")
+        print(f"{total} pares respondidos em {segundos:.2f} s ({total / max(segundos, 1e-9):.0f} pares/s); "
+              f"saída em '{args.saida}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
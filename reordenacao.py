@@ -0,0 +1,300 @@
+"""
+Renumeração dos vértices na carga, para localidade de memória.
+
+Os ids do arquivo espalham os vizinhos de um vértice pela memória; com uma
+renumeração em que vértices próximos no grafo ficam próximos na numeração,
+o gather do CSR, as listas da Lista_Grafo e as linhas da matriz passam a
+ser lidos em regiões contíguas. Critérios (`CRITERIOS`):
+
+- "grau": grau decrescente (os hubs, tocados por quase toda busca, ficam juntos);
+- "bfs": ordem de descoberta de uma BFS a partir do vértice de maior grau de
+  cada componente;
+- "rcm": Cuthill–McKee reverso: BFS a partir de um vértice pseudo-periférico
+  (grau mínimo no último nível de uma BFS a partir do vértice de grau mínimo),
+  visitando os vizinhos por grau crescente, e ordem final invertida. Reduz a
+  banda da matriz (menos blocos na matriz em blocos).
+
+Em "bfs" e "rcm", cada componente ocupa um intervalo contíguo de ids.
+
+A renumeração é transparente: o grafo carregado com reordenação é visto
+por `com_ids_originais`, cujos métodos públicos (os de `IDS_ORIGINAIS` de
+cada backend) recebem e devolvem vértices na numeração do arquivo;
+internamente tudo roda na nova. Sem reordenação, nada disso é instalado.
+"""
+import functools
+import inspect
+import numpy as np
+
+from uniao_busca import UniaoBusca
+
+CRITERIOS = ("grau", "bfs", "rcm")
+
+
+def inverter(ordem: np.ndarray) -> np.ndarray:
+    """Permutação inversa: inverter(ordem)[ordem[i]] == i."""
+    inversa = np.empty(len(ordem), dtype=np.int64)
+    inversa[ordem] = np.arange(len(ordem), dtype=np.int64)
+    return inversa
+
+
+def _rotulos_componentes(n: int, offsets: np.ndarray, indices: np.ndarray, graus: np.ndarray) -> np.ndarray:
+    """
+    Rótulo da componente de cada vértice. Uma BFS a partir do vértice de
+    maior grau rotula de uma vez a componente gigante (típica nos grafos
+    reais); só as arestas que sobram passam pela UniaoBusca.
+    """
+    rotulos = np.arange(n, dtype=np.int64)
+    if n == 0:
+        return rotulos
+    hub = int(np.argmax(graus))
+    _, nivel = _bfs_multipla(n, offsets, indices, [hub])
+    rotulos[nivel >= 0] = hub
+
+    origem = np.repeat(np.arange(n, dtype=np.int64), graus)
+    resto = nivel[origem] < 0
+    if resto.any():
+        uniao = UniaoBusca(n)
+        uniao.unir_arestas(origem[resto], indices[resto])
+        fora = np.flatnonzero(nivel < 0)
+        rotulos[fora] = uniao._raizes(fora)
+    return rotulos
+
+
+def _primeiro_por_grupo(grupos: np.ndarray, chave: np.ndarray, candidatos: np.ndarray = None) -> np.ndarray:
+    """Para cada grupo, o vértice de menor `chave` (empate: menor id) entre os candidatos."""
+    vertices = np.arange(len(grupos)) if candidatos is None else candidatos
+    ordem = np.lexsort((vertices, chave[vertices], grupos[vertices]))
+    vertices = vertices[ordem]
+    g = grupos[vertices]
+    primeiros = np.ones(len(vertices), dtype=bool)
+    primeiros[1:] = g[1:] != g[:-1]
+    return vertices[primeiros]
+
+
+def _bfs_multipla(n: int, offsets: np.ndarray, indices: np.ndarray, sementes: np.ndarray, graus=None):
+    """
+    BFS por níveis a partir de todas as `sementes` ao mesmo tempo (uma por
+    componente). Os vértices novos de cada nível saem na ordem do primeiro
+    pai na fronteira e, entre irmãos, por grau crescente (`graus`) ou na
+    ordem da lista de adjacência.
+
+    :return: (ordem de descoberta, nível de cada vértice)
+    """
+    visitado = np.zeros(n, dtype=bool)
+    nivel = np.full(n, -1, dtype=np.int64)
+    fronteira = np.asarray(sementes, dtype=np.int64)
+    visitado[fronteira] = True
+    nivel[fronteira] = 0
+    partes = [fronteira]
+    profundidade = 0
+
+    while len(fronteira):
+        inicios = offsets[fronteira].astype(np.int64)
+        quantos = offsets[fronteira + 1] - inicios
+        total = int(quantos.sum())
+        deslocamentos = np.cumsum(quantos) - quantos
+        vizinhos = indices[np.arange(total) - np.repeat(deslocamentos - inicios, quantos)].astype(np.int64)
+        pais = np.repeat(np.arange(len(fronteira)), quantos)
+
+        novos = ~visitado[vizinhos]
+        vizinhos, pais = vizinhos[novos], pais[novos]
+        if graus is not None:
+            ordem = np.lexsort((graus[vizinhos], pais))
+            vizinhos = vizinhos[ordem]
+        _, primeiras = np.unique(vizinhos, return_index=True)
+        primeiras.sort()
+        fronteira = vizinhos[primeiras]
+
+        profundidade += 1
+        visitado[fronteira] = True
+        nivel[fronteira] = profundidade
+        partes.append(fronteira)
+
+    return np.concatenate(partes), nivel
+
+
+def calcular_ordem(n: int, offsets: np.ndarray, indices: np.ndarray, criterio: str) -> np.ndarray:
+    """
+    Nova numeração de um grafo em CSR (0-based).
+
+    :return: `ordem`, com ordem[i] = vértice original que passa a ser o i.
+    """
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Critério de reordenação desconhecido: {criterio} (use um de {', '.join(CRITERIOS)})")
+
+    graus = np.diff(offsets).astype(np.int64)
+    if criterio == "grau":
+        return np.argsort(-graus, kind="stable")
+
+    rotulos = _rotulos_componentes(n, offsets, indices, graus)
+    if criterio == "bfs":
+        sementes = _primeiro_por_grupo(rotulos, -graus)
+        descoberta, _ = _bfs_multipla(n, offsets, indices, sementes)
+    else:
+        sementes = _primeiro_por_grupo(rotulos, graus)
+        _, nivel = _bfs_multipla(n, offsets, indices, sementes, graus)
+        # Vértice pseudo-periférico: grau mínimo no nível mais distante de cada componente
+        mais_distante = np.zeros(n, dtype=np.int64)
+        np.maximum.at(mais_distante, rotulos, nivel)
+        ultimos = np.flatnonzero(nivel == mais_distante[rotulos])
+        sementes = _primeiro_por_grupo(rotulos, graus, ultimos)
+        descoberta, _ = _bfs_multipla(n, offsets, indices, sementes, graus)
+
+    # As BFS das componentes avançam juntas; cada componente volta a ficar contígua
+    posicao_componente = np.empty(n, dtype=np.int64)
+    posicao_componente[rotulos[sementes]] = np.arange(len(sementes))
+    ordem = descoberta[np.argsort(posicao_componente[rotulos[descoberta]], kind="stable")]
+    return ordem[::-1].copy() if criterio == "rcm" else ordem
+
+
+def reordenar_csr(offsets: np.ndarray, indices: np.ndarray, ordem: np.ndarray):
+    """
+    Arrays CSR na nova numeração, com os vizinhos de cada vértice em ordem
+    crescente (o gather da fronteira lê `indices` da esquerda para a direita).
+    """
+    n = len(offsets) - 1
+    posicao = inverter(ordem)
+    graus = np.diff(offsets)[ordem]
+
+    novos_offsets = np.zeros(n + 1, dtype=offsets.dtype)
+    np.cumsum(graus, out=novos_offsets[1:])
+    total = int(novos_offsets[-1])
+    inicios = offsets[ordem].astype(np.int64)
+    antigos = indices[np.arange(total) - np.repeat(novos_offsets[:-1] - inicios, graus)]
+
+    chaves = np.repeat(np.arange(n, dtype=np.int64), graus) * n + posicao[antigos]
+    chaves.sort()
+    return novos_offsets, (chaves % max(n, 1)).astype(indices.dtype)
+
+
+class Ordenacao:
+    """
+    Permutação aplicada na carga, na indexação nativa do backend (na matriz,
+    1-based, com o índice 0 fixo): `ordem[i]` é o vértice original do vértice
+    interno i e `posicao[v]`, o vértice interno do original v.
+
+    Os métodos de tradução abaixo são usados por `com_ids_originais`.
+    """
+
+    def __init__(self, ordem: np.ndarray, criterio: str, base: int = 0):
+        ordem = np.asarray(ordem, dtype=np.int64)
+        if base:
+            ordem = np.concatenate((np.arange(base, dtype=np.int64), ordem + base))
+        self.criterio = criterio
+        self.ordem = ordem
+        self.posicao = inverter(ordem)
+
+    @classmethod
+    def de_csr(cls, offsets: np.ndarray, indices: np.ndarray, criterio: str, base: int = 0):
+        return cls(calcular_ordem(len(offsets) - 1, offsets, indices, criterio), criterio, base)
+
+    # --- Entrada: original -> interno ---
+
+    def interno(self, v):
+        """Vértice (ou sequência de vértices) original -> interno. None = todos, na ordem original."""
+        if v is None:
+            return self.posicao
+        if isinstance(v, (int, np.integer)):
+            # Fora do intervalo passa adiante: o método decide o erro, como sem reordenação
+            return int(self.posicao[v]) if 0 <= v < len(self.posicao) else v
+        return self.posicao[np.asarray(v, dtype=np.int64)]
+
+    # --- Saída: interno -> original ---
+
+    def originais(self, vertices):
+        """Array de vértices internos -> originais (-1 continua -1)."""
+        vertices = np.asarray(vertices)
+        return np.where(vertices >= 0, self.ordem[np.maximum(vertices, 0)], -1).astype(vertices.dtype)
+
+    def por_vertice(self, valores):
+        """Valores indexados pelo vértice interno -> indexados pelo original."""
+        return np.asarray(valores)[self.posicao]
+
+    def vizinhos(self, vertices):
+        if isinstance(vertices, list):
+            return self.ordem[vertices].tolist() if vertices else []
+        return self.ordem[vertices].astype(vertices.dtype)
+
+    def arvore(self, resultado):
+        pai, nivel = resultado
+        como_lista = isinstance(pai, list)
+        pai = self.originais(self.por_vertice(pai))
+        nivel = self.por_vertice(nivel)
+        return (pai.tolist(), nivel.tolist()) if como_lista else (pai, nivel)
+
+    def caminho(self, resultado):
+        distancia, caminho = resultado
+        return distancia, [int(self.ordem[x]) for x in caminho]
+
+    def por_fonte(self, matriz):
+        """Matriz fontes x vértices: colunas na numeração original."""
+        return matriz[:, self.posicao]
+
+    def componentes(self, componentes):
+        """
+        Vértices de cada componente na numeração original, com as componentes
+        na ordem do menor vértice (a mesma ordem de componentes_conexos sem
+        reordenação); dentro de cada uma, a ordem de descoberta é mantida.
+        """
+        if not componentes:
+            return componentes
+        tamanhos = np.fromiter(map(len, componentes), dtype=np.int64, count=len(componentes))
+        vertices = self.ordem[np.concatenate([np.asarray(c, dtype=np.int64) for c in componentes])]
+        inicios = np.cumsum(tamanhos) - tamanhos
+        menores = np.minimum.reduceat(vertices, inicios)
+        partes = np.split(vertices, inicios[1:])
+        return [partes[i].tolist() for i in np.argsort(menores, kind="stable")]
+
+
+def _traduzido(funcao, vertices, resultado):
+    """
+    `funcao` chamada no grafo interno (self._grafo_interno), com os
+    parâmetros listados em `vertices` convertidos para a numeração interna e
+    o valor devolvido passado por `Ordenacao.<resultado>`.
+    """
+    parametros = list(inspect.signature(funcao).parameters.values())[1:]
+    posicoes = [[p.name for p in parametros].index(nome) for nome in vertices]
+    padroes = {p.name: p.default for p in parametros}
+
+    @functools.wraps(funcao)
+    def traduzido(self, *args, **kwargs):
+        ordenacao = self.ordenacao
+        args = list(args)
+        for nome, i in zip(vertices, posicoes):
+            if i < len(args):
+                args[i] = ordenacao.interno(args[i])
+            elif nome in kwargs:
+                kwargs[nome] = ordenacao.interno(kwargs[nome])
+            elif padroes[nome] is None:
+                kwargs[nome] = ordenacao.interno(None)
+
+        valor = funcao(self._grafo_interno, *args, **kwargs)
+        return valor if resultado is None else getattr(ordenacao, resultado)(valor)
+
+    return traduzido
+
+
+@functools.lru_cache(maxsize=None)
+def _classe_traduzida(classe):
+    """Subclasse de `classe` com os métodos de `classe.IDS_ORIGINAIS` traduzidos."""
+    metodos = {nome: _traduzido(getattr(classe, nome), vertices, resultado)
+               for nome, (vertices, resultado) in classe.IDS_ORIGINAIS.items()}
+    metodos.update(__doc__=classe.__doc__, __module__=classe.__module__, __qualname__=classe.__qualname__)
+    return type(classe.__name__, (classe,), metodos)
+
+
+def com_ids_originais(grafo, ordenacao: Ordenacao):
+    """
+    O grafo (já na numeração interna) visto na numeração do arquivo. O objeto
+    devolvido é uma subclasse do backend que compartilha os atributos de
+    `grafo` (mesmo __dict__: arrays, união-busca, cache e contadores); os
+    métodos de IDS_ORIGINAIS traduzem os vértices e rodam em `grafo`, de modo
+    que as chamadas internas entre eles ficam na numeração interna. Os demais
+    (salvar_*, tamanhos_componentes, ...) rodam no objeto traduzido e usam os
+    públicos já traduzidos.
+    """
+    traduzido = object.__new__(_classe_traduzida(type(grafo)))
+    traduzido.__dict__ = grafo.__dict__
+    grafo.ordenacao = ordenacao
+    grafo._grafo_interno = grafo
+    return traduzido
@@ -0,0 +1,236 @@
+"""
+Servidor de consultas sobre um grafo carregado uma única vez.
+
+O grafo é lido na partida e fica residente; clientes locais se conectam
+por um socket Unix e enviam uma consulta por linha (mesmo formato de
+consultas.py: JSON ou "op arg1 arg2"), recebendo uma resposta JSON por
+linha, na ordem. Cada resposta traz `tempo_s` (cálculo) e `latencia_s`
+(da chegada da linha até a resposta, incluindo a espera por um processo).
+
+O laço asyncio só faz E/S e as consultas baratas (grau e componentes via
+união-busca); BFS, DFS e distâncias (e componentes no CSR) vão para um pool de
+processos criado por fork depois da carga, de modo que os processos
+compartilham as páginas do grafo (copy-on-write) em vez de relê-lo. Cada
+processo mantém o próprio cache de BFS. A consulta "estatisticas" devolve
+contadores e percentis de latência do servidor.
+
+Exemplo:
+    python3 servidor_grafos.py servir as_graph.txt --backend csr --socket /tmp/grafo.sock
+    python3 servidor_grafos.py consultar --socket /tmp/grafo.sock "distancia 1 500" "grau 7"
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from collections import deque
+import numpy as np
+
+from consultas import BACKENDS, OPERACOES, ErroConsulta, carregar_grafo, interpretar, responder
+from cache_bfs import LIMITE_PADRAO
+from reordenacao import CRITERIOS
+
+SOCKET_PADRAO = "/tmp/grafos.sock"
+
+# Latências guardadas para os percentis de "estatisticas"
+JANELA_LATENCIAS = 10000
+
+# Grafo do processo (o pai carrega; os filhos o herdam pelo fork)
+_GRAFO = None
+
+
+def _inicializar_trabalhador(limite_cache: int):
+    # Ctrl+C é tratado pelo processo principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if limite_cache > 0:
+        _GRAFO.ativar_cache_bfs(limite_cache)
+
+
+def _responder_no_trabalhador(consulta: dict) -> dict:
+    return responder(_GRAFO, consulta)
+
+
+class ServidorGrafos:
+    """
+    Atende conexões em um socket Unix. `processos` = 0 usa uma única
+    thread em vez do pool de processos (útil onde não há fork).
+    """
+
+    def __init__(self, grafo, caminho_socket: str = SOCKET_PADRAO, processos: int = None,
+                 limite_cache: int = LIMITE_PADRAO):
+        global _GRAFO
+        _GRAFO = grafo
+        self.grafo = grafo
+        self.caminho_socket = caminho_socket
+        self.processos = (os.cpu_count() or 1) if processos is None else processos
+        self.limite_cache = limite_cache
+        self.executor = None
+        self.servidor = None
+
+        self.inicio = time.time()
+        self.atendidas = 0
+        self.com_erro = 0
+        self.conexoes = 0
+        self.latencias = deque(maxlen=JANELA_LATENCIAS)
+
+        # Componentes por união-busca: consultas O(α(n)) no próprio laço.
+        # Montada antes do fork para que os processos a herdem.
+        self._uniao = hasattr(grafo, "manter_componentes")
+        if self._uniao and grafo.uniao is None:
+            grafo.manter_componentes()
+
+    def _criar_executor(self):
+        if self.processos > 0 and "fork" in multiprocessing.get_all_start_methods():
+            return concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.processos, mp_context=multiprocessing.get_context("fork"),
+                initializer=_inicializar_trabalhador, initargs=(self.limite_cache,))
+        if self.limite_cache > 0:
+            self.grafo.ativar_cache_bfs(self.limite_cache)
+        return concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def _leve(self, consulta: dict) -> bool:
+        op = consulta.get("op")
+        # As consultas de componentes ficam todas aqui: assim a união-busca
+        # (que comprime caminhos ao consultar) só é tocada pelo laço
+        return op == "grau" or (self._uniao and op in ("componentes", "componente", "mesmo_componente"))
+
+    def estatisticas(self) -> dict:
+        latencias = np.array(self.latencias) if self.latencias else np.zeros(1)
+        p50, p90, p99 = np.percentile(latencias, (50, 90, 99))
+        return {
+            "atendidas": self.atendidas,
+            "com_erro": self.com_erro,
+            "conexoes": self.conexoes,
+            "processos": self.processos,
+            "ativo_s": time.time() - self.inicio,
+            "latencia_p50_s": float(p50),
+            "latencia_p90_s": float(p90),
+            "latencia_p99_s": float(p99),
+        }
+
+    async def _responder(self, linha: str) -> dict:
+        try:
+            consulta = interpretar(linha, OPERACOES + ("estatisticas",))
+        except ErroConsulta as e:
+            return {"consulta": linha.strip(), "erro": str(e)}
+
+        if consulta.get("op") == "estatisticas":
+            return {"consulta": consulta, **self.estatisticas()}
+        if self._leve(consulta):
+            return responder(self.grafo, consulta)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _responder_no_trabalhador, consulta)
+
+    async def _atender(self, leitor, escritor):
+        self.conexoes += 1
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                t0 = time.perf_counter()
+                linha = linha.decode("utf-8", errors="replace")
+                if not linha.strip() or linha.lstrip().startswith("#"):
+                    continue
+
+                try:
+                    resposta = await self._responder(linha)
+                except Exception as e:
+                    # Falha inesperada em uma consulta não derruba a conexão
+                    resposta = {"consulta": linha.strip(), "erro": f"{type(e).__name__}: {e}"}
+
+                resposta["latencia_s"] = time.perf_counter() - t0
+                self.atendidas += 1
+                self.com_erro += "erro" in resposta
+                self.latencias.append(resposta["latencia_s"])
+
+                escritor.write((json.dumps(resposta, ensure_ascii=False) + "\n").encode("utf-8"))
+                await escritor.drain()
+        except ConnectionResetError:
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self):
+        if os.path.exists(self.caminho_socket):
+            os.unlink(self.caminho_socket)
+
+        # Os processos são criados (fork) antes de abrir o socket: um filho
+        # criado depois herdaria os descritores das conexões abertas e o
+        # cliente nunca veria o fim da conexão
+        self.executor = self._criar_executor()
+        self.executor.submit(int).result()
+        self.servidor = await asyncio.start_unix_server(self._atender, path=self.caminho_socket)
+
+        parar = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sinal, parar.set)
+
+        print(f"Servindo em '{self.caminho_socket}' ({self.processos} processo(s))", file=sys.stderr)
+        try:
+            async with self.servidor:
+                await parar.wait()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+            if os.path.exists(self.caminho_socket):
+                os.unlink(self.caminho_socket)
+            print(f"Servidor encerrado: {self.atendidas} consulta(s) atendida(s).", file=sys.stderr)
+
+
+def consultar(linhas, caminho_socket: str = SOCKET_PADRAO):
+    """Cliente simples: envia as consultas e devolve as respostas (dicionários), na ordem."""
+    linhas = [l.strip() for l in linhas if l.strip()]
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(caminho_socket)
+        s.sendall("".join(l + "\n" for l in linhas).encode("utf-8"))
+        s.shutdown(socket.SHUT_WR)
+        with s.makefile("r", encoding="utf-8") as f:
+            return [json.loads(l) for l in f]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de consultas sobre um grafo residente.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    sv = sub.add_parser("servir", help="carrega o grafo e atende no socket")
+    sv.add_argument("arquivo")
+    sv.add_argument("--backend", choices=list(BACKENDS), default="csr")
+    sv.add_argument("--socket", default=SOCKET_PADRAO)
+    sv.add_argument("--processos", type=int, default=None,
+                    help="processos para as buscas (padrão: núcleos; 0 = uma thread)")
+    sv.add_argument("--cache-bfs", type=float, default=LIMITE_PADRAO / 1024**2, metavar="MB",
+                    help="cache de BFS por processo (0 desativa)")
+    sv.add_argument("--sem-cache", action="store_true", help="não usa o cache binário do grafo")
+    sv.add_argument("--reordenar", choices=CRITERIOS, help="renumera os vértices na carga (ver reordenacao.py)")
+
+    cl = sub.add_parser("consultar", help="envia consultas a um servidor em execução")
+    cl.add_argument("consultas", nargs="*", help="consultas ('-' ou nada = stdin)")
+    cl.add_argument("--socket", default=SOCKET_PADRAO)
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "consultar":
+        linhas = sys.stdin if not args.consultas or args.consultas == ["-"] else args.consultas
+        for resposta in consultar(linhas, args.socket):
+            print(json.dumps(resposta, ensure_ascii=False))
+        return 0
+
+    t0 = time.perf_counter()
+    grafo = carregar_grafo(args.arquivo, args.backend, usar_cache=not args.sem_cache, saida_log=sys.stderr,
+                           reordenar=args.reordenar)
+    print(f"Grafo carregado ({args.backend}) em {time.perf_counter() - t0:.4f} s", file=sys.stderr)
+
+    servidor = ServidorGrafos(grafo, args.socket, args.processos, int(args.cache_bfs * 1024**2))
+    asyncio.run(servidor.servir())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from consultas import carregar_grafo, primeiro_indice  # noqa: E402
+
+BACKENDS = ("lista", "csr", "matriz", "matriz_bits", "matriz_blocos")
+MATRIZES = ("matriz", "matriz_bits", "matriz_blocos")
+
+# Grafos pequenos no formato de entrada (primeira linha N, depois "u v", 1-based)
+GRAFOS = {
+    # Duas componentes, laço (3 3), aresta repetida (nos dois sentidos),
+    # vértice fora do intervalo (9), linha inválida e vértice isolado (7)
+    "misto": "7\n1 2\n2 3\n3 3\n1 2\n2 1\n3 1\n4 5\n5 6\n1 9\nlixo\n2 4x\n",
+    "caminho": "6\n1 2\n2 3\n3 4\n4 5\n5 6\n",
+    "estrela": "5\n3 1\n3 5\n3 2\n3 4\n",
+    # Ordem de inserção diferente da numérica e um ciclo
+    "ciclo": "8\n8 1\n1 5\n5 2\n2 8\n5 7\n6 3\n",
+    "isolados": "4\n",
+}
+
+
+@pytest.fixture(params=sorted(GRAFOS))
+def arquivo(request, tmp_path):
+    """Caminho de um arquivo de entrada de GRAFOS (parametrizado por nome)."""
+    caminho = tmp_path / f"{request.param}.txt"
+    caminho.write_text(GRAFOS[request.param])
+    return str(caminho)
+
+
+def carregar(arquivo: str, backend: str, reordenar: str = None):
+    """Carrega sem cache binário e sem as mensagens de progresso."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return carregar_grafo(arquivo, backend, usar_cache=False, saida_log=io.StringIO(), reordenar=reordenar)
+
+
+def vertices(grafo):
+    """Índices dos vértices do arquivo no backend (1..n na matriz, 0..n-1 nos demais)."""
+    base = primeiro_indice(grafo)
+    return range(base, base + grafo.n)
+
+
+def por_vertice(grafo, valores) -> np.ndarray:
+    """Valores por vértice do arquivo (sem a linha 0 da matriz), como int64."""
+    valores = np.asarray(valores, dtype=np.int64)
+    return valores[primeiro_indice(grafo):]
+
+
+def vizinhos(grafo, u) -> set:
+    return set(np.asarray(grafo.vizinhos(u)).tolist())
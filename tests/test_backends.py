@@ -0,0 +1,184 @@
+"""
+Mesmos resultados em todos os backends: Grafo_CSR igual à Lista_Grafo, as
+três formas de armazenamento da matriz iguais entre si, e a carga com
+reordenação igual à carga sem ela (nos ids do arquivo).
+"""
+import numpy as np
+import pytest
+
+from conftest import BACKENDS, MATRIZES, carregar, por_vertice, vertices, vizinhos
+from reordenacao import CRITERIOS
+from triangulos import salvar_agrupamento
+
+
+def _texto(caminho) -> str:
+    with open(caminho, encoding="utf-8") as f:
+        return f.read()
+
+
+def _salvar_tudo(grafo, pasta, inicio: int) -> dict:
+    """Texto de cada salvar_* do grafo, por nome."""
+    salvar_resumo = getattr(grafo, "salvar_resumo", None) or grafo.save_resumo
+    chamadas = {
+        "resumo": lambda c: salvar_resumo(c),
+        "bfs": lambda c: grafo.salvar_busca_largura(inicio, c),
+        "dfs": lambda c: grafo.salvar_busca_profundidade(inicio, c),
+        "componentes": lambda c: grafo.salvar_componentes(c),
+    }
+    textos = {}
+    for nome, chamada in chamadas.items():
+        caminho = pasta / f"{nome}.txt"
+        chamada(str(caminho))
+        textos[nome] = _texto(caminho)
+    return textos
+
+
+def _arvore_valida(grafo, pai, nivel, inicio):
+    pai, nivel = np.asarray(pai), np.asarray(nivel)
+    assert nivel[inicio] == 0
+    for v in vertices(grafo):
+        if nivel[v] > 0:
+            assert pai[v] in vizinhos(grafo, v)
+            assert nivel[pai[v]] == nivel[v] - 1
+
+
+def test_descartes_na_leitura(tmp_path):
+    caminho = tmp_path / "g.txt"
+    caminho.write_text("4\n1 2\n2 1\n1 2\n2 5\n0 1\nx y\n")
+    grafo = carregar(str(caminho), "csr")
+    assert grafo.n == 4
+    assert grafo.num_arestas == 1
+    assert grafo.descartes == {"fora_intervalo": 2, "duplicadas": 2, "invalidas": 1}
+
+
+def test_csr_igual_lista(arquivo, tmp_path):
+    lista = carregar(arquivo, "lista")
+    csr = carregar(arquivo, "csr")
+    assert (csr.n, csr.num_arestas) == (lista.n, lista.num_arestas)
+    assert np.array_equal(csr.graus(), lista.graus())
+
+    for u in vertices(lista):
+        pai, nivel = lista.busca_largura(u)
+        for modo in ("fila", "niveis"):
+            pai_csr, nivel_csr = csr.busca_largura(u, modo=modo)
+            assert np.array_equal(pai_csr, pai) and np.array_equal(nivel_csr, nivel)
+        assert np.array_equal(csr.busca_largura(u, modo="hibrida")[1], nivel)
+        assert csr.busca_profundidade(u) == lista.busca_profundidade(u)
+    assert csr.componentes_conexos() == lista.componentes_conexos()
+
+    (tmp_path / "lista").mkdir()
+    (tmp_path / "csr").mkdir()
+    inicio = lista.n // 2
+    assert _salvar_tudo(csr, tmp_path / "csr", inicio) == _salvar_tudo(lista, tmp_path / "lista", inicio)
+
+
+def test_matrizes_iguais(arquivo, tmp_path):
+    densa, *outras = [carregar(arquivo, b) for b in MATRIZES]
+    (tmp_path / "densa").mkdir()
+    inicio = densa.n // 2 + 1
+    textos = _salvar_tudo(densa, tmp_path / "densa", inicio)
+
+    for i, grafo in enumerate(outras):
+        assert grafo.num_arestas == densa.num_arestas
+        assert np.array_equal(grafo.graus(), densa.graus())
+        for u in vertices(densa):
+            assert np.array_equal(grafo.linha(u), densa.linha(u))
+            assert np.array_equal(grafo.vizinhos(u), densa.vizinhos(u))
+            for busca in ("busca_largura", "busca_profundidade"):
+                pai, nivel = getattr(grafo, busca)(u)
+                pai_d, nivel_d = getattr(densa, busca)(u)
+                assert np.array_equal(pai, pai_d) and np.array_equal(nivel, nivel_d)
+        assert grafo.componentes_conexos() == densa.componentes_conexos()
+
+        pasta = tmp_path / str(i)
+        pasta.mkdir()
+        assert _salvar_tudo(grafo, pasta, inicio) == textos
+
+
+def test_matrizes_iguais_varios_blocos(tmp_path):
+    # Linhas com vários blocos de 16 colunas: um hub ligado a todos e arestas aleatórias
+    rng = np.random.default_rng(11)
+    n = 150
+    arestas = [(1, v) for v in range(2, n + 1)] + [tuple(p) for p in rng.integers(1, n + 1, (300, 2)).tolist()]
+    caminho = tmp_path / "g.txt"
+    caminho.write_text(f"{n}\n" + "".join(f"{u} {v}\n" for u, v in arestas))
+    densa, *outras = [carregar(str(caminho), b) for b in MATRIZES]
+
+    for grafo in outras:
+        for u in (1, 2, 17, 77, n):
+            pai, nivel = grafo.busca_profundidade(u)
+            pai_d, nivel_d = densa.busca_profundidade(u)
+            assert np.array_equal(pai, pai_d) and np.array_equal(nivel, nivel_d)
+
+
+@pytest.mark.parametrize("backend", MATRIZES)
+def test_matriz_como_lista(arquivo, backend):
+    lista = carregar(arquivo, "lista")
+    matriz = carregar(arquivo, backend)
+    # Um laço ocupa uma única célula da matriz: conta 1 no grau (2 na lista)
+    lacos = np.array([u in vizinhos(lista, u) for u in vertices(lista)], dtype=np.int64)
+    assert np.array_equal(por_vertice(matriz, matriz.graus()), lista.graus() - lacos)
+
+    for u in vertices(lista):
+        pai, nivel = matriz.busca_largura(u + 1)
+        assert np.array_equal(por_vertice(matriz, nivel), lista.busca_largura(u)[1])
+        _arvore_valida(matriz, pai, nivel, u + 1)
+
+    # A matriz tem a linha 0 como componente isolada a mais
+    componentes = [sorted(c) for c in matriz.componentes_conexos() if c != [0]]
+    assert componentes == [sorted(v + 1 for v in c) for c in lista.componentes_conexos()]
+
+
+@pytest.mark.parametrize("criterio", CRITERIOS)
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_reordenacao_transparente(arquivo, backend, criterio, tmp_path):
+    original = carregar(arquivo, backend)
+    grafo = carregar(arquivo, backend, reordenar=criterio)
+    assert grafo.ordenacao is not None and original.ordenacao is None
+
+    assert np.array_equal(grafo.graus(), original.graus())
+    for u in vertices(original):
+        assert vizinhos(grafo, u) == vizinhos(original, u)
+        pai, nivel = grafo.busca_largura(u)
+        assert np.array_equal(nivel, original.busca_largura(u)[1])
+        _arvore_valida(original, pai, nivel, u)
+        pai, nivel = grafo.busca_profundidade(u)
+        assert np.array_equal(np.asarray(nivel) >= 0, np.asarray(original.busca_profundidade(u)[1]) >= 0)
+        _arvore_valida(original, pai, nivel, u)
+
+    # Mesmas componentes, na mesma ordem (a ordem dentro de cada uma pode mudar)
+    assert [sorted(c) for c in grafo.componentes_conexos()] == \
+        [sorted(c) for c in original.componentes_conexos()]
+
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    inicio = vertices(original)[0]
+    textos = _salvar_tudo(grafo, tmp_path / "a", inicio)
+    textos_originais = _salvar_tudo(original, tmp_path / "b", inicio)
+    assert textos["resumo"] == textos_originais["resumo"]
+
+    grafo.salvar_busca_largura(inicio, str(tmp_path / "a" / "bfs"), formato="npy")
+    original.salvar_busca_largura(inicio, str(tmp_path / "b" / "bfs"), formato="npy")
+    assert np.array_equal(np.load(tmp_path / "a" / "bfs.nivel.npy"), np.load(tmp_path / "b" / "bfs.nivel.npy"))
+
+
+@pytest.mark.parametrize("formato", ["texto", "npy"])
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_salvar_devolve_caminhos(tmp_path, backend, formato):
+    caminho = tmp_path / "g.txt"
+    caminho.write_text("4\n1 2\n2 3\n")
+    grafo = carregar(str(caminho), backend)
+    salvar_resumo = getattr(grafo, "salvar_resumo", None) or grafo.save_resumo
+    inicio = vertices(grafo)[0]
+    chamadas = [
+        lambda c: salvar_resumo(c, formato=formato),
+        lambda c: grafo.salvar_busca_largura(inicio, c, formato=formato),
+        lambda c: grafo.salvar_busca_profundidade(inicio, c, formato=formato),
+        lambda c: grafo.salvar_componentes(c, formato=formato),
+        lambda c: salvar_agrupamento(grafo, c, formato=formato),
+    ]
+    for i, chamada in enumerate(chamadas):
+        pasta = tmp_path / str(i)
+        pasta.mkdir()
+        gravados = chamada(str(pasta / "saida.txt"))
+        assert sorted(gravados) == sorted(str(p) for p in pasta.iterdir())
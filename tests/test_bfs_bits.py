@@ -0,0 +1,59 @@
+"""
+BFS bit-paralela do Grafo_CSR (distancias_multiplas e excentricidades)
+contra uma busca_largura por fonte: mais de 64 fontes (várias palavras
+uint64), lotes que não dividem o número de fontes e grafos desconexos.
+"""
+import numpy as np
+import pytest
+
+from conftest import carregar
+
+
+def _grafo_aleatorio(tmp_path, semente: int, n: int = 150, componentes: int = 4):
+    """Algumas componentes aleatórias, vértices isolados, um laço e arestas repetidas."""
+    rng = np.random.default_rng(semente)
+    rotulo = rng.integers(0, componentes, n)
+    # Os últimos vértices ficam isolados
+    rotulo[-5:] = -1
+    linhas = [f"{n}"]
+    for c in range(componentes):
+        membros = np.flatnonzero(rotulo == c) + 1
+        if len(membros) < 2:
+            continue
+        for _ in range(2 * len(membros)):
+            u, v = rng.choice(membros, 2)
+            linhas.append(f"{u} {v}")
+    linhas += ["1 1", linhas[-1], linhas[-1]]
+    caminho = tmp_path / f"g{semente}.txt"
+    caminho.write_text("\n".join(linhas) + "\n")
+    return str(caminho)
+
+
+@pytest.mark.parametrize("reordenar", [None, "rcm"])
+@pytest.mark.parametrize("semente", [1, 2, 3])
+def test_distancias_multiplas_igual_bfs(tmp_path, semente, reordenar):
+    grafo = carregar(_grafo_aleatorio(tmp_path, semente), "csr", reordenar=reordenar)
+    rng = np.random.default_rng(semente)
+    # 130 fontes (3 palavras de 64 bits), com repetições
+    fontes = rng.integers(0, grafo.n, 130)
+
+    distancias = grafo.distancias_multiplas(fontes)
+    assert distancias.shape == (len(fontes), grafo.n)
+    for linha, fonte in zip(distancias, fontes.tolist()):
+        assert np.array_equal(linha, grafo.busca_largura(fonte)[1])
+
+
+@pytest.mark.parametrize("lote", [7, 64, 65, 100, 1000])
+@pytest.mark.parametrize("reordenar", [None, "rcm"])
+def test_excentricidades_igual_bfs(tmp_path, lote, reordenar):
+    grafo = carregar(_grafo_aleatorio(tmp_path, 4), "csr", reordenar=reordenar)
+    niveis = [np.asarray(grafo.busca_largura(v)[1]) for v in range(grafo.n)]
+    esperada = np.array([nivel.max() for nivel in niveis])
+    inacessiveis = np.array([np.count_nonzero(nivel == -1) for nivel in niveis])
+
+    excentricidade, inac = grafo.excentricidades(lote=lote)
+    assert np.array_equal(excentricidade, esperada) and np.array_equal(inac, inacessiveis)
+
+    fontes = np.arange(grafo.n)[::-1][:97]
+    excentricidade, inac = grafo.excentricidades(fontes, lote=lote)
+    assert np.array_equal(excentricidade, esperada[fontes]) and np.array_equal(inac, inacessiveis[fontes])
@@ -0,0 +1,53 @@
+"""
+caminho_minimo (BFS bidirecional) em todos os backends, contra a distância
+da BFS comum: u == v, vértices adjacentes, pares sem caminho e validade do
+caminho devolvido.
+"""
+import numpy as np
+import pytest
+
+from conftest import BACKENDS, carregar, vertices, vizinhos
+
+
+def _conferir_todos_os_pares(grafo, referencia=None):
+    referencia = referencia or grafo
+    for u in vertices(grafo):
+        nivel = np.asarray(referencia.busca_largura(u)[1])
+        for v in vertices(grafo):
+            distancia, caminho = grafo.caminho_minimo(u, v)
+            assert distancia == nivel[v]
+            if distancia < 0:
+                assert caminho == []
+                continue
+            assert len(caminho) == distancia + 1
+            assert caminho[0] == u and caminho[-1] == v
+            for x, y in zip(caminho, caminho[1:]):
+                assert y in vizinhos(referencia, x)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_caminho_minimo_igual_bfs(arquivo, backend):
+    _conferir_todos_os_pares(carregar(arquivo, backend))
+
+
+@pytest.mark.parametrize("criterio", ["bfs", "rcm"])
+@pytest.mark.parametrize("backend", ["lista", "csr", "matriz"])
+def test_caminho_minimo_reordenado(arquivo, backend, criterio):
+    _conferir_todos_os_pares(carregar(arquivo, backend, reordenar=criterio), carregar(arquivo, backend))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_casos_particulares(tmp_path, backend):
+    caminho = tmp_path / "g.txt"
+    # 1-2-3-4 em caminho, 5-6 à parte, 7 isolado
+    caminho.write_text("7\n1 2\n2 3\n3 4\n5 6\n")
+    grafo = carregar(str(caminho), backend)
+    v1, v2, v3, v4, v5, v6, v7 = vertices(grafo)
+
+    assert grafo.caminho_minimo(v3, v3) == (0, [v3])
+    assert grafo.caminho_minimo(v7, v7) == (0, [v7])
+    assert grafo.caminho_minimo(v1, v2) == (1, [v1, v2])
+    assert grafo.caminho_minimo(v6, v5) == (1, [v6, v5])
+    assert grafo.caminho_minimo(v1, v4) == (3, [v1, v2, v3, v4])
+    assert grafo.caminho_minimo(v1, v5) == (-1, [])
+    assert grafo.caminho_minimo(v7, v2) == (-1, [])
@@ -0,0 +1,67 @@
+"""
+Componentes mantidas de forma incremental (add_arestas + UniaoBusca) contra
+uma recontagem completa com componentes_conexos().
+"""
+import numpy as np
+import pytest
+
+from conftest import MATRIZES, carregar, vertices
+from uniao_busca import UniaoBusca
+
+# Backends com add_arestas (o Grafo_CSR é imutável)
+MUTAVEIS = ("lista",) + MATRIZES
+
+
+def _conferir(grafo):
+    componentes = grafo.componentes_conexos()
+    assert grafo.num_componentes() == len(componentes)
+    assert sorted(grafo.tamanhos_componentes().tolist()) == sorted(map(len, componentes))
+
+    rotulo = {}
+    for i, componente in enumerate(componentes):
+        for v in componente:
+            rotulo[v] = i
+    todos = list(vertices(grafo))
+    for u in todos:
+        assert grafo.tamanho_componente(u) == len(componentes[rotulo[u]])
+        for v in todos:
+            assert grafo.mesmo_componente(u, v) == (rotulo[u] == rotulo[v])
+
+
+@pytest.mark.parametrize("reordenar", [None, "rcm"])
+@pytest.mark.parametrize("backend", MUTAVEIS)
+def test_add_arestas_igual_recontagem(tmp_path, backend, reordenar):
+    caminho = tmp_path / "g.txt"
+    caminho.write_text("12\n1 2\n3 4\n4 4\n")
+    grafo = carregar(str(caminho), backend, reordenar=reordenar)
+    todos = list(vertices(grafo))
+
+    # Antes de qualquer consulta, add_arestas não mantém a união-busca
+    grafo.add_arestas(todos[4], todos[5])
+    _conferir(grafo)
+
+    rng = np.random.default_rng(7)
+    for _ in range(25):
+        u, v = (todos[i] for i in rng.integers(0, len(todos), 2))
+        grafo.add_arestas(u, v)
+        # Aresta repetida (nos dois sentidos) não muda nada
+        grafo.add_arestas(v, u)
+        _conferir(grafo)
+
+
+def test_uniao_busca_unir_arestas_igual_unir():
+    rng = np.random.default_rng(3)
+    origem = rng.integers(0, 40, 30)
+    destino = rng.integers(0, 40, 30)
+
+    em_lote = UniaoBusca(40)
+    em_lote.unir_arestas(origem, destino)
+    uma_a_uma = UniaoBusca(40)
+    for a, b in zip(origem.tolist(), destino.tolist()):
+        uma_a_uma.unir(a, b)
+
+    assert em_lote.num_componentes == uma_a_uma.num_componentes
+    for x in range(40):
+        assert em_lote.tamanho_de(x) == uma_a_uma.tamanho_de(x)
+        for y in range(40):
+            assert em_lote.mesmo_conjunto(x, y) == uma_a_uma.mesmo_conjunto(x, y)
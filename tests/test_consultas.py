@@ -0,0 +1,23 @@
+"""
+Consultas bfs/dfs em todos os backends: na DFS da matriz, só a árvore do
+vértice consultado entra na resposta (as demais raízes ficam de fora).
+"""
+import numpy as np
+import pytest
+
+from conftest import BACKENDS, carregar
+from consultas import responder
+
+
+@pytest.mark.parametrize("op", ["bfs", "dfs"])
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_arvore_so_da_componente(arquivo, backend, op):
+    lista = carregar(arquivo, "lista")
+    grafo = carregar(arquivo, backend)
+    for v in range(1, lista.n + 1):
+        resposta = responder(grafo, {"op": op, "v": v, "completo": True})
+        esperada = responder(lista, {"op": op, "v": v, "completo": True})
+        assert resposta["alcancados"] == esperada["alcancados"]
+        alcancados = np.array(resposta["nivel"]) >= 0
+        assert np.array_equal(alcancados, np.array(esperada["nivel"]) >= 0)
+        assert np.array_equal(np.array(resposta["pai"]) >= 0, alcancados & (np.arange(lista.n) != v - 1))
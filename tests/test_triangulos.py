@@ -0,0 +1,78 @@
+"""
+Triângulos e graus simples (triangulos_e_graus) contra uma contagem por
+força bruta, pelos dois caminhos: orientação por posto (qualquer backend)
+e diag(A^3) / 2 (matriz densa ou em bits até LIMITE_MATRIZ).
+"""
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+import triangulos
+from conftest import BACKENDS, GRAFOS, carregar
+from grafos_lib_matrix import Grafo_Matriz, Grafo_Matriz_Bits
+
+
+def _forca_bruta(texto: str):
+    """Triângulos e grau simples de cada vértice (ordem do arquivo), direto das linhas "u v"."""
+    linhas = texto.split("\n")
+    n = int(linhas[0])
+    vizinhos = [set() for _ in range(n)]
+    for linha in linhas[1:]:
+        partes = linha.split()
+        if len(partes) != 2 or not all(p.isdigit() for p in partes):
+            continue
+        u, v = int(partes[0]) - 1, int(partes[1]) - 1
+        if u != v and 0 <= u < n and 0 <= v < n:
+            vizinhos[u].add(v)
+            vizinhos[v].add(u)
+    contagem = np.zeros(n, dtype=np.int64)
+    for a, b, c in combinations(range(n), 3):
+        if b in vizinhos[a] and c in vizinhos[a] and c in vizinhos[b]:
+            contagem[[a, b, c]] += 1
+    return contagem, np.array([len(s) for s in vizinhos], dtype=np.int64)
+
+
+def _aleatorio(semente: int, n: int = 30, m: int = 120) -> str:
+    """Grafo denso o bastante para ter muitos triângulos, com laços e arestas repetidas."""
+    rng = np.random.default_rng(semente)
+    pares = rng.integers(1, n + 1, (m, 2)).tolist()
+    pares += [[3, 3], [7, 7]] + pares[:10] + [[v, u] for u, v in pares[10:20]]
+    return f"{n}\n" + "".join(f"{u} {v}\n" for u, v in pares)
+
+
+CASOS = dict(GRAFOS, aleatorio1=_aleatorio(1), aleatorio2=_aleatorio(2),
+             completo="12\n" + "".join(f"{u} {v}\n" for u, v in combinations(range(1, 13), 2)))
+
+
+@pytest.fixture(params=sorted(CASOS))
+def caso(request, tmp_path):
+    caminho = tmp_path / f"{request.param}.txt"
+    caminho.write_text(CASOS[request.param])
+    return str(caminho), _forca_bruta(CASOS[request.param])
+
+
+@pytest.mark.parametrize("reordenar", [None, "rcm"])
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_triangulos_igual_forca_bruta(caso, backend, reordenar):
+    arquivo, (esperados, graus) = caso
+    grafo = carregar(arquivo, backend, reordenar=reordenar)
+
+    t, g = triangulos.triangulos_e_graus(grafo)
+    assert np.array_equal(t, esperados) and np.array_equal(g, graus)
+    # O caminho geral também em todos os backends (na matriz pequena, o padrão é o produto)
+    t, g = triangulos._por_orientacao(grafo.n, *triangulos._arestas(grafo))
+    assert np.array_equal(t, esperados) and np.array_equal(g, graus)
+    assert triangulos.contar_triangulos(grafo) == esperados.sum() // 3
+
+
+@pytest.mark.parametrize("backend", ["matriz", "matriz_bits"])
+def test_produto_de_matrizes_exato(tmp_path, backend):
+    # Grafo completo com contagens na casa de 10^6 (float32 é exato até 2^24):
+    # cada vértice está em C(n-1, 2) triângulos
+    n = 1500
+    origem, destino = np.triu_indices(n, 1)
+    grafo = Grafo_Matriz(n) if backend == "matriz" else Grafo_Matriz_Bits(n)
+    grafo._preencher(grafo.adj, origem + 1, destino + 1)
+    t, g = triangulos._por_matriz(grafo)
+    assert np.all(t == (n - 1) * (n - 2) // 2) and np.all(g == n - 1)
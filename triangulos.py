@@ -0,0 +1,194 @@
+"""
+Contagem de triângulos e coeficientes de agrupamento (clustering).
+
+Caminho geral (qualquer backend): as arestas simples são orientadas do
+vértice de menor para o de maior posto, com o posto dado por (grau, id).
+Cada vértice fica com no máximo O(sqrt(E)) vizinhos "de saída", e cada
+triângulo a < b < c aparece uma única vez, como a cunha (a; b, c) fechada
+pela aresta b -> c. As listas de saída são ordenadas (CSR sobre as chaves
+a*n + b ordenadas), então testar se a cunha fecha é uma busca binária na
+lista de b; as cunhas são geradas e testadas em lotes com NumPy. Total:
+O(E^1.5), sem o estouro de pares de vizinhos dos hubs.
+
+Caminho da matriz: em Grafo_Matriz densa ou em bits com até
+LIMITE_MATRIZ vértices, os triângulos de cada vértice saem de
+diag(A^3) / 2, calculado por blocos de linhas com produto de matrizes.
+
+Os resultados por vértice seguem a ordem do arquivo (posição 0 = vértice 1),
+qualquer que seja o backend.
+"""
+import time
+import numpy as np
+
+from escrita import LINHAS_POR_LOTE, abrir_saida, salvar_colunas, validar_formato
+from grafos_lib import Lista_Grafo
+from grafos_lib_csr import Grafo_CSR
+from grafos_lib_matrix import Grafo_Matriz, Grafo_Matriz_Blocos
+
+# Maior matriz (vértices) tratada por produto de matrizes
+LIMITE_MATRIZ = 4096
+# Cunhas testadas por lote no caminho geral
+CUNHAS_POR_LOTE = 1 << 22
+# Bytes do bloco de linhas de A @ A materializado por vez
+LIMITE_BLOCO_MATRIZ = 32 * 1024 * 1024
+
+
+def _arestas(grafo):
+    """Arestas simples (u < v, 0-based, sem laços nem repetições) de qualquer backend."""
+    if isinstance(grafo, Lista_Grafo):
+        grafo = Grafo_CSR.de_lista(grafo)
+    n = grafo.n
+    if isinstance(grafo, Grafo_CSR):
+        origem = np.repeat(np.arange(n, dtype=np.int64), np.diff(grafo.offsets))
+        destino = grafo.indices.astype(np.int64)
+        if grafo.ordenacao is not None:
+            # offsets/indices estão na numeração interna (ver reordenacao.py)
+            origem, destino = grafo.ordenacao.ordem[origem], grafo.ordenacao.ordem[destino]
+    else:
+        listas = [grafo.vizinhos(u) for u in range(1, n + 1)]
+        origem = np.repeat(np.arange(n, dtype=np.int64), [len(l) for l in listas])
+        destino = np.concatenate(listas).astype(np.int64) - 1 if listas else np.empty(0, dtype=np.int64)
+
+    manter = origem < destino
+    chaves = np.sort(origem[manter] * n + destino[manter])
+    if len(chaves):
+        chaves = chaves[np.concatenate(([True], chaves[1:] != chaves[:-1]))]
+    return chaves // n, chaves % n
+
+
+def _por_orientacao(n: int, origem: np.ndarray, destino: np.ndarray):
+    """Triângulos por vértice e graus, pelo caminho geral (ver docstring do módulo)."""
+    graus = np.bincount(origem, minlength=n) + np.bincount(destino, minlength=n)
+    posto = np.empty(n, dtype=np.int64)
+    posto[np.argsort(graus, kind="stable")] = np.arange(n)
+
+    a, b = posto[origem], posto[destino]
+    chaves = np.sort(np.minimum(a, b) * n + np.maximum(a, b))
+    baixo, alto = chaves // n, chaves % n
+    m = len(chaves)
+    fim_lista = np.cumsum(np.bincount(baixo, minlength=n))
+
+    # Cada entrada p da lista de saída de a forma cunha com as entradas seguintes da mesma lista
+    parceiros = fim_lista[baixo] - 1 - np.arange(m)
+    acumulado = np.cumsum(parceiros)
+
+    triangulos = np.zeros(n, dtype=np.int64)
+    inicio = 0
+    while inicio < m:
+        antes = int(acumulado[inicio - 1]) if inicio else 0
+        fim = max(inicio + 1, int(np.searchsorted(acumulado, antes + CUNHAS_POR_LOTE, side="right")))
+        quantos = parceiros[inicio:fim]
+        total = int(acumulado[fim - 1]) - antes
+        if total:
+            primeiro = np.repeat(np.arange(inicio, fim), quantos)
+            segundo = primeiro + 1 + np.arange(total) - np.repeat(np.cumsum(quantos) - quantos, quantos)
+            x, y = alto[primeiro], alto[segundo]
+            # Buscas em ordem crescente percorrem `chaves` de forma sequencial
+            procurada = x * n + y
+            ordem = np.argsort(procurada)
+            procurada = procurada[ordem]
+            pos = np.minimum(np.searchsorted(chaves, procurada), m - 1)
+            fecha = np.empty(total, dtype=bool)
+            fecha[ordem] = chaves[pos] == procurada
+            for vertices in (baixo[primeiro[fecha]], x[fecha], y[fecha]):
+                triangulos += np.bincount(vertices, minlength=n)
+        inicio = fim
+
+    return triangulos[posto], graus
+
+
+def _por_matriz(grafo):
+    """Triângulos por vértice e graus por diag(A^3) / 2 (Grafo_Matriz pequena)."""
+    n = grafo.n
+    A = np.empty((n, n), dtype=np.float32)
+    for u in range(1, n + 1):
+        A[u - 1] = grafo.linha(u)[1:]
+    np.fill_diagonal(A, 0)
+
+    triangulos = np.empty(n, dtype=np.int64)
+    linhas = max(1, LIMITE_BLOCO_MATRIZ // (4 * max(n, 1)))
+    for i in range(0, n, linhas):
+        # float32 é exato aqui: as contagens não passam de n <= LIMITE_MATRIZ
+        bloco = A[i:i + linhas]
+        triangulos[i:i + linhas] = np.rint(np.einsum("ij,ij->i", bloco @ A, bloco) / 2)
+    return triangulos, A.sum(axis=1).astype(np.int64)
+
+
+def triangulos_e_graus(grafo):
+    """
+    Triângulos de cada vértice e grau simples (sem laços nem arestas
+    repetidas), na ordem do arquivo.
+    """
+    if isinstance(grafo, Grafo_Matriz) and not isinstance(grafo, Grafo_Matriz_Blocos) \
+            and grafo.n <= LIMITE_MATRIZ:
+        return _por_matriz(grafo)
+    origem, destino = _arestas(grafo)
+    return _por_orientacao(grafo.n, origem, destino)
+
+
+def triangulos_por_vertice(grafo) -> np.ndarray:
+    return triangulos_e_graus(grafo)[0]
+
+
+def contar_triangulos(grafo) -> int:
+    """Número total de triângulos do grafo."""
+    return int(triangulos_por_vertice(grafo).sum()) // 3
+
+
+def _agrupamento(triangulos: np.ndarray, graus: np.ndarray) -> np.ndarray:
+    pares = graus * (graus - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(pares > 0, 2 * triangulos / np.maximum(pares, 1), 0.0)
+
+
+def agrupamento_local(grafo) -> np.ndarray:
+    """Coeficiente de agrupamento de cada vértice: 2T / (d(d-1)), 0 se d < 2."""
+    return _agrupamento(*triangulos_e_graus(grafo))
+
+
+def agrupamento_medio(grafo) -> float:
+    """Média do agrupamento local sobre todos os vértices (os de grau < 2 contam como 0)."""
+    local = agrupamento_local(grafo)
+    return float(local.mean()) if len(local) else 0.0
+
+
+def _resumo(triangulos: np.ndarray, graus: np.ndarray, local: np.ndarray) -> dict:
+    total = int(triangulos.sum()) // 3
+    cunhas = int((graus * (graus - 1) // 2).sum())
+    return {
+        "triangulos": total,
+        "transitividade": 3 * total / cunhas if cunhas else 0.0,
+        "agrupamento_medio": float(local.mean()) if len(local) else 0.0,
+    }
+
+
+def resumo_agrupamento(grafo) -> dict:
+    """Triângulos, transitividade (3T / cunhas) e agrupamento médio, com uma única contagem."""
+    t0 = time.perf_counter()
+    triangulos, graus = triangulos_e_graus(grafo)
+    resumo = _resumo(triangulos, graus, _agrupamento(triangulos, graus))
+    resumo["tempo_s"] = time.perf_counter() - t0
+    return resumo
+
+
+def salvar_agrupamento(grafo, arquivo: str, formato: str = "texto"):
+    """Grava triângulos e agrupamento local de cada vértice (numeração do arquivo)."""
+    validar_formato(formato)
+    triangulos, graus = triangulos_e_graus(grafo)
+    local = _agrupamento(triangulos, graus)
+
+    if formato == "npy":
+        return salvar_colunas(arquivo, triangulos=triangulos, agrupamento=local)
+
+    resumo = _resumo(triangulos, graus, local)
+    with abrir_saida(arquivo) as f:
+        f.write(f"Triângulos: {resumo['triangulos']}\n")
+        f.write(f"Transitividade: {resumo['transitividade']:.6f}\n")
+        f.write(f"Agrupamento médio: {resumo['agrupamento_medio']:.6f}\n")
+        f.write("Por vértice:\n")
+        modelo = "vértice %d: triângulos %d, agrupamento %.6f\n"
+        for i in range(0, grafo.n, LINHAS_POR_LOTE):
+            fatia = slice(i, i + LINHAS_POR_LOTE)
+            valores = zip(range(i + 1, i + 1 + len(local[fatia])), triangulos[fatia].tolist(), local[fatia].tolist())
+            f.write("".join(modelo % linha for linha in valores))
+    return [arquivo]
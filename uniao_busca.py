@@ -0,0 +1,159 @@
+import numpy as np
+
+from leitura_arestas import TAMANHO_BLOCO, _ler_cabecalho, converter_bloco, iterar_blocos
+
+
+class UniaoBusca:
+    """
+    Estrutura de união-busca (disjoint-set) sobre os vértices 0..n-1, com
+    compressão de caminho e união por tamanho.
+
+    `unir`/`encontrar` tratam um par por vez; `unir_arestas` processa um lote
+    de arestas com operações vetorizadas (usado na leitura em blocos).
+    """
+
+    def __init__(self, num_vertices: int):
+        self.n = num_vertices
+        self.pai = np.arange(num_vertices, dtype=np.int64)
+        self.tamanho = np.ones(num_vertices, dtype=np.int64)
+        self.num_componentes = num_vertices
+
+    def crescer(self, num_vertices: int):
+        """Acrescenta vértices isolados até num_vertices (N desconhecido na leitura)."""
+        if num_vertices <= self.n:
+            return
+        self.pai = np.concatenate([self.pai, np.arange(self.n, num_vertices, dtype=np.int64)])
+        self.tamanho = np.concatenate([self.tamanho, np.ones(num_vertices - self.n, dtype=np.int64)])
+        self.num_componentes += num_vertices - self.n
+        self.n = num_vertices
+
+    def encontrar(self, x: int) -> int:
+        pai = self.pai
+        raiz = x
+        while pai[raiz] != raiz:
+            raiz = pai[raiz]
+        # Compressão de caminho
+        while pai[x] != raiz:
+            pai[x], x = raiz, pai[x]
+        return int(raiz)
+
+    def unir(self, a: int, b: int) -> bool:
+        """Une os conjuntos de a e b; devolve False se já estavam juntos."""
+        ra, rb = self.encontrar(a), self.encontrar(b)
+        if ra == rb:
+            return False
+        if self.tamanho[ra] < self.tamanho[rb]:
+            ra, rb = rb, ra
+        self.pai[rb] = ra
+        self.tamanho[ra] += self.tamanho[rb]
+        self.num_componentes -= 1
+        return True
+
+    def mesmo_conjunto(self, a: int, b: int) -> bool:
+        return self.encontrar(a) == self.encontrar(b)
+
+    def tamanho_de(self, x: int) -> int:
+        return int(self.tamanho[self.encontrar(x)])
+
+    def _raizes(self, x: np.ndarray) -> np.ndarray:
+        """Raiz de cada elemento de x; os elementos consultados passam a apontar para ela."""
+        raiz = self.pai[x]
+        while True:
+            acima = self.pai[raiz]
+            if np.array_equal(acima, raiz):
+                break
+            raiz = acima
+        self.pai[x] = raiz
+        return raiz
+
+    def unir_arestas(self, origem: np.ndarray, destino: np.ndarray):
+        """
+        Une os pares (origem[i], destino[i]) em lote.
+
+        A cada rodada cada par é levado às suas raízes e, entre raízes
+        diferentes, a de menor tamanho (desempate pelo índice) é pendurada na
+        maior. Como a ordem (tamanho, índice) é total, as ligações não formam
+        ciclos; os pares cuja ligação perdeu para outra voltam na rodada seguinte.
+        """
+        a = np.asarray(origem, dtype=np.int64)
+        b = np.asarray(destino, dtype=np.int64)
+
+        while len(a):
+            a = self._raizes(a)
+            b = self._raizes(b)
+            diferentes = a != b
+            a, b = a[diferentes], b[diferentes]
+            if len(a) == 0:
+                break
+
+            ta, tb = self.tamanho[a], self.tamanho[b]
+            a_menor = (ta < tb) | ((ta == tb) & (a < b))
+            filho = np.where(a_menor, a, b)
+            raiz = np.where(a_menor, b, a)
+
+            # Cada raiz desce no máximo uma vez por rodada (a primeira ligação vence)
+            filho, primeiras = np.unique(filho, return_index=True)
+            raiz = raiz[primeiras]
+            self.pai[filho] = raiz
+            self.num_componentes -= len(filho)
+
+            # As ligações podem formar cadeias (raiz que também desce): achata as
+            # raízes envolvidas com saltos de ponteiro e soma os tamanhos na raiz final
+            envolvidas = np.union1d(filho, raiz)
+            tamanhos = self.tamanho[envolvidas]
+            final = self.pai[envolvidas]
+            while True:
+                acima = self.pai[final]
+                if np.array_equal(acima, final):
+                    break
+                self.pai[envolvidas] = acima
+                final = acima
+            self.tamanho[final] = 0
+            np.add.at(self.tamanho, final, tamanhos)
+
+    def componentes(self, rotulos: np.ndarray = None):
+        """
+        Tamanho de cada componente, na ordem do menor vértice de cada uma
+        (a mesma ordem de componentes_conexos das listas de adjacência).
+        Com `rotulos`, a ordem é a do menor rótulo (ex.: o id original de
+        cada elemento, em um grafo renumerado).
+        """
+        raizes = self._raizes(np.arange(self.n, dtype=np.int64))
+        if rotulos is None:
+            _, primeiras, tamanhos = np.unique(raizes, return_index=True, return_counts=True)
+            return tamanhos[np.argsort(primeiras)]
+        _, grupo, tamanhos = np.unique(raizes, return_inverse=True, return_counts=True)
+        menores = np.full(len(tamanhos), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(menores, grupo, rotulos)
+        return tamanhos[np.argsort(menores)]
+
+
+def componentes_do_arquivo(arquivo: str, tamanho_bloco: int = TAMANHO_BLOCO):
+    """
+    Componentes conexas lidas direto do arquivo de arestas, em uma passada.
+
+    As arestas são convertidas em blocos (leitura_arestas) e unidas em uma
+    UniaoBusca; a lista de adjacência nunca é montada, então a memória cresce
+    com o número de vértices e não com o de arestas. Arestas fora de [1, N]
+    e linhas inválidas são ignoradas como em ler_arestas.
+
+    :return: (n, tamanhos) com os tamanhos na ordem do menor vértice de cada
+             componente.
+    """
+    with open(arquivo, "rb") as f:
+        n = _ler_cabecalho(f)
+        uniao = UniaoBusca(n if n is not None else 0)
+        maximo = n if n is not None else np.iinfo(np.int32).max
+
+        for dados in iterar_blocos(f, tamanho_bloco):
+            pares, _ = converter_bloco(dados)
+            dentro = ((pares >= 1) & (pares <= maximo)).all(axis=1)
+            pares = pares[dentro] - 1
+            if len(pares) == 0:
+                continue
+            if n is None:
+                uniao.crescer(int(pares.max()) + 1)
+            uniao.unir_arestas(pares[:, 0], pares[:, 1])
+
+    return uniao.n, uniao.componentes()
+